@@ -5,7 +5,7 @@
 from collections import Counter
 from functools import reduce
 
-from ..basic import gcd, mod_inverse, mod_power, prime_to
+from ..basic import gcd, mod_inverse, mod_power, prime_to, reduction_context
 from ..factorization import Factorization
 from ..modular import mod_sqrt
 
@@ -19,10 +19,15 @@ __all__ = [
 class ModularRing:
     """
     Class for computations in the ring of integers relative to a modulus.
+
+    Products and powers are computed with `context` if given, or with a
+    `ModularContext` for the modulus if the `modular_reduction` config is not native,
+    and with `%` otherwise.
     """
 
-    def __init__(self, modulus):
+    def __init__(self, modulus, context=None):
         self.modulus = modulus
+        self.context = reduction_context(modulus, context) if modulus > 1 else None
         if modulus == 2:
             self.orders = {1: 1}
             self.inverses = {1: 1}
@@ -176,13 +181,19 @@ class ModularRing:
 
     def mult(self, *elements):
         """Multiply elements in modular ring."""
-        return reduce(lambda x, y: (x * y) % self.modulus, map(self.elem, elements), 1)
+        if self.context is None:
+            return reduce(
+                lambda x, y: (x * y) % self.modulus, map(self.elem, elements), 1
+            )
+        return reduce(self.context.mulmod, map(self.elem, elements), 1)
 
     # -------------------------
 
     def power_of(self, element, exponent):
         """Compute power of element in modular ring."""
-        return mod_power(element, exponent, self.modulus)
+        if self.context is None:
+            return mod_power(element, exponent, self.modulus)
+        return self.context.powmod(element, exponent)
 
     # -------------------------
 
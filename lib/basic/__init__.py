@@ -17,8 +17,11 @@ from .modular import (
     mod_inverse,
     mod_power,
     prime_to,
+    reduction_context,
+    ModularContext,
 )
 from .primality import (
+    iter_primes_in_range,
     iter_primes_up_to,
     prime_gen,
     primes_up_to,
@@ -6,6 +6,7 @@ import itertools as it
 from functools import reduce
 from typing import Dict, List, Iterable, Tuple
 
+from ..config import default
 from .division import bezout, gcd, padic
 
 # ===========================================================
@@ -154,6 +155,122 @@ def prime_to(factorization: Dict[int, int]) -> List[int]:
 # =============================
 
 
+class ModularContext:
+    """
+    Modular arithmetic relative to a fixed modulus, with the constants for its
+    reduction computed once.
+
+    The `native` method reduces with `%` and exponentiates with the built-in `pow`,
+    whose loops run in C; it is the fastest method in CPython for every size of
+    modulus. The `barrett` method reduces products with Barrett's method, replacing the
+    division by two multiplications and shifts.
+
+    example:
+        ```
+        context = ModularContext(13, method="barrett")
+        context.mulmod(7, 9), context.sqrmod(7), context.powmod(7, -5)
+            ~> 11, 10, 6
+        ```
+
+    + modulus: int --at least 2
+    + method: "native" | "barrett" | None --defaults to `modular_reduction` config
+    """
+
+    def __init__(self, modulus: int, method: str | None = None):
+        if modulus < 2:
+            raise ValueError("modulus must be at least 2")
+        if method is None:
+            method = default("modular_reduction")
+        if method not in ("native", "barrett"):
+            raise ValueError(f"unknown reduction method {method}")
+
+        self.modulus = modulus
+        self.method = method
+        if method == "barrett":
+            self._shift = modulus.bit_length()
+            self._square = modulus * modulus
+            self._factor = (1 << (2 * self._shift)) // modulus
+
+    # -------------------------
+
+    def __repr__(self) -> str:
+        return f"ModularContext(modulus={self.modulus}, method={self.method!r})"
+
+    # =========================
+
+    def reduce(self, value: int) -> int:
+        """Reduce `value` by the modulus."""
+
+        if self.method == "native" or not 0 <= value < self._square:
+            return value % self.modulus
+
+        shift = self._shift
+        result = (
+            value - ((value >> (shift - 1)) * self._factor >> (shift + 1)) * self.modulus
+        )
+        while result >= self.modulus:
+            result -= self.modulus
+        return result
+
+    # -------------------------
+
+    def mulmod(self, left: int, right: int) -> int:
+        """Product of `left` and `right`, reduced by the modulus."""
+
+        return self.reduce(left * right)
+
+    # -------------------------
+
+    def sqrmod(self, value: int) -> int:
+        """Square of `value`, reduced by the modulus."""
+
+        return self.reduce(value * value)
+
+    # -------------------------
+
+    def powmod(self, value: int, exponent: int) -> int:
+        """Power of `value` to `exponent`, reduced by the modulus."""
+
+        if exponent < 0:
+            return self.powmod(mod_inverse(value, self.modulus), -exponent)
+        if self.method == "native":
+            return pow(value, exponent, self.modulus)
+
+        base = self.reduce(value)
+        result = 1 % self.modulus
+        for bit in bin(exponent)[2:]:
+            result = self.reduce(result * result)
+            if bit == "1":
+                result = self.reduce(result * base)
+        return result
+
+
+# -----------------------------
+
+
+def reduction_context(
+    modulus: int, context: ModularContext | None = None
+) -> ModularContext | None:
+    """
+    Context for arithmetic relative to `modulus` if it reduces other than natively,
+    either `context` or one built with the `modular_reduction` config, and `None`
+    otherwise, so that callers on the native path keep to `%` and the built-in `pow`.
+
+    + modulus: int
+    + context: ModularContext | None
+    ~> ModularContext | None
+    """
+
+    if context is None and default("modular_reduction") != "native":
+        context = ModularContext(modulus)
+    if context is None or context.method == "native":
+        return None
+    return context
+
+
+# =============================
+
+
 def _relatively_prime_to_prime_power(pair: Tuple[int, int]) -> Iterable[int]:
     return (x for x in range(1, pair[0] ** pair[1]) if x % pair[0] != 0)
 
@@ -3,24 +3,40 @@
 
 # ===========================================================
 import itertools as it
-from typing import Iterator, List
+from array import array
+from typing import TYPE_CHECKING, Any, Iterator, List, Literal, Sequence, overload
 
+from ..config import default
 from .sqrt import integer_sqrt
 
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        np = None
+
+# ===========================================================
+#   wheel of odd numbers with multiples of 3, 5 and 7 removed;
+#   entry `i` corresponds to the odd number `2*i + 1` modulo `2 * 105`
+_WHEEL_PRIMES = (3, 5, 7)
+_WHEEL_SIZE = 105
+_WHEEL = bytearray(
+    all((2 * i + 1) % prime != 0 for prime in _WHEEL_PRIMES) for i in range(_WHEEL_SIZE)
+)
+
 # ===========================================================
 
 
 def prime_gen() -> Iterator[int]:
     """
-    Generator that yields prime numbers using Sieve of Eratosthenes.
+    Generator that yields prime numbers indefinitely using a segmented
+    Sieve of Eratosthenes.
 
     ~> Iterator[int]
     """
-    primes: Iterator[int] = it.count(2)
-    while True:
-        prime = next(primes)
-        primes = filter(prime.__rmod__, primes)
-        yield prime
+    return iter_primes_in_range(2)
 
 
 # -----------------------------
@@ -32,36 +48,208 @@ def iter_primes_up_to(number: int) -> Iterator[int]:
 
     example: `list(iter_primes_up_to(10)) ~> [2, 3, 5, 7]`
     """
-    return it.takewhile(lambda x: x <= number, prime_gen())
+    return iter_primes_in_range(2, number + 1)
 
 
 # -----------------------------
 
 
+@overload
+def primes_up_to(max_value: int, as_array: Literal[False] = False) -> list[int]: ...
+
+
+@overload
 def primes_up_to(
-    max_value: int,
-    primes: List[int] = [],
-    numbers_left: Iterator[int] | None = None,
-) -> List[int]:
+    max_value: int, as_array: Literal[True]
+) -> "np.ndarray | memoryview": ...
+
+
+@overload
+def primes_up_to(
+    max_value: int, as_array: bool
+) -> "list[int] | np.ndarray | memoryview": ...
+
+
+def primes_up_to(
+    max_value: int, as_array: bool = False
+) -> "list[int] | np.ndarray | memoryview":
     """
     Compute primes up to `max_value`.
 
+    If `as_array`, the primes are returned as a contiguous array of unsigned 32-bit
+    integers (64-bit if `max_value` does not fit), which is a `numpy.ndarray` if NumPy
+    is installed and a `memoryview` otherwise.
+
     example: `primes_up_to(19) ~> [2, 3, 5, 7, 11, 13, 17, 19]`
     """
-    if numbers_left is None:
-        numbers_left = iter(range(2, max_value + 1))
+    if not as_array:
+        return list(iter_primes_up_to(max_value))
 
-    try:
-        min_value = next(numbers_left)
-    except StopIteration:
-        return primes
+    typecode = "I" if max_value < 1 << 32 else "Q"
+    if _use_numpy(max_value):
+        parts = [
+            _segment_prime_array(low, flags)
+            for low, flags in _iter_segments(2, max_value + 1, None)
+        ]
+        return np.concatenate(
+            [np.array([2] if max_value >= 2 else [], dtype=np.int64), *parts]
+        ).astype(np.dtype(typecode))
+
+    primes = array(typecode, iter_primes_up_to(max_value))
+    return memoryview(primes)
+
+
+# -----------------------------
+
+
+def iter_primes_in_range(
+    lower: int,
+    upper: int | None = None,
+    segment_size: int | None = None,
+) -> Iterator[int]:
+    """
+    Iterator of primes in `range(lower, upper)`, or of all primes at least `lower`
+    if `upper` is `None`, using a segmented sieve over a 2*3*5*7 wheel.
+
+    Only one segment of `segment_size` odd numbers is held in memory at a time, along
+    with the primes up to the square root of the current segment. If NumPy is
+    installed, the primes of each segment are extracted with it.
+
+    example: `list(iter_primes_in_range(10, 30)) ~> [11, 13, 17, 19, 23, 29]`
+
+    + lower: int
+    + upper: int | None
+    + segment_size: int | None --number of odd numbers per segment
+    ~> Iterator[int]
+    """
+    if upper is not None and upper <= max(lower, 2):
+        return
+
+    if lower <= 2:
+        yield 2
+
+    for low, flags in _iter_segments(lower, upper, segment_size):
+        yield from _segment_primes(low, flags)
+
+
+# =============================
+
+
+def _iter_segments(
+    lower: int,
+    upper: int | None,
+    segment_size: int | None,
+) -> Iterator[tuple[int, bytearray]]:
+    """
+    Iterator of sieved segments covering the odd numbers at least 3 in
+    `range(lower, upper)`.
+
+    + lower: int
+    + upper: int | None
+    + segment_size: int | None --number of odd numbers per segment
+    ~> Iterator[tuple[int, bytearray]] --first odd number and flags of each segment
+    """
+    if segment_size is None:
+        segment_size = default("sieve_segment_size")
+
+    low = max(lower, 3) | 1
+    base_primes: List[int] = []
+    base_max = 0
+
+    while upper is None or low < upper:
+        high = low + 2 * segment_size
+        if upper is not None:
+            high = min(high, upper)
+
+        root = integer_sqrt(high - 1)
+        if root > base_max:
+            base_max = max(root, 2 * base_max)
+            base_primes = [prime for prime in primes_up_to(base_max) if prime > 7]
+
+        yield low, _sieve_segment(low, high, base_primes)
+        low = high
+
+
+# -----------------------------
+
+
+def _segment_primes(lower: int, flags: bytearray) -> List[int]:
+    """
+    Primes of a sieved segment.
+
+    + lower: int --first odd number of the segment
+    + flags: bytearray --as returned by `_sieve_segment`
+    ~> List[int]
+    """
+    upper = lower + 2 * len(flags)
+    if _use_numpy(upper):
+        return _segment_prime_array(lower, flags).tolist()
+    return list(it.compress(range(lower, upper, 2), flags))
+
+
+# -----------------------------
+
+
+def _segment_prime_array(lower: int, flags: bytearray) -> Any:
+    """
+    Primes of a sieved segment as a `numpy.ndarray` of 64-bit integers.
+
+    + lower: int --first odd number of the segment, less than `2**63`
+    + flags: bytearray --as returned by `_sieve_segment`
+    ~> numpy.ndarray
+    """
+    return 2 * np.flatnonzero(np.frombuffer(flags, dtype=np.uint8)) + lower
+
+
+# -----------------------------
+
+
+def _use_numpy(upper: int) -> bool:
+    """
+    Determine whether the NumPy backend is used for numbers below `upper`.
+
+    + upper: int
+    ~> bool
+    """
+    return np is not None and default("sieve_backend") != "python" and upper < 1 << 63
+
+
+# -----------------------------
+
+
+def _sieve_segment(lower: int, upper: int, base_primes: Sequence[int]) -> bytearray:
+    """
+    Sieve the odd numbers in `range(lower, upper)`.
+
+    + lower: int --odd
+    + upper: int
+    + base_primes: Sequence[int] --ascending primes greater than 7,
+        including those up to `integer_sqrt(upper - 1)`
+    ~> bytearray --entry `i` is 1 if `lower + 2*i` is prime, 0 otherwise
+    """
+    size = (upper - lower + 1) // 2
+    offset = (lower // 2) % _WHEEL_SIZE
+    flags = (_WHEEL * ((offset + size) // _WHEEL_SIZE + 1))[offset : offset + size]
+
+    for prime in _WHEEL_PRIMES:
+        if lower <= prime < upper:
+            flags[(prime - lower) // 2] = 1
+    if lower == 1:
+        flags[0] = 0
 
-    if min_value**2 >= max_value:
-        return primes + [min_value] + list(numbers_left)
+    for prime in base_primes:
+        start = prime * prime
+        if start >= upper:
+            break
+        if start < lower:
+            start = prime * ((lower + prime - 1) // prime)
+            if start % 2 == 0:
+                start += prime
+        index = (start - lower) // 2
+        if index < size:
+            flags[index::prime] = bytes((size - 1 - index) // prime + 1)
 
-    return primes_up_to(
-        max_value, primes + [min_value], filter(min_value.__rmod__, numbers_left)
-    )
+    return flags
 
 
 # =============================
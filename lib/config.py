@@ -7,10 +7,34 @@ DEFAULTS = {
     "decimal_digits": 20,
     "rho_seeds": [2, 3, 4, 6, 7, 8, 9],
     "minus_seeds": [2],
+    "minus_b1": 10**4,
+    "minus_b2": 10**6,
+    "plus_seeds": [3, 4, 6],
+    "plus_b1": 10**4,
+    "plus_b2": 10**6,
+    "plus_delay": 500,
+    "ecm_b1": 2000,
+    "ecm_curves": 25,
+    "ecm_delay": 20,
+    "small_composite_bits": 62,
+    "siqs_min_digits": 20,
+    "siqs_delay": 500,
+    "divisor_search_processes": 1,
+    "factor_store_cache_size": 1024,
+    "factor_store_max_entries": 100000,
     "prime_base_max": 1000,
+    "trial_division_block_size": 32,
+    "modular_reduction": "native",
     "miller_rabin_witness_count": 40,
     "lucas_witness_pair_count": 10,
+    "primality_mode": "bpsw",
+    "prefilter_bound": 256,
     "sieve_primes": [2, 3, 5, 7],
+    "sieve_segment_size": 1 << 17,
+    "sieve_chunk_size": 1 << 24,
+    "sieve_backend": "numpy",
+    "batch_chunk_size": 1 << 22,
+    "multiplicative_segment_size": 1 << 18,
 }
 
 
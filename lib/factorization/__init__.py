@@ -4,11 +4,29 @@
 # ===========================================================
 from .algorithms import Algorithm  # noqa: F401
 from .divisor_search import find_divisors, DivisorSearch  # noqa: F401
+from .factor_store import (  # noqa: F401
+    get_factor_store,
+    use_factor_store,
+    FactorStore,
+    FactorStoreStats,
+)
 from .factorization import Factorization
 from .gaussian_divisor import get_gaussian_divisor  # noqa: F401
+from .multiplicative_sieve import (
+    multiplicative_functions_in_range,
+    multiplicative_functions_up_to,
+)
 from .quaternion_divisor import get_quaternion_divisor  # noqa: F401
+from .spf_table import SmallestPrimeFactorTable
+from .trial_division import TrialDivision
 
 # ===========================================================
 __all__ = [
     "Factorization",
+    "multiplicative_functions_in_range",
+    "multiplicative_functions_up_to",
+    "FactorStore",
+    "use_factor_store",
+    "SmallestPrimeFactorTable",
+    "TrialDivision",
 ]
@@ -2,48 +2,96 @@
 #   - module for factor-finding algorithms for composite numbers
 
 # ===========================================================
-from typing import Callable, Generator, Literal
+import itertools as it
+import math
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import reduce
+from typing import Callable, Generator, Iterable, Iterator, Literal, Sequence
 
-from ..basic import gcd
+from ..basic import (
+    gcd,
+    iter_primes_in_range,
+    iter_primes_up_to,
+    reduction_context,
+    ModularContext,
+)
+from ..config import default
 from ..types import GaussianInteger
+from .quadratic_sieve import siqs_divisors
 
 # ===========================================================
 __all__ = [
     "Algorithm",
+    "EllipticCurveMethod",
+    "HartOneLine",
     "PollardRho",
+    "PollardRhoBrent",
     "PollardPMinusOne",
+    "QuadraticSieve",
+    "ShanksSquareForms",
     "WilliamsPPlusOne",
 ]
 # ===========================================================
+#   bit `i` is set if `i` is a square modulo 64, to rule out most non-squares cheaply
+_SQUARES_MOD_64 = sum(1 << residue for residue in {i * i % 64 for i in range(64)})
+
+
+def _square_plus_one(x: int) -> int:
+    """Default function for Pollard's rho, a module function so that it can be pickled."""
+
+    return x * x + 1
+
+
+# ===========================================================
 
 
 class Algorithm:
     """Abstract base class for division algorithms."""
 
     @classmethod
-    def build(cls, algorithm: Literal["rho", "p-1", "p+1"], **kwargs) -> "Algorithm":
+    def build(
+        cls,
+        algorithm: Literal[
+            "rho", "rho-brent", "p-1", "p+1", "ecm", "squfof", "hart", "siqs"
+        ],
+        **kwargs,
+    ) -> "Algorithm":
         """Builder shortcut for an algorithm."""
 
+        if algorithm == "siqs":
+            return QuadraticSieve(**kwargs)
+        if algorithm == "squfof":
+            return ShanksSquareForms(**kwargs)
+        if algorithm == "hart":
+            return HartOneLine(**kwargs)
+        if algorithm == "ecm":
+            return EllipticCurveMethod(**kwargs)
+        if algorithm == "rho-brent":
+            return PollardRhoBrent(**kwargs)
         if algorithm == "p-1":
             return PollardPMinusOne(**kwargs)
         if algorithm == "p+1":
             return WilliamsPPlusOne(**kwargs)
         return PollardRho(**kwargs)
 
-    def generator(self, number: int) -> Generator[int, None, None]:
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
         """Generator for potential divisors."""
 
         return NotImplemented
 
-    def find_divisor(self, number: int) -> int:
+    def find_divisor(self, number: int, context: ModularContext | None = None) -> int:
         """
         Finds a divisor of `number`.
 
         + number: int --composite
+        + context: ModularContext | None --for modular arithmetic relative to `number`
         ~> int --either nontrivial divisor or number itself
         """
 
-        gen = self.generator(number)
+        gen = self.generator(number, context)
         divisor = next(gen)
         while divisor == 1:
             divisor = next(gen)
@@ -61,23 +109,104 @@ class PollardRho(Algorithm):
         `PollardRho(seed=2, func=lambda x: x**2 + 1).find_divisor(143) ~> 11`
 
     + seed: int
-    + func: Callable[[int], int]
+    + func: Callable[[int], int] --defaults to `x**2 + 1`
     """
 
-    def __init__(self, seed: int = 2, func: Callable[[int], int] = lambda x: x**2 + 1):
+    def __init__(self, seed: int = 2, func: Callable[[int], int] = _square_plus_one):
         self.seed = seed
         self.func = func
 
-    def generator(self, number: int) -> Generator[int, None, None]:
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
         """Generator for potential divisors."""
 
+        context = reduction_context(number, context)
         x_i = self.func(self.seed % number)
-        x_2i = self.func(x_i) % number
+        if context is None:
+            x_2i = self.func(x_i) % number
+        else:
+            x_2i = context.reduce(self.func(x_i))
 
         while True:
             yield gcd(x_2i - x_i, number)
-            x_i = self.func(x_i) % number
-            x_2i = self.func(self.func(x_2i) % number) % number
+            if context is None:
+                x_i = self.func(x_i) % number
+                x_2i = self.func(self.func(x_2i) % number) % number
+            else:
+                x_i = context.reduce(self.func(x_i))
+                x_2i = context.reduce(self.func(context.reduce(self.func(x_2i))))
+
+
+# -----------------------------
+
+
+class PollardRhoBrent(Algorithm):
+    """
+    Pollard's rho algorithm with Brent's cycle detection to find divisor of an integer.
+
+    The differences are multiplied together modulo the integer in batches of
+    `batch_size`, so that only one gcd is computed per batch; if a batch collapses to
+    the integer itself, its steps are retraced one gcd at a time.
+
+    example:
+        `PollardRhoBrent(seed=2, func=lambda x: x**2 + 1).find_divisor(8051) ~> 97`
+
+    + seed: int
+    + func: Callable[[int], int] --defaults to `x**2 + 1`
+    + batch_size: int
+    """
+
+    def __init__(
+        self,
+        seed: int = 2,
+        func: Callable[[int], int] = _square_plus_one,
+        batch_size: int = 100,
+    ):
+        self.seed = seed
+        self.func = func
+        self.batch_size = batch_size
+
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
+        """Generator for potential divisors, one for each batch."""
+
+        context = reduction_context(number, context)
+        func = self.func
+        y = self.seed % number
+        product = 1
+        length = 1
+
+        while True:
+            x = y
+            for _ in range(length):
+                y = func(y) % number if context is None else context.reduce(func(y))
+
+            for start in range(0, length, self.batch_size):
+                saved = y
+                for _ in range(min(self.batch_size, length - start)):
+                    if context is None:
+                        y = func(y) % number
+                        product = product * (x - y) % number
+                    else:
+                        y = context.reduce(func(y))
+                        product = context.mulmod(product, x - y)
+                divisor = gcd(product, number)
+
+                if divisor == number:
+                    y = saved
+                    divisor = 1
+                    while divisor == 1:
+                        y = (
+                            func(y) % number
+                            if context is None
+                            else context.reduce(func(y))
+                        )
+                        divisor = gcd(x - y, number)
+                yield divisor
+
+            length *= 2
 
 
 # -----------------------------
@@ -87,27 +216,114 @@ class PollardPMinusOne(Algorithm):
     """
     Pollard's p-1 algorithm to find divisor of an integer.
 
+    Stage 1 raises the seed to the largest power of each prime up to `b1`. Stage 2 then
+    raises the result to each prime `q` in `(b1, b2]`, stepping from one prime to the
+    next with a table of powers for the gaps between them. The gcd is computed once per
+    batch of `batch_size` primes, and a batch that collapses to the integer itself is
+    retraced one step at a time.
+
+    The stage in which the last divisor was found is kept as `stage`.
+
     example:
         `PollardPMinusOne(seed=2).find_divisor(143) ~> 13`
 
     + seed: int
+    + b1: int | None --defaults to `minus_b1` config
+    + b2: int | None --defaults to `minus_b2` config
+    + batch_size: int
     """
 
-    def __init__(self, seed: int = 2):
+    def __init__(
+        self,
+        seed: int = 2,
+        b1: int | None = None,
+        b2: int | None = None,
+        batch_size: int = 100,
+    ):
         self.seed = seed
+        self.b1 = default("minus_b1") if b1 is None else b1
+        self.b2 = default("minus_b2") if b2 is None else b2
+        self.batch_size = batch_size
+        self.stage: Literal[1, 2] | None = None
 
-    def generator(self, number: int) -> Generator[int, None, None]:
-        """Generator for potential divisors."""
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
+        """Generator for potential divisors, one for each batch."""
 
+        context = reduction_context(number, context)
+        self.stage = None
         yield gcd(self.seed, number)
 
-        x_i = self.seed % number
-        index = 1
+        x = self.seed % number
+        for batch in _batches(iter_primes_up_to(self.b1), self.batch_size):
+            saved = x
+            for prime in batch:
+                power = _largest_power(prime, self.b1)
+                x = pow(x, power, number) if context is None else context.powmod(x, power)
+            divisor = gcd(x - 1, number)
+
+            if divisor == number:
+                x = saved
+                for prime in batch:
+                    for _ in range(_largest_exponent(prime, self.b1)):
+                        if context is None:
+                            x = pow(x, prime, number)
+                        else:
+                            x = context.powmod(x, prime)
+                        divisor = gcd(x - 1, number)
+                        if divisor > 1:
+                            break
+                    if divisor > 1:
+                        break
+            if divisor > 1:
+                self.stage = 1
+                while True:
+                    yield divisor
+            yield 1
+
+        gap_powers: dict[int, int] = {}
+        x_q, prev = 1, 0
+        product = 1
+        for batch in _batches(
+            iter_primes_in_range(self.b1 + 1, self.b2 + 1), self.batch_size
+        ):
+            saved_step = x_q, prev
+            for prime in batch:
+                gap = prime - prev
+                if gap not in gap_powers:
+                    if context is None:
+                        gap_powers[gap] = pow(x, gap, number)
+                    else:
+                        gap_powers[gap] = context.powmod(x, gap)
+                if context is None:
+                    x_q = x_q * gap_powers[gap] % number
+                    product = product * (x_q - 1) % number
+                else:
+                    x_q = context.mulmod(x_q, gap_powers[gap])
+                    product = context.mulmod(product, x_q - 1)
+                prev = prime
+            divisor = gcd(product, number)
+
+            if divisor == number:
+                x_q, prev = saved_step
+                for prime in batch:
+                    if context is None:
+                        x_q = x_q * gap_powers[prime - prev] % number
+                    else:
+                        x_q = context.mulmod(x_q, gap_powers[prime - prev])
+                    prev = prime
+                    divisor = gcd(x_q - 1, number)
+                    if divisor > 1:
+                        break
+            if divisor > 1:
+                self.stage = 2
+                while True:
+                    yield divisor
+            yield 1
 
         while True:
-            yield gcd(x_i - 1, number)
-            index = index + 1
-            x_i = pow(x_i, index, number)
+            yield number
 
 
 # -----------------------------
@@ -115,25 +331,756 @@ class PollardPMinusOne(Algorithm):
 
 class WilliamsPPlusOne(Algorithm):
     """
-    Williams' p+1 algorithm to find divisor of an integer.
+    Williams' p+1 algorithm to find divisor of an integer, on the Lucas sequences
+    `V[k]` with parameters `p = seed` and `q = 1`, one for each seed.
+
+    Stage 1 replaces each `V[1]` with `V[m]` for the largest power `m` of each prime up
+    to `b1`, using `V[m*k] == V[m](V[k])` and a ladder on the bits of `m`. Stage 2
+    looks for a prime `r` in `(b1, b2]` with `V[r] == 2` modulo a divisor, pairing
+    `r == k*w +/- j` so that each prime costs one product `V[k*w] - V[j]`. The seeds are
+    run together with one gcd per batch of `batch_size` primes, and a batch that
+    collapses to the integer itself is retraced one step at a time. A Gaussian integer
+    seed `z` stands for the sequence of the powers of `z / conj(z)`, that is, for
+    `p = (z**2 + conj(z)**2) / norm(z)` modulo the integer.
+
+    To leave small factors to cheaper algorithms in a `DivisorSearch`, the first
+    `delay` potential divisors are 1 without any work.
+
+    The stage in which the last divisor was found is kept as `stage`.
 
     example:
-        `WilliamsPPlusOne(seed=GaussianInteger(1, 2)).find_divisor(143) ~> 11`
+        `WilliamsPPlusOne(seeds=[3, 4, 6]).find_divisor(143) ~> 11`
+        `WilliamsPPlusOne(seed=GaussianInteger(1, 2)).find_divisor(221) ~> 17`
+
+    + seeds: Sequence[int | GaussianInteger] | None --defaults to `plus_seeds` config
+    + b1: int | None --defaults to `plus_b1` config
+    + b2: int | None --defaults to `plus_b2` config
+    + batch_size: int
+    + seed: int | GaussianInteger | None --single seed, instead of `seeds`
+    + delay: int
+    """
+
+    #   giant step of stage 2, a product of small primes so that few `j` are needed
+    WHEEL = 2 * 3 * 5 * 7 * 11
+
+    def __init__(
+        self,
+        seeds: Sequence[int | GaussianInteger] | None = None,
+        b1: int | None = None,
+        b2: int | None = None,
+        batch_size: int = 100,
+        seed: int | GaussianInteger | None = None,
+        delay: int = 0,
+    ):
+        if seed is not None:
+            if seeds is not None:
+                raise ValueError("give either seed or seeds")
+            seeds = [seed]
+        self.seeds = list(default("plus_seeds") if seeds is None else seeds)
+        self.b1 = default("plus_b1") if b1 is None else b1
+        self.b2 = default("plus_b2") if b2 is None else b2
+        self.batch_size = batch_size
+        self.delay = delay
+        self.stage: Literal[1, 2] | None = None
+
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
+        """Generator for potential divisors, one for each batch; `context` is unused."""
+
+        self.stage = None
+        for _ in range(self.delay):
+            yield 1
+
+        discriminants = reduce(
+            lambda x, y: x * y, (_lucas_discriminant(seed) for seed in self.seeds), 1
+        )
+        divisor = gcd(discriminants, number)
+        yield 1 if divisor == number else divisor
+
+        values = [_lucas_seed(seed, number) for seed in self.seeds]
+        for batch in _batches(iter_primes_up_to(self.b1), self.batch_size):
+            saved = values
+            for prime in batch:
+                power = _largest_power(prime, self.b1)
+                values = [_lucas_v(power, value, number) for value in values]
+            divisor = gcd(_product((value - 2 for value in values), number), number)
+
+            if divisor == number:
+                divisor = self._retrace_stage_1(saved, batch, number)
+            if divisor > 1:
+                self.stage = 1
+                while True:
+                    yield divisor
+            yield 1
 
-    + seed: GaussianInteger
+        wheel = self.WHEEL
+        babies = [_lucas_v_odd_terms(value, wheel // 2, number) for value in values]
+        giant_steps = [_lucas_v(wheel, value, number) for value in values]
+        k = (self.b1 + 1 + wheel // 2) // wheel
+        giants = [_lucas_v(k * wheel, value, number) for value in values]
+        prev_giants = [_lucas_v(abs(k - 1) * wheel, value, number) for value in values]
+
+        for batch in _batches(
+            iter_primes_in_range(self.b1 + 1, self.b2 + 1), self.batch_size
+        ):
+            differences: list[int] = []
+            for prime in batch:
+                while prime > k * wheel + wheel // 2:
+                    giants, prev_giants = [
+                        (giant * step - prev) % number
+                        for giant, step, prev in zip(giants, giant_steps, prev_giants)
+                    ], giants
+                    k += 1
+                j = abs(prime - k * wheel)
+                differences.extend(
+                    giant - baby[j // 2] for giant, baby in zip(giants, babies)
+                )
+            divisor = gcd(_product(differences, number), number)
+
+            if divisor == number:
+                for difference in differences:
+                    divisor = gcd(difference, number)
+                    if 1 < divisor < number:
+                        break
+            if divisor > 1:
+                self.stage = 2
+                while True:
+                    yield divisor
+            yield 1
+
+        while True:
+            yield number
+
+    def _retrace_stage_1(self, values: list[int], batch: list[int], number: int) -> int:
+        """Retrace a batch of stage 1 one prime at a time, for each seed separately."""
+
+        for value in values:
+            divisor = 1
+            for prime in batch:
+                for _ in range(_largest_exponent(prime, self.b1)):
+                    value = _lucas_v(prime, value, number)
+                    divisor = gcd(value - 2, number)
+                    if divisor > 1:
+                        break
+                if divisor > 1:
+                    break
+            if 1 < divisor < number:
+                return divisor
+        return number
+
+
+# -----------------------------
+
+
+class EllipticCurveMethod(Algorithm):
     """
+    Lenstra's elliptic curve method to find divisor of an integer, on Montgomery curves
+    `b*y**2 == x**3 + a*x**2 + x` with Suyama's parametrization by `sigma`, using only
+    the coordinates `(x : z)`.
+
+    For each curve, stage 1 multiplies the starting point by the largest power of each
+    prime up to `b1`, and stage 2 looks for a prime `r` in `(b1, b2]` such that `r`
+    times the point is the identity modulo a divisor, pairing `r == k*w +/- j` so that
+    each prime costs one product of cross differences. The curves use
+    `sigma = seed, seed + 1, ...` and, if `processes > 1`, run in a process pool.
 
-    def __init__(self, seed: GaussianInteger = GaussianInteger(1, 2)):
+    To leave small factors to cheaper algorithms in a `DivisorSearch`, the first
+    `delay` potential divisors are 1 without any work.
+
+    The stage in which the last divisor was found is kept as `stage`.
+
+    example:
+        `EllipticCurveMethod(b1=2000, curves=20).find_divisor(2**67 - 1) ~> 193707721`
+
+    + b1: int | None --defaults to `ecm_b1` config
+    + b2: int | None --defaults to `100 * b1`
+    + curves: int | None --defaults to `ecm_curves` config
+    + seed: int --first `sigma`, at least 6
+    + processes: int --1 runs the curves in this process
+    + batch_size: int
+    + delay: int
+    """
+
+    def __init__(
+        self,
+        b1: int | None = None,
+        b2: int | None = None,
+        curves: int | None = None,
+        seed: int = 6,
+        processes: int = 1,
+        batch_size: int = 10,
+        delay: int = 0,
+    ):
+        self.b1 = default("ecm_b1") if b1 is None else b1
+        self.b2 = 100 * self.b1 if b2 is None else b2
+        self.curves = default("ecm_curves") if curves is None else curves
         self.seed = seed
+        self.processes = processes
+        self.batch_size = batch_size
+        self.delay = delay
+        self.stage: Literal[1, 2] | None = None
 
-    def generator(self, number: int) -> Generator[int, None, None]:
-        """Generator for potential divisors."""
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
+        """Generator for potential divisors, one for each batch; `context` is unused."""
+
+        self.stage = None
+        for _ in range(self.delay):
+            yield 1
+
+        sigmas = range(self.seed, self.seed + self.curves)
+        if self.processes == 1:
+            results = (
+                result
+                for sigma in sigmas
+                for result in _ecm_curve(number, sigma, self.b1, self.b2, self.batch_size)
+            )
+        else:
+            results = self._map_curves(number, sigmas)
+
+        divisor = number
+        try:
+            for potential_divisor, stage in results:
+                if 1 < potential_divisor < number:
+                    divisor, self.stage = potential_divisor, stage
+                    break
+                yield 1
+        finally:
+            results.close()
+
+        while True:
+            yield divisor
+
+    def _map_curves(
+        self, number: int, sigmas: Iterable[int]
+    ) -> Generator[tuple[int, Literal[1, 2] | None], None, None]:
+        """Run each curve in a process pool, keeping two curves per process in flight."""
+
+        sigmas = iter(sigmas)
+        executor = ProcessPoolExecutor(self.processes)
+        try:
+            pending: deque[Future[tuple[int, Literal[1, 2] | None]]] = deque(
+                executor.submit(_ecm_curve_divisor, number, sigma, self.b1, self.b2)
+                for sigma in it.islice(sigmas, 2 * self.processes)
+            )
+            while pending:
+                result = pending.popleft().result()
+                for sigma in it.islice(sigmas, 1):
+                    pending.append(
+                        executor.submit(
+                            _ecm_curve_divisor, number, sigma, self.b1, self.b2
+                        )
+                    )
+                yield result
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+# -----------------------------
+
+
+class ShanksSquareForms(Algorithm):
+    """
+    Shanks' square forms factorization (SQUFOF) to find divisor of an integer, for
+    composites up to about 62 bits.
+
+    For each multiplier `k`, the continued fraction of `sqrt(k*number)` is expanded
+    until a form at an even step has a square `Q == r**2`; the reverse cycle from the
+    form of `r` then reaches a symmetric form whose `Q` shares a factor with `number`.
+    A square that gives only a trivial factor is skipped and the expansion continues,
+    and the expansion of each multiplier is bounded by a multiple of
+    `(k*number)**(1/4)` steps.
+
+    example:
+        `ShanksSquareForms().find_divisor(11111) ~> 41`
+
+    + multipliers: Sequence[int] | None --defaults to the square-free products of
+        3, 5, 7 and 11
+    + batch_size: int --steps for each potential divisor
+    """
+
+    MULTIPLIERS = (
+        1, 3, 5, 7, 11, 3 * 5, 3 * 7, 3 * 11, 5 * 7, 5 * 11, 7 * 11,
+        3 * 5 * 7, 3 * 5 * 11, 3 * 7 * 11, 5 * 7 * 11, 3 * 5 * 7 * 11,
+    )  # fmt: skip
+
+    def __init__(self, multipliers: Sequence[int] | None = None, batch_size: int = 1000):
+        self.multipliers = self.MULTIPLIERS if multipliers is None else multipliers
+        self.batch_size = batch_size
+
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
+        """Generator for potential divisors, one for each batch; `context` is unused."""
+
+        for multiplier in self.multipliers:
+            for divisor in _squfof(number, multiplier, self.batch_size):
+                if 1 < divisor < number:
+                    while True:
+                        yield divisor
+                yield 1
+
+        while True:
+            yield number
+
+
+# -----------------------------
+
+
+class HartOneLine(Algorithm):
+    """
+    Hart's one line factoring algorithm to find divisor of an integer, for composites
+    up to about 42 bits or with factors close to each other.
 
-        z = self.seed
-        power = 1
-        yield gcd(z.norm, number)
+    For `i = 1, 2, ...`, with `s` the ceiling of `sqrt(multiplier * i * number)`, the
+    residue `s**2 % number` is tested for being a square `t**2`, in which case
+    `gcd(s - t, number)` is a potential divisor. The search gives up after `bound`
+    steps.
+
+    example:
+        `HartOneLine().find_divisor(11111) ~> 41`
+
+    + multiplier: int --Hart's suggestion of 480 favors small `i` with many factors
+    + bound: int | None --defaults to the cube root of `number`
+    + batch_size: int --steps for each potential divisor
+    """
+
+    def __init__(
+        self, multiplier: int = 480, bound: int | None = None, batch_size: int = 1000
+    ):
+        self.multiplier = multiplier
+        self.bound = bound
+        self.batch_size = batch_size
+
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
+        """Generator for potential divisors, one for each batch; `context` is unused."""
+
+        bound = self.bound
+        if bound is None:
+            bound = _integer_root(number, 3) + 1
+        step = self.multiplier * number
+
+        for batch in _batches(range(step, step * (bound + 1), step), self.batch_size):
+            divisor = 1
+            for multiple in batch:
+                s = math.isqrt(multiple - 1) + 1
+                residue = s * s % number
+                if _SQUARES_MOD_64 >> (residue & 63) & 1:
+                    t = math.isqrt(residue)
+                    if t * t == residue:
+                        divisor = gcd(s - t, number)
+                        if 1 < divisor < number:
+                            while True:
+                                yield divisor
+            yield 1
 
         while True:
-            power = power + 1
-            z = pow(z, power, number)
-            yield gcd(z.imag, number)
+            yield number
+
+
+# -----------------------------
+
+
+class QuadraticSieve(Algorithm):
+    """
+    Self-initializing quadratic sieve (SIQS) to find divisor of an integer, for hard
+    composites of about 30 to 90 digits, such as balanced semiprimes.
+
+    Relations `x**2 == y` modulo the integer with `y` smooth over a factor base are
+    collected by sieving a family of polynomials for each leading coefficient, and
+    the potential divisor `gcd(x - sqrt(y), number)` is taken for each product of
+    relations that is a square; see `siqs_divisors`. Each polynomial sieved is a
+    potential divisor of 1, so that a `DivisorSearch` interleaves the sieve with other
+    algorithms, which also get the first `delay` potential divisors to themselves.
+
+    Even integers, perfect powers and integers with fewer than `min_digits` digits are
+    left to other algorithms.
+
+    example:
+        `QuadraticSieve().find_divisor(next_prime(10**15) * next_prime(10**16))
+            ~> 1000000000000037`
+
+    + factor_base_size: int | None --defaults to a size depending on the number of digits
+    + half_width: int | None --half the width of the sieve interval, defaults to a width
+        depending on the number of digits
+    + large_prime_multiplier: int --bound on the large prime of a partial relation,
+        relative to the largest prime of the factor base
+    + processes: int --1 sieves in this process
+    + min_digits: int | None --defaults to `siqs_min_digits` config
+    + delay: int
+    """
+
+    def __init__(
+        self,
+        factor_base_size: int | None = None,
+        half_width: int | None = None,
+        large_prime_multiplier: int = 128,
+        processes: int = 1,
+        min_digits: int | None = None,
+        delay: int = 0,
+    ):
+        self.factor_base_size = factor_base_size
+        self.half_width = half_width
+        self.large_prime_multiplier = large_prime_multiplier
+        self.processes = processes
+        self.min_digits = default("siqs_min_digits") if min_digits is None else min_digits
+        self.delay = delay
+
+    def generator(
+        self, number: int, context: ModularContext | None = None
+    ) -> Generator[int, None, None]:
+        """Generator for potential divisors, one for each polynomial; `context` is unused."""
+
+        if number % 2 == 0 or len(str(number)) < self.min_digits or _is_power(number):
+            while True:
+                yield number
+
+        for _ in range(self.delay):
+            yield 1
+
+        yield from siqs_divisors(
+            number,
+            factor_base_size=self.factor_base_size,
+            half_width=self.half_width,
+            large_prime_multiplier=self.large_prime_multiplier,
+            processes=self.processes,
+        )
+
+
+# =============================
+
+
+def _squfof(number: int, multiplier: int, batch_size: int) -> Generator[int, None, None]:
+    """
+    Potential divisors of `number` from SQUFOF with `multiplier`, one for each batch of
+    about `batch_size` steps of the forward expansion.
+
+    + number: int
+    + multiplier: int
+    + batch_size: int
+    ~> Generator[int]
+    """
+
+    scaled = multiplier * number
+    root = math.isqrt(scaled)
+    if root * root == scaled:
+        yield gcd(root, number)
+        return
+
+    #   the forms at even steps are taken two steps at a time, testing the first
+    p, q_prev, q = root, 1, scaled - root * root
+    pairs = 3 * math.isqrt(2 * math.isqrt(scaled)) + 1
+    while pairs > 0:
+        divisor = 1
+        for _ in range(min(pairs, max(batch_size // 2, 1))):
+            b = (root + p) // q
+            p_next = b * q - p
+            q_prev, q = q, q_prev + b * (p - p_next)
+            p = p_next
+            if _SQUARES_MOD_64 >> (q & 63) & 1:
+                r = math.isqrt(q)
+                if r * r == q and r > 1:
+                    divisor = _squfof_reverse(number, scaled, root, p, r)
+                    if 1 < divisor < number:
+                        break
+            b = (root + p) // q
+            p_next = b * q - p
+            q_prev, q = q, q_prev + b * (p - p_next)
+            p = p_next
+        pairs -= max(batch_size // 2, 1)
+        yield divisor
+
+
+# -----------------------------
+
+
+def _squfof_reverse(number: int, scaled: int, root: int, p: int, r: int) -> int:
+    """
+    Divisor of `number` from the reverse cycle of SQUFOF, starting at the form with
+    `P == p` and square `Q == r**2` in the expansion of `sqrt(scaled)`.
+    """
+
+    b = (root - p) // r
+    p = b * r + p
+    q_prev, q = r, (scaled - p * p) // r
+    while True:
+        b = (root + p) // q
+        p_next = b * q - p
+        q_prev, q = q, q_prev + b * (p - p_next)
+        if p_next == p:
+            return gcd(number, q_prev)
+        p = p_next
+
+
+# =============================
+
+
+def _ecm_curve(
+    number: int, sigma: int, b1: int, b2: int, batch_size: int
+) -> Generator[tuple[int, Literal[1, 2] | None], None, None]:
+    """
+    Potential divisors from one curve of the elliptic curve method, with the stage
+    that produced them, one for each batch of `batch_size` primes.
+
+    + number: int
+    + sigma: int --Suyama's parameter of the curve
+    + b1: int
+    + b2: int
+    + batch_size: int
+    ~> Generator[tuple[int, 1 | 2 | None]]
+    """
+
+    u = (sigma * sigma - 5) % number
+    v = 4 * sigma % number
+    denominator = 16 * pow(u, 3, number) * v % number
+    divisor = gcd(denominator, number)
+    if divisor > 1:
+        yield divisor, None
+        return
+    a24 = pow(v - u, 3, number) * (3 * u + v) * pow(denominator, -1, number) % number
+    point = pow(u, 3, number), pow(v, 3, number)
+
+    for batch in _batches(iter_primes_up_to(b1), batch_size):
+        for prime in batch:
+            point = _ecm_multiply(_largest_power(prime, b1), point, a24, number)
+        divisor = gcd(point[1], number)
+        yield divisor, 1
+        if divisor == number:
+            return
+
+    wheel = next(wheel for wheel in (2310, 210, 30, 6, 2) if wheel // 2 <= max(b1, 1))
+    double = _ecm_double(point, a24, number)
+    babies = [point, _ecm_add(double, point, point, number)]
+    for _ in range(wheel // 4 - 1):
+        babies.append(_ecm_add(babies[-1], double, babies[-2], number))
+    giant_step = _ecm_multiply(wheel, point, a24, number)
+    k = max(1, (b1 + 1 + wheel // 2) // wheel)
+    giant = _ecm_multiply(k * wheel, point, a24, number)
+    prev_giant = _ecm_multiply((k - 1) * wheel, point, a24, number) if k > 1 else None
+
+    for batch in _batches(iter_primes_in_range(b1 + 1, b2 + 1), batch_size):
+        product = 1
+        for prime in batch:
+            while prime > k * wheel + wheel // 2:
+                if prev_giant is None:
+                    giant, prev_giant = _ecm_double(giant, a24, number), giant
+                else:
+                    giant, prev_giant = (
+                        _ecm_add(giant, giant_step, prev_giant, number),
+                        giant,
+                    )
+                k += 1
+            x, z = babies[abs(prime - k * wheel) // 2]
+            product = product * (giant[0] * z - x * giant[1]) % number
+        divisor = gcd(product, number)
+        yield divisor, 2
+        if divisor == number:
+            return
+
+
+# -----------------------------
+
+
+def _ecm_curve_divisor(
+    number: int, sigma: int, b1: int, b2: int
+) -> tuple[int, Literal[1, 2] | None]:
+    """
+    Divisor found by one curve of the elliptic curve method, with the stage that found
+    it, or `(1, None)` if the curve fails.
+    """
+
+    for divisor, stage in _ecm_curve(number, sigma, b1, b2, batch_size=100):
+        if 1 < divisor < number:
+            return divisor, stage
+    return 1, None
+
+
+# -----------------------------
+
+
+def _ecm_double(point: tuple[int, int], a24: int, number: int) -> tuple[int, int]:
+    """Double a point `(x : z)` of a Montgomery curve with `a24 == (a + 2) / 4`."""
+
+    x, z = point
+    square_sum = (x + z) * (x + z) % number
+    square_diff = (x - z) * (x - z) % number
+    diff = square_sum - square_diff
+    return square_sum * square_diff % number, diff * (square_diff + a24 * diff) % number
+
+
+# -----------------------------
+
+
+def _ecm_add(
+    point: tuple[int, int],
+    other: tuple[int, int],
+    difference: tuple[int, int],
+    number: int,
+) -> tuple[int, int]:
+    """Add points `(x : z)` of a Montgomery curve, given their difference."""
+
+    first = (point[0] - point[1]) * (other[0] + other[1])
+    second = (point[0] + point[1]) * (other[0] - other[1])
+    return (
+        difference[1] * (first + second) ** 2 % number,
+        difference[0] * (first - second) ** 2 % number,
+    )
+
+
+# -----------------------------
+
+
+def _ecm_multiply(
+    scalar: int, point: tuple[int, int], a24: int, number: int
+) -> tuple[int, int]:
+    """Multiply a point `(x : z)` of a Montgomery curve by `scalar >= 1`, by a ladder."""
+
+    low, high = point, _ecm_double(point, a24, number)
+    for bit in bin(scalar)[3:]:
+        if bit == "1":
+            low, high = _ecm_add(high, low, point, number), _ecm_double(high, a24, number)
+        else:
+            low, high = _ecm_double(low, a24, number), _ecm_add(high, low, point, number)
+    return low
+
+
+# =============================
+
+
+def _batches(iterable: Iterable[int], size: int) -> Iterator[list[int]]:
+    """Consecutive lists of `size` elements of `iterable`, the last possibly shorter."""
+
+    iterator = iter(iterable)
+    batch = list(it.islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(it.islice(iterator, size))
+
+
+# -----------------------------
+
+
+def _is_power(number: int) -> bool:
+    """Determine whether `number > 1` is a perfect power `root**exp` with `exp >= 2`."""
+
+    for exp in iter_primes_up_to(number.bit_length()):
+        if _integer_root(number, exp) ** exp == number:
+            return True
+    return False
+
+
+# -----------------------------
+
+
+def _integer_root(number: int, exp: int) -> int:
+    """Integer part of the `exp`-th root of `number >= 1`, by Newton's method from above."""
+
+    root = 1 << -(-number.bit_length() // exp)
+    while True:
+        estimate = ((exp - 1) * root + number // root ** (exp - 1)) // exp
+        if estimate >= root:
+            return root
+        root = estimate
+
+
+# -----------------------------
+
+
+def _largest_power(prime: int, bound: int) -> int:
+    """Largest power of `prime` that is at most `bound`."""
+
+    return prime ** _largest_exponent(prime, bound)
+
+
+# -----------------------------
+
+
+def _largest_exponent(prime: int, bound: int) -> int:
+    """Largest exponent of a power of `prime` that is at most `bound`, at least 1."""
+
+    exp, power = 1, prime
+    while power * prime <= bound:
+        power *= prime
+        exp += 1
+    return exp
+
+
+# -----------------------------
+
+
+def _product(values: Iterable[int], modulus: int) -> int:
+    """Product of `values` modulo `modulus`."""
+
+    return reduce(lambda x, y: x * y % modulus, values, 1)
+
+
+# -----------------------------
+
+
+def _lucas_seed(seed: int | GaussianInteger, number: int) -> int:
+    """
+    Parameter `p` modulo `number` of the Lucas sequence of a p+1 seed, that of a
+    Gaussian integer `z` being the trace `(z**2 + conj(z)**2) / norm(z)` of
+    `z / conj(z)`, or the degenerate 2 if the norm is not invertible.
+    """
+
+    if isinstance(seed, int):
+        return seed % number
+    if gcd(seed.norm, number) > 1:
+        return 2 % number
+    square = seed.real**2 - seed.imag**2
+    return 2 * square * pow(seed.norm, -1, number) % number
+
+
+# -----------------------------
+
+
+def _lucas_discriminant(seed: int | GaussianInteger) -> int:
+    """
+    Multiple of the discriminant `p**2 - 4` of the Lucas sequence of a p+1 seed, up to
+    the norm of a Gaussian integer seed, which is a factor as well.
+    """
+
+    if isinstance(seed, int):
+        return seed**2 - 4
+    return 4 * seed.real * seed.imag * seed.norm
+
+
+# -----------------------------
+
+
+def _lucas_v(index: int, value: int, number: int) -> int:
+    """
+    `V[index]` modulo `number` of the Lucas sequence with parameters `p = value` and
+    `q = 1`, by a ladder on the pairs `(V[k], V[k+1])`.
+    """
+
+    low, high = 2, value
+    for bit in bin(index)[2:]:
+        if bit == "1":
+            low, high = (low * high - value) % number, (high * high - 2) % number
+        else:
+            low, high = (low * low - 2) % number, (low * high - value) % number
+    return low
+
+
+# -----------------------------
+
+
+def _lucas_v_odd_terms(value: int, upper: int, number: int) -> list[int]:
+    """
+    `V[1], V[3], ..., V[upper]` modulo `number` of the Lucas sequence with parameters
+    `p = value` and `q = 1`, by `V[k+2] == V[k] * V[2] - V[k-2]`.
+    """
+
+    square = (value * value - 2) % number
+    terms = [value % number]
+    prev = value % number
+    for _ in range(upper // 2):
+        terms.append((terms[-1] * square - prev) % number)
+        prev = terms[-2]
+    return terms
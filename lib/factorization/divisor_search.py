@@ -2,6 +2,7 @@
 #   - module for searching for a divisor using sequence of algorithms
 
 # ===========================================================
+from multiprocessing import Pool
 from typing import Generator, Sequence
 
 from ..config import default
@@ -18,6 +19,7 @@ __all__ = [
 def find_divisors(
     number: int,
     algorithms: Sequence[Algorithm] | None = None,
+    processes: int | None = None,
 ) -> set[int]:
     """
     Find a set of divisors of `number` using given algorithms.
@@ -25,6 +27,7 @@ def find_divisors(
     + number: int --composite
     + algorithms: Sequence[Algorithm] | None
         default None falls back to _default_algorithms()
+    + processes: int | None --defaults to `divisor_search_processes` config
     ~> set[int] --first divisors found using given algorithms
     """
 
@@ -33,7 +36,7 @@ def find_divisors(
 
     return {
         divisor
-        for divisor in DivisorSearch(number, algorithms).search().divisors
+        for divisor in DivisorSearch(number, algorithms, processes).search().divisors
         if 1 < divisor < number
     }
 
@@ -47,15 +50,31 @@ class DivisorSearch:
 
     At each step, the next potential divisor from an algorithm is inspected; if equal to
     `number`, the algorithm is essentially discarded; if greater than 1, at least one
-    non-trivial divisor has been found.
+    non-trivial divisor has been found. The search stops without a divisor once every
+    algorithm has been discarded.
+
+    With `processes > 1`, each algorithm instead runs `find_divisor` in a worker process
+    of a pool, and the pool is terminated as soon as one of them returns a non-trivial
+    divisor; the algorithms then have to be picklable, so their functions must be
+    defined at module level rather than as lambdas, and those with `processes` of their
+    own run in their worker alone.
 
     + number: int --composite
     + algorithms: Sequence[Algorithm]
+    + processes: int | None --defaults to `divisor_search_processes` config
     """
 
-    def __init__(self, number: int, algorithms: Sequence[Algorithm]):
+    def __init__(
+        self,
+        number: int,
+        algorithms: Sequence[Algorithm],
+        processes: int | None = None,
+    ):
         self.number = number
         self.algorithms = algorithms
+        self.processes = (
+            default("divisor_search_processes") if processes is None else processes
+        )
         self._generators = [algorithm.generator(number) for algorithm in algorithms]
         self.divisors = [1 for algorithm in algorithms]
         self._divisor_found = False
@@ -63,6 +82,9 @@ class DivisorSearch:
     def search(self) -> "DivisorSearch":
         """Perform search for non-trivial divisors."""
 
+        if self.processes > 1 and len(self.algorithms) > 1:
+            return self._search_in_processes()
+
         while not self._divisor_found:
             for idx, gen in enumerate(self._generators):
                 divisor = next(gen)
@@ -71,6 +93,25 @@ class DivisorSearch:
                     self._generators[idx] = self._trivial_generator()
                 elif divisor > 1:
                     self._divisor_found = True
+            if all(divisor == self.number for divisor in self.divisors):
+                break
+        return self
+
+    def _search_in_processes(self) -> "DivisorSearch":
+        """
+        Run the algorithms in a process pool, keeping the first non-trivial divisor and
+        terminating the workers still running.
+        """
+
+        tasks = [
+            (idx, algorithm, self.number) for idx, algorithm in enumerate(self.algorithms)
+        ]
+        with Pool(min(self.processes, len(tasks))) as pool:
+            for idx, divisor in pool.imap_unordered(_find_divisor, tasks):
+                self.divisors[idx] = divisor
+                if 1 < divisor < self.number:
+                    self._divisor_found = True
+                    break
         return self
 
     def _trivial_generator(self) -> Generator[int, None, None]:
@@ -87,9 +128,27 @@ def _default_algorithms() -> list[Algorithm]:
     """Get list of default algorithms."""
 
     return [
-        *[
-            Algorithm.build("rho", seed=seed, func=lambda x: x**2 + 1)
-            for seed in default("rho_seeds")
-        ],
+        *[Algorithm.build("rho-brent", seed=seed) for seed in default("rho_seeds")],
         *[Algorithm.build("p-1", seed=seed) for seed in default("minus_seeds")],
+        Algorithm.build("p+1", delay=default("plus_delay")),
+        Algorithm.build("ecm", delay=default("ecm_delay")),
+        Algorithm.build("siqs", delay=default("siqs_delay")),
     ]
+
+
+# -----------------------------
+
+
+def _find_divisor(task: tuple[int, Algorithm, int]) -> tuple[int, int]:
+    """
+    Divisor found by an algorithm in a worker process, with the index of the algorithm.
+
+    + task: tuple[int, Algorithm, int] --`(index, algorithm, number)`
+    ~> tuple[int, int] --`(index, divisor)`
+    """
+
+    idx, algorithm, number = task
+    if hasattr(algorithm, "processes"):
+        #   workers of a pool are daemonic and cannot start processes of their own
+        algorithm.processes = 1
+    return idx, algorithm.find_divisor(number)
@@ -0,0 +1,359 @@
+#   lib/factorization/factor_store.py
+#   - module for a persistent store of factorizations shared between runs and processes
+
+# ===========================================================
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ..config import default
+
+# ===========================================================
+__all__ = [
+    "get_factor_store",
+    "use_factor_store",
+    "FactorStore",
+    "FactorStoreStats",
+]
+# ===========================================================
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS factors ("
+    "number TEXT PRIMARY KEY, factors TEXT NOT NULL, cofactor TEXT NOT NULL, "
+    "last_used INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS factors_last_used ON factors (last_used)",
+)
+
+_factor_store: "FactorStore | None" = None
+
+# ===========================================================
+
+
+def use_factor_store(
+    store: "FactorStore | str | os.PathLike | None",
+) -> "FactorStore | None":
+    """
+    Set the factor store consulted by `Factorization`, opening it at a path if given one.
+
+    Each process using a store has to call this; for a process pool, pass it as the
+    pool initializer with the path, so that every worker shares the same file.
+
+    + store: FactorStore | str | os.PathLike | None --`None` disables the store
+    ~> FactorStore | None
+    """
+
+    global _factor_store
+    if _factor_store is not None and _factor_store is not store:
+        _factor_store.close()
+    if store is None or isinstance(store, FactorStore):
+        _factor_store = store
+    else:
+        _factor_store = FactorStore(store)
+    return _factor_store
+
+
+# -----------------------------
+
+
+def get_factor_store() -> "FactorStore | None":
+    """Get the factor store in use, if any."""
+
+    return _factor_store
+
+
+# =============================
+
+
+@dataclass
+class FactorStoreStats:
+    """
+    Counts of the lookups of a factor store, for judging whether it pays off.
+
+    + hits: int --lookups finding a complete factorization
+    + partial_hits: int --lookups finding a partial factorization
+    + misses: int --lookups finding nothing
+    + memory_hits: int --hits and partial hits answered without reading the file
+    + evictions: int --entries evicted from the file
+    """
+
+    hits: int = 0
+    partial_hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    evictions: int = 0
+
+    # ------------------------
+
+    @property
+    def lookups(self) -> int:
+        """Number of lookups."""
+
+        return self.hits + self.partial_hits + self.misses
+
+    # ------------------------
+
+    @property
+    def hit_rate(self) -> float:
+        """Proportion of lookups finding a complete factorization."""
+
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+# =============================
+
+
+class FactorStore:
+    """
+    Factorizations kept in a SQLite file, with a least recently used cache in memory
+    in front of it.
+
+    Each entry maps a number to the prime factors found so far and the remaining
+    cofactor, which is `1` for a complete factorization and composite otherwise.
+
+    The file may be shared between processes: each process opens its own connection,
+    and a store sent to a worker process reopens the file there. Once the file holds
+    more than `max_entries` entries, the least recently used ones are evicted. Lookups
+    do not write to the file: the entries they use are marked as recently used
+    together, with the next `put` or eviction.
+
+    example:
+        ```
+        store = FactorStore("factors.sqlite")
+        store.put(1001, {7: 1, 11: 1, 13: 1})
+        store.get(1001)
+            ~> ({7: 1, 11: 1, 13: 1}, 1)
+        store.stats.hits, store.stats.memory_hits
+            ~> 1, 1
+        ```
+
+    + path: str | os.PathLike
+    + cache_size: int | None --defaults to `factor_store_cache_size` config
+    + max_entries: int | None --defaults to `factor_store_max_entries` config
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        cache_size: int | None = None,
+        max_entries: int | None = None,
+    ):
+        self.path = os.fspath(path)
+        self.cache_size = (
+            default("factor_store_cache_size") if cache_size is None else cache_size
+        )
+        self.max_entries = (
+            default("factor_store_max_entries") if max_entries is None else max_entries
+        )
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.stats = FactorStoreStats()
+        self._cache: OrderedDict[int, tuple[dict[int, int], int]] = OrderedDict()
+        self._used: dict[int, int] = dict()
+        self._clock = 0
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._puts = 0
+        self._connect()
+
+    # ------------------------
+
+    def __repr__(self) -> str:
+        return f"FactorStore(path={self.path!r})"
+
+    # ------------------------
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update(_cache=OrderedDict(), _used=dict(), _connection=None, _pid=None)
+        return state
+
+    # ------------------------
+
+    def __len__(self) -> int:
+        """Number of entries in the file."""
+
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM factors").fetchone()
+        return count
+
+    # ========================
+
+    def get(self, number: int) -> tuple[dict[int, int], int] | None:
+        """
+        Look up the factorization of `number`.
+
+        + number: int
+        ~> tuple[dict[int, int], int] | None --`(factorization, cofactor)`
+        """
+
+        entry = self._cache.get(number)
+        if entry is not None:
+            self._cache.move_to_end(number)
+            self.stats.memory_hits += 1
+        else:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT factors, cofactor FROM factors WHERE number = ?",
+                    (str(number),),
+                )
+                .fetchone()
+            )
+            if row is None:
+                self.stats.misses += 1
+                return None
+            entry = {prime: exp for prime, exp in json.loads(row[0])}, int(row[1])
+            self._remember(number, entry)
+        self._used[number] = self._tick()
+
+        if entry[1] == 1:
+            self.stats.hits += 1
+        else:
+            self.stats.partial_hits += 1
+        return dict(entry[0]), entry[1]
+
+    # ------------------------
+
+    def put(self, number: int, factorization: dict[int, int], cofactor: int = 1) -> None:
+        """
+        Store the factorization of `number` found so far.
+
+        + number: int
+        + factorization: dict[int, int] --prime factors found so far with multiplicity
+        + cofactor: int --remaining composite cofactor, `1` if the factorization is
+            complete
+        """
+
+        entry = dict(factorization), cofactor
+        connection = self._connect()
+        self._used.pop(number, None)
+        with connection:
+            self._write_used(connection)
+            connection.execute(
+                "INSERT OR REPLACE INTO factors VALUES (?, ?, ?, ?)",
+                (
+                    str(number),
+                    json.dumps(sorted(entry[0].items())),
+                    str(cofactor),
+                    self._tick(),
+                ),
+            )
+        self._remember(number, entry)
+
+        self._puts += 1
+        if self._puts >= max(1, self.max_entries // 16):
+            self.evict()
+
+    # ------------------------
+
+    def evict(self) -> int:
+        """
+        Evict the least recently used entries of the file beyond `max_entries`.
+
+        ~> int --number of entries evicted
+        """
+
+        self._puts = 0
+        connection = self._connect()
+        with connection:
+            self._write_used(connection)
+            evicted = connection.execute(
+                "DELETE FROM factors WHERE number IN ("
+                "SELECT number FROM factors ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        self.stats.evictions += evicted
+        return evicted
+
+    # ------------------------
+
+    def clear(self) -> None:
+        """Remove every entry."""
+
+        self._cache.clear()
+        self._used.clear()
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM factors")
+
+    # ------------------------
+
+    def close(self) -> None:
+        """
+        Mark the entries used by lookups, evict entries beyond `max_entries` and close the
+        connection to the file.
+        """
+
+        if self._connection is not None and self._pid == os.getpid():
+            self.evict()
+            self._connection.close()
+        self._connection = None
+
+    # ------------------------
+
+    def reset_stats(self) -> FactorStoreStats:
+        """
+        Reset the statistics, returning those gathered so far.
+
+        ~> FactorStoreStats
+        """
+
+        stats, self.stats = self.stats, FactorStoreStats()
+        return stats
+
+    # ========================
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Connection to the file for this process, opened in write-ahead logging mode so
+        that processes reading the file do not block one writing to it.
+        """
+
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+            (self._clock,) = connection.execute(
+                "SELECT COALESCE(MAX(last_used), 0) FROM factors"
+            ).fetchone()
+            self._connection = connection
+            self._pid = os.getpid()
+            self._cache.clear()
+            self._used.clear()
+        return self._connection
+
+    # ------------------------
+
+    def _tick(self) -> int:
+        """
+        Next value of the counter ordering the uses of entries, which continues from the
+        largest value in the file when it is opened.
+        """
+
+        self._clock += 1
+        return self._clock
+
+    # ------------------------
+
+    def _write_used(self, connection: sqlite3.Connection) -> None:
+        """Mark the entries used by lookups since the last write as recently used."""
+
+        if self._used:
+            connection.executemany(
+                "UPDATE factors SET last_used = ? WHERE number = ?",
+                [(used, str(number)) for number, used in self._used.items()],
+            )
+            self._used.clear()
+
+    # ------------------------
+
+    def _remember(self, number: int, entry: tuple[dict[int, int], int]) -> None:
+        """Put an entry in the in-memory cache, dropping the least recently used."""
+
+        self._cache[number] = entry
+        self._cache.move_to_end(number)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -2,25 +2,34 @@
 #   - module for factoring a number
 
 # ===========================================================
+from bisect import bisect_left
 from collections import Counter
-from functools import reduce
-from typing import Generator, Sequence
+from functools import lru_cache, reduce
+from heapq import heappop, heappush
+from typing import Generator, Iterable, Iterator, Sequence
 
-from ..basic import integer_sqrt, iter_primes_up_to, lcm, padic
+from ..basic import integer_sqrt, iter_primes_in_range, iter_primes_up_to, lcm, padic
 from ..config import default
-from ..primality import is_prime
+from ..primality import get_prime_table, is_prime
 from ..types import GaussianInteger, QuaternionInteger
 from ..utils import combine_counters
 from .algorithms import Algorithm
 from .divisor_search import find_divisors
+from .factor_store import get_factor_store
 from .gaussian_divisor import _get_gaussian_divisor
 from .quaternion_divisor import _get_quaternion_divisor
+from .spf_table import SmallestPrimeFactorTable
+from .trial_division import TrialDivision
 
 # ===========================================================
 __all__ = [
     "Factorization",
 ]
 # ===========================================================
+_default_trial_division_key: tuple | None = None
+_default_trial_division_value: TrialDivision | None = None
+
+# ===========================================================
 
 
 class Factorization:
@@ -68,12 +77,15 @@ class Factorization:
         self._factors: list[int] | None = None
         self._primes: set[int] | None = None
         self._divisors: list[int] | None = None
+        self._divisor_count: int | None = None
+        self._divisor_sum: int | None = None
         self._square_free_part: "Factorization" | None = None
         self._square_part: "Factorization" | None = None
         self._two_squares: tuple[int, int] | None = None
         self._four_squares: tuple[int, int, int, int] | None = None
         self._euler_phi: int | None = None
         self._carmichael_lambda: int | None = None
+        self._trial: tuple[int, dict[int, int]] | None = None
 
     # ------------------------
 
@@ -102,6 +114,48 @@ class Factorization:
 
     # ------------------------
 
+    @classmethod
+    def from_spf_table(
+        cls, number: int, table: SmallestPrimeFactorTable
+    ) -> "Factorization":
+        """Build factorization of a number covered by a smallest prime factor table."""
+
+        instance = cls(number)
+        instance._factorization = table.factor(number)
+        return instance
+
+    # ------------------------
+
+    @classmethod
+    def factor_many(
+        cls,
+        numbers: Iterable[int],
+        prime_base: Sequence[int] | None = None,
+        algorithms: Sequence[Algorithm] | None = None,
+    ) -> list["Factorization"]:
+        """
+        Build factorizations of many numbers, trial dividing all of them by the prime
+        base at once with product and remainder trees, and leaving the divisor search
+        on the cofactors until their factorizations are needed.
+        """
+
+        numbers = list(numbers)
+        if prime_base:
+            trial_division = _trial_division(
+                tuple(prime_base), default("trial_division_block_size")
+            )
+        else:
+            trial_division = _default_trial_division()
+
+        instances = []
+        for number, trial in zip(numbers, trial_division.many(numbers)):
+            instance = cls(number, prime_base, algorithms)
+            instance._trial = trial
+            instances.append(instance)
+        return instances
+
+    # ------------------------
+
     @classmethod
     def from_list(cls, factors: Sequence[int]) -> "Factorization":
         """Build factorization from list of factors."""
@@ -150,6 +204,7 @@ class Factorization:
                 self._number,
                 self._prime_base,
                 self._algorithms,
+                self._trial,
             )
         return self._factorization
 
@@ -192,6 +247,66 @@ class Factorization:
 
     # ------------------------
 
+    def iter_divisors(self) -> Iterator[int]:
+        """
+        Iterator of divisors of `self.number` in increasing order, without building the
+        list of divisors.
+
+        example: `list(Factorization(12).iter_divisors()) ~> [1, 2, 3, 4, 6, 12]`
+
+        ~> Iterator[int]
+        """
+
+        return _iter_divisors(sorted(self.factorization.items()))
+
+    # ------------------------
+
+    def divisors_in_range(self, lower: int, upper: int) -> list[int]:
+        """
+        Sorted list of divisors of `self.number` in `range(lower, upper)`, without
+        building the list of divisors.
+
+        example: `Factorization(720).divisors_in_range(20, 40) ~> [20, 24, 30, 36]`
+
+        + lower: int
+        + upper: int
+        ~> list[int]
+        """
+
+        return sorted(
+            _divisors_in_range(sorted(self.factorization.items()), lower, upper)
+        )
+
+    # ------------------------
+
+    @property
+    def divisor_count(self) -> int:
+        """Number of divisors of `self.number`."""
+
+        if self._divisor_count is None:
+            self._divisor_count = reduce(
+                lambda acc, exp: acc * (exp + 1),
+                self.factorization.values(),
+                1,
+            )
+        return self._divisor_count
+
+    # ------------------------
+
+    @property
+    def divisor_sum(self) -> int:
+        """Sum of divisors of `self.number`."""
+
+        if self._divisor_sum is None:
+            self._divisor_sum = reduce(
+                lambda acc, number: acc * number,
+                map(_sigma, self.factorization.items()),
+                1,
+            )
+        return self._divisor_sum
+
+    # ------------------------
+
     @property
     def square_part(self) -> "Factorization":
         """Square part of the factorization."""
@@ -298,24 +413,56 @@ def _factor(
     number: int,
     prime_base: Sequence[int] | None,
     algorithms: Sequence[Algorithm] | None,
+    trial: tuple[int, dict[int, int]] | None = None,
 ) -> dict[int, int]:
     """
     Factor `number` into primes using prime base and division search.
 
+    The result of trial division by the prime base, if it has already been done, is
+    passed as `trial`.
+
+    With a factor store in use, a stored factorization is returned as is and a partial
+    one resumes from its cofactor. Once trial division leaves a composite cofactor, the
+    partial factorization is stored before a divisor search that may take a while, and
+    the complete one after it.
+
     example:
         `_factor(1200) ~> {2: 4, 3: 1, 5: 2}`
 
     + number: int
     + prime_base: Sequence[int] | None
     + algorithms: Sequence[Algorithm] | None
+    + trial: tuple[int, dict[int, int]] | None --`(remaining, factorization)`
     ~> dict[int, int] --keys are primes, values are exponents
     """
 
-    number, factorization = _factor_out_prime_base(number, prime_base)
-    return {
+    store = get_factor_store()
+    entry = store.get(number) if store is not None and number > 1 else None
+    if entry is None and trial is not None:
+        remaining, factorization = trial[0], dict(trial[1])
+    elif entry is None:
+        remaining, factorization = _factor_out_prime_base(number, prime_base)
+    else:
+        factorization, cofactor = entry
+        if cofactor == 1:
+            return factorization
+        remaining, found = _factor_out_prime_base(cofactor, prime_base)
+        factorization = {**factorization, **found}
+
+    if store is None or remaining == 1 or is_prime(remaining):
+        return {
+            **factorization,
+            **_factor_with_divisor_search(remaining, algorithms),
+        }
+
+    if remaining.bit_length() > default("small_composite_bits"):
+        store.put(number, factorization, remaining)
+    factorization = {
         **factorization,
-        **_factor_with_divisor_search(number, algorithms),
+        **_factor_with_divisor_search(remaining, algorithms),
     }
+    store.put(number, factorization)
+    return factorization
 
 
 # -----------------------------
@@ -326,7 +473,10 @@ def _factor_with_divisor_search(
     algorithms: Sequence[Algorithm] | None,
 ) -> dict[int, int]:
     """
-    Factor `number` into primes using divisor search.
+    Factor `number` into primes using divisor search, trying SQUFOF and Hart's one line
+    factoring first on composites of at most `small_composite_bits` bits.
+
+    Raises a `ValueError` if every algorithm gives up on a composite.
 
     example:
         `_factor_with_divisor_search(1200) ~> {2: 4, 3: 1, 5: 2}`
@@ -354,7 +504,22 @@ def _factor_with_divisor_search(
     remaining = number
     factorization: dict[int, int] = dict()
 
-    divisors = find_divisors(remaining, algorithms)
+    divisors: set[int] = set()
+    if algorithms is None and number.bit_length() <= default("small_composite_bits"):
+        power = _small_perfect_power(number)
+        if power is not None:
+            root, exp = power
+            return combine_counters(
+                dict(),
+                _factor_with_divisor_search(root, algorithms),
+                1,
+                exp,
+            )
+        divisors = find_divisors(remaining, _small_algorithms())
+    if not divisors:
+        divisors = find_divisors(remaining, algorithms)
+    if not divisors:
+        raise ValueError(f"no divisor of {number} found with the given algorithms")
     for divisor in divisors:
         exp, remaining = padic(remaining, divisor)
         factorization = combine_counters(
@@ -373,12 +538,52 @@ def _factor_with_divisor_search(
 # -----------------------------
 
 
+def _small_algorithms() -> list[Algorithm]:
+    """
+    Get list of algorithms for composites of at most `small_composite_bits` bits, which
+    give up rather than run for long on numbers they cannot split.
+    """
+
+    return [
+        Algorithm.build("squfof"),
+        Algorithm.build("hart", batch_size=50),
+    ]
+
+
+# -----------------------------
+
+
+def _small_perfect_power(number: int) -> tuple[int, int] | None:
+    """
+    Express `number` as `root**exp` for a prime `exp >= 3`, for `number` small enough
+    that its roots are accurate in floating point, since SQUFOF and Hart's one line
+    factoring cannot split prime powers.
+
+    example:
+        `_small_perfect_power(42169**3) ~> (42169, 3)`
+
+    + number: int
+    ~> tuple[int, int] | None --`(root, exp)`
+    """
+
+    for exp in iter_primes_in_range(3, number.bit_length() + 1):
+        root = round(number ** (1 / exp))
+        for candidate in (root - 1, root, root + 1):
+            if candidate**exp == number:
+                return candidate, exp
+    return None
+
+
+# -----------------------------
+
+
 def _factor_out_prime_base(
     number: int,
     prime_base: Sequence[int] | None = None,
 ) -> tuple[int, dict[int, int]]:
     """
-    Factor out `prime_base` primes from `number` using trial division.
+    Factor out `prime_base` primes from `number` using trial division, with gcds
+    against primorial blocks of the prime base.
 
     example:
         `_factor_out_prime_base(1200, [2, 3, 7]) ~> (25, {2: 4, 3: 1})`
@@ -387,13 +592,65 @@ def _factor_out_prime_base(
     + prime_base: Sequence[int] | None
     ~> (remaining, factorization): tuple[int, dict[int, int]]
     """
-    factorization = dict()
-    for prime in prime_base or iter_primes_up_to(default("prime_base_max")):
-        exp, number = padic(number, prime)
-        if exp > 0:
-            factorization[prime] = exp
 
-    return number, factorization
+    if prime_base:
+        return _trial_division(tuple(prime_base), default("trial_division_block_size"))(
+            number
+        )
+    return _default_trial_division()(number)
+
+
+# -----------------------------
+
+
+@lru_cache(maxsize=16)
+def _trial_division(prime_base: tuple[int, ...], block_size: int) -> TrialDivision:
+    """
+    Trial division by a prime base, cached for bases used repeatedly with the
+    `trial_division_block_size` default they were built with.
+    """
+
+    return TrialDivision(prime_base, block_size)
+
+
+# -----------------------------
+
+
+def _default_trial_division() -> TrialDivision:
+    """
+    Trial division by the default prime base, built once for each `prime_base_max`
+    default and each prime table in use.
+
+    ~> TrialDivision
+    """
+
+    global _default_trial_division_key, _default_trial_division_value
+    key: tuple = (default("prime_base_max"), default("trial_division_block_size"))
+    table = get_prime_table()
+    if table is not None and key[0] <= table.limit:
+        key += (table,)
+    value = _default_trial_division_value
+    if _default_trial_division_key != key or value is None:
+        value = TrialDivision(_default_prime_base())
+        _default_trial_division_key, _default_trial_division_value = key, value
+    return value
+
+
+# -----------------------------
+
+
+def _default_prime_base() -> Iterable[int]:
+    """
+    Primes up to the `prime_base_max` default, read from the prime table if in use.
+
+    ~> Iterable[int]
+    """
+
+    prime_base_max = default("prime_base_max")
+    table = get_prime_table()
+    if table is not None and prime_base_max <= table.limit:
+        return table.iter_primes_in_range(2, prime_base_max + 1)
+    return iter_primes_up_to(prime_base_max)
 
 
 # =============================
@@ -429,6 +686,117 @@ def _lambda(prime_with_multiplicity: tuple[int, int]) -> int:
     return phi
 
 
+# -----------------------------
+
+
+def _sigma(prime_with_multiplicity: tuple[int, int]) -> int:
+    """
+    Sum of divisors of a power of a prime.
+
+    + (prime, exp): tuple[int, int]
+    ~> int
+    """
+
+    prime, exp = prime_with_multiplicity
+    return (prime ** (exp + 1) - 1) // (prime - 1)
+
+
+# =============================
+
+
+def _iter_divisors(prime_powers: Sequence[tuple[int, int]]) -> Iterator[int]:
+    """
+    Iterator of divisors of a number in increasing order, from a heap over the lattice
+    of exponents.
+
+    Each divisor other than 1 is pushed once, by the divisor with one fewer of its
+    largest prime, so the heap holds at most one divisor per prime for each divisor
+    popped.
+
+    + prime_powers: Sequence[tuple[int, int]] --primes in increasing order with their
+        exponents
+    ~> Iterator[int]
+    """
+
+    heap = [(1, -1, 0)]
+    while heap:
+        divisor, last, exp = heappop(heap)
+        yield divisor
+        if last >= 0 and exp < prime_powers[last][1]:
+            heappush(heap, (divisor * prime_powers[last][0], last, exp + 1))
+        for index in range(last + 1, len(prime_powers)):
+            heappush(heap, (divisor * prime_powers[index][0], index, 1))
+
+
+# -----------------------------
+
+
+def _divisors_in_range(
+    prime_powers: Sequence[tuple[int, int]],
+    lower: int,
+    upper: int,
+) -> Iterator[int]:
+    """
+    Iterator of divisors of a number in `range(lower, upper)`.
+
+    The prime powers are split into two halves with about as many divisors each. The
+    divisors of one half are listed and sorted. The divisors of the other half come
+    from a depth-first search that prunes a branch once its divisors are at least
+    `upper` or cannot reach `lower`. Each divisor found this way is completed by the
+    run of the sorted list, found by bisection, that lands its products in the range.
+    Only about the square root of the number of divisors is ever held.
+
+    + prime_powers: Sequence[tuple[int, int]] --primes with their exponents
+    + lower: int
+    + upper: int
+    ~> Iterator[int]
+    """
+
+    outer: list[tuple[int, int]] = []
+    inner: list[tuple[int, int]] = []
+    outer_count = inner_count = 1
+    for prime, exp in sorted(prime_powers, key=lambda pair: pair[1], reverse=True):
+        if outer_count <= inner_count:
+            outer.append((prime, exp))
+            outer_count *= exp + 1
+        else:
+            inner.append((prime, exp))
+            inner_count *= exp + 1
+
+    completions = [1]
+    for prime, exp in inner:
+        completions = [
+            completion * prime**power
+            for completion in completions
+            for power in range(exp + 1)
+        ]
+    completions.sort()
+
+    bounds = [completions[-1]]
+    for prime, exp in reversed(outer):
+        bounds.append(bounds[-1] * prime**exp)
+    bounds.reverse()
+
+    stack = [(0, 1)]
+    while stack:
+        index, divisor = stack.pop()
+        if divisor >= upper or divisor * bounds[index] < lower:
+            continue
+        if index < len(outer):
+            prime, exp = outer[index]
+            for _ in range(exp + 1):
+                if divisor >= upper:
+                    break
+                stack.append((index + 1, divisor))
+                divisor *= prime
+            continue
+
+        start = bisect_left(completions, -(-lower // divisor))
+        stop = bisect_left(completions, -(-upper // divisor))
+        for completion in completions[start:stop]:
+            yield divisor * completion
+
+
 # =============================
 
 
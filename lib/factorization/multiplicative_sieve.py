@@ -0,0 +1,330 @@
+#   lib/factorization/multiplicative_sieve.py
+#   - module for sieving arithmetic functions of every number of an interval at once
+
+# ===========================================================
+from array import array
+from typing import TYPE_CHECKING, Any, Sequence
+
+from ..basic import integer_sqrt, lcm, primes_up_to
+from ..config import default
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        np = None
+
+# ===========================================================
+__all__ = [
+    "multiplicative_functions_in_range",
+    "multiplicative_functions_up_to",
+]
+# ===========================================================
+FUNCTIONS = ("phi", "lambda", "mu", "sigma_0", "sigma_1", "omega", "big_omega")
+
+#   typecodes of the arrays returned without NumPy, and NumPy dtypes otherwise
+_TYPECODES = {"phi": "q", "lambda": "q", "mu": "b", "omega": "B", "big_omega": "B"}
+
+# ===========================================================
+
+
+def multiplicative_functions_up_to(
+    limit: int,
+    functions: Sequence[str] | None = None,
+    segment_size: int | None = None,
+) -> dict[str, Any]:
+    """
+    Arithmetic functions of every number in `range(1, limit + 1)`, indexed from 0.
+
+    example: `multiplicative_functions_up_to(6, ["phi", "mu"])
+        ~> {"phi": array([1, 1, 2, 2, 4, 2]), "mu": array([1, -1, -1, 0, -1, 1])}`
+
+    + limit: int
+    + functions: Sequence[str] | None --see `multiplicative_functions_in_range`
+    + segment_size: int | None
+    ~> dict[str, numpy.ndarray | memoryview]
+    """
+
+    return multiplicative_functions_in_range(1, limit + 1, functions, segment_size)
+
+
+# -----------------------------
+
+
+def multiplicative_functions_in_range(
+    lower: int,
+    upper: int,
+    functions: Sequence[str] | None = None,
+    segment_size: int | None = None,
+) -> dict[str, Any]:
+    """
+    Arithmetic functions of every number in `range(lower, upper)`, indexed from 0, from
+    a single segmented sieve by the primes up to the square root of `upper - 1`.
+
+    The functions are named
+    - `"phi"`: Euler's phi function,
+    - `"lambda"`: Carmichael's lambda function,
+    - `"mu"`: the Mobius function,
+    - `"sigma_k"`: the sum of the `k`-th powers of the divisors, for any `k >= 0`,
+    - `"omega"`: the number of distinct prime factors,
+    - `"big_omega"`: the number of prime factors with multiplicity.
+
+    Each segment of `segment_size` numbers divides out the primes dividing its numbers
+    together; whatever is left of each number afterwards is 1 or a prime.
+
+    example: `multiplicative_functions_in_range(10**12, 10**12 + 3, ["sigma_0"])
+        ~> {"sigma_0": array([169, 8, 8])}`
+
+    + lower: int --at least 1
+    + upper: int --at most `2**62`
+    + functions: Sequence[str] | None --defaults to `FUNCTIONS`
+    + segment_size: int | None --defaults to `multiplicative_segment_size` config
+    ~> dict[str, numpy.ndarray | memoryview] --64-bit `phi`, `lambda` and `sigma_k`,
+        except for `sigma_k` too large for 64 bits, which are Python integers, 8-bit
+        `mu`, `omega` and `big_omega`; `memoryview`s of arrays without NumPy
+    """
+
+    if lower < 1:
+        raise ValueError(f"{lower} is not positive")
+    if upper > 1 << 62:
+        raise ValueError("upper must be at most 2**62")
+    functions = list(FUNCTIONS if functions is None else functions)
+    for name in functions:
+        if name not in _TYPECODES and _sigma_power(name) is None:
+            raise ValueError(f"unknown function {name}")
+    if segment_size is None:
+        segment_size = default("multiplicative_segment_size")
+
+    upper = max(upper, lower)
+    primes = primes_up_to(integer_sqrt(max(upper - 1, 0)), as_array=np is not None)
+    if np is None:
+        results = _sieve_segment_python(lower, upper, primes, functions)
+        return {
+            name: memoryview(values) if isinstance(values, array) else values
+            for name, values in results.items()
+        }
+
+    assert isinstance(primes, np.ndarray)
+    primes = primes.astype(np.int64)
+    segments = [
+        _sieve_segment(low, min(low + segment_size, upper), primes, functions)
+        for low in range(lower, upper, segment_size)
+    ] or [_sieve_segment(lower, lower, primes, functions)]
+    return {
+        name: np.concatenate([segment[name] for segment in segments])
+        for name in functions
+    }
+
+
+# =============================
+
+
+def _sieve_segment(
+    lower: int,
+    upper: int,
+    primes: "np.ndarray",
+    functions: Sequence[str],
+) -> dict[str, "np.ndarray"]:
+    """
+    Arithmetic functions of every number in `range(lower, upper)` with NumPy.
+
+    Every multiple of every prime in the segment is listed at once, as pairs of an index
+    and a prime, and each function is updated for all of them with unbuffered ufuncs.
+
+    + lower: int
+    + upper: int
+    + primes: numpy.ndarray --the primes up to `integer_sqrt(upper - 1)`
+    + functions: Sequence[str]
+    ~> dict[str, numpy.ndarray]
+    """
+
+    size = upper - lower
+    numbers = np.arange(lower, upper, dtype=np.int64)
+
+    firsts = -lower % primes
+    counts = np.maximum(size - firsts + primes - 1, 0) // primes
+    prime = np.repeat(primes, counts)
+    starts = np.cumsum(counts) - counts
+    index = (
+        np.repeat(firsts, counts)
+        + (np.arange(prime.size) - np.repeat(starts, counts)) * prime
+    )
+
+    value = numbers[index] // prime
+    exp = np.ones(prime.size, dtype=np.int64)
+    prime_power = prime.copy()
+    divisible = np.flatnonzero(value % prime == 0)
+    while divisible.size:
+        value[divisible] //= prime[divisible]
+        exp[divisible] += 1
+        prime_power[divisible] *= prime[divisible]
+        divisible = divisible[value[divisible] % prime[divisible] == 0]
+
+    remaining = numbers.copy()
+    np.floor_divide.at(remaining, index, prime_power)
+    large = np.flatnonzero(remaining > 1)
+    large_prime = remaining[large]
+
+    results = dict()
+    for name in functions:
+        if name == "phi":
+            values = numbers.copy()
+            np.floor_divide.at(values, index, prime)
+            np.multiply.at(values, index, prime - 1)
+            values[large] //= large_prime
+            values[large] *= large_prime - 1
+        elif name == "lambda":
+            values = np.ones(size, dtype=np.int64)
+            carmichael = prime_power // prime * (prime - 1)
+            carmichael[(prime == 2) & (exp > 2)] //= 2
+            np.lcm.at(values, index, carmichael)
+            values[large] = np.lcm(values[large], large_prime - 1)
+        elif name == "mu":
+            values = np.ones(size, dtype=np.int8)
+            np.multiply.at(values, index, np.where(exp > 1, 0, -1).astype(np.int8))
+            values[large] *= -1
+        elif name == "omega":
+            values = np.bincount(index, minlength=size).astype(np.uint8)
+            values[large] += 1
+        elif name == "big_omega":
+            values = np.bincount(index, weights=exp, minlength=size).astype(np.uint8)
+            values[large] += 1
+        else:
+            k = _sigma_power(name)
+            assert k is not None
+            values = _sigma(k, upper, size, index, prime, exp)
+            values[large] *= 1 + large_prime.astype(values.dtype) ** k
+        results[name] = values
+
+    return results
+
+
+# -----------------------------
+
+
+def _sigma(
+    power: int,
+    upper: int,
+    size: int,
+    index: "np.ndarray",
+    prime: "np.ndarray",
+    exp: "np.ndarray",
+) -> "np.ndarray":
+    """
+    Sum of the `power`-th powers of the divisors of each number of a segment, leaving
+    out its prime factor above the square root of `upper - 1`, if any, in 64 bits when
+    `upper**power` is small enough and with Python integers otherwise.
+    """
+
+    if 8 * (upper - 1) ** power < 1 << 63:
+        values = np.ones(size, dtype=np.int64)
+        prime_power = prime**power
+        terms = prime_power + 1
+        higher = np.flatnonzero(exp > 1)
+        exp = exp[higher]
+        while higher.size:
+            terms[higher] = terms[higher] * prime_power[higher] + 1
+            exp -= 1
+            higher, exp = higher[exp > 1], exp[exp > 1]
+        np.multiply.at(values, index, terms)
+        return values
+
+    values = np.ones(size, dtype=object)
+    prime_power = prime.astype(object) ** power
+    terms = (prime_power ** (exp + 1) - 1) // (prime_power - 1) if power else exp + 1
+    np.multiply.at(values, index, terms)
+    return values
+
+
+# -----------------------------
+
+
+def _sigma_power(name: str) -> int | None:
+    """Power `k` of a function named `"sigma_k"`, if it is one."""
+
+    prefix, _, power = name.partition("_")
+    if prefix == "sigma" and power.isdigit():
+        return int(power)
+    return None
+
+
+# -----------------------------
+
+
+def _sieve_segment_python(
+    lower: int,
+    upper: int,
+    primes: Any,
+    functions: Sequence[str],
+) -> dict[str, array | list[int]]:
+    """Arithmetic functions of every number in `range(lower, upper)` without NumPy."""
+
+    size = upper - lower
+    remaining = list(range(lower, upper))
+    factorizations: list[list[tuple[int, int]]] = [[] for _ in range(size)]
+    for prime in primes:
+        for index in range(-lower % prime, size, prime):
+            exp = 0
+            while remaining[index] % prime == 0:
+                remaining[index] //= prime
+                exp += 1
+            factorizations[index].append((prime, exp))
+    for index, rest in enumerate(remaining):
+        if rest > 1:
+            factorizations[index].append((rest, 1))
+
+    results: dict[str, array | list[int]] = dict()
+    for name in functions:
+        values: list[int]
+        if name == "phi":
+            values = [
+                _product(p ** (e - 1) * (p - 1) for p, e in f) for f in factorizations
+            ]
+        elif name == "lambda":
+            values = [lcm(1, *(_lambda(p, e) for p, e in f)) for f in factorizations]
+        elif name == "mu":
+            values = [
+                0 if any(e > 1 for _, e in f) else (-1) ** len(f) for f in factorizations
+            ]
+        elif name == "omega":
+            values = [len(f) for f in factorizations]
+        elif name == "big_omega":
+            values = [sum(e for _, e in f) for f in factorizations]
+        else:
+            power = _sigma_power(name)
+            assert power is not None
+            values = [
+                _product(sum(p ** (power * j) for j in range(e + 1)) for p, e in f)
+                for f in factorizations
+            ]
+            if 8 * (upper - 1) ** power >= 1 << 63:
+                results[name] = values
+                continue
+        results[name] = array(_TYPECODES.get(name, "q"), values)
+
+    return results
+
+
+# -----------------------------
+
+
+def _lambda(prime: int, exp: int) -> int:
+    """Carmichael's lambda function of `prime**exp`."""
+
+    if prime == 2 and exp > 2:
+        return 2 ** (exp - 2)
+    return prime ** (exp - 1) * (prime - 1)
+
+
+# -----------------------------
+
+
+def _product(values: Any) -> int:
+    """Product of an iterable of integers."""
+
+    result = 1
+    for value in values:
+        result *= value
+    return result
@@ -0,0 +1,665 @@
+#   lib/factorization/quadratic_sieve.py
+#   - module for the self-initializing quadratic sieve
+
+# ===========================================================
+import itertools as it
+import math
+import random
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generator, Iterator
+
+from ..basic import gcd, iter_primes_in_range, jacobi
+from ..modular import mod_sqrt
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        np = None
+
+# ===========================================================
+__all__ = [
+    "siqs_divisors",
+]
+# ===========================================================
+#   factor base size and sieve half width for numbers up to each number of digits
+_PARAMETERS = (
+    (20, 60, 4096),
+    (26, 100, 8192),
+    (30, 150, 8192),
+    (34, 300, 16384),
+    (38, 400, 16384),
+    (42, 600, 16384),
+    (46, 900, 32768),
+    (50, 1500, 32768),
+    (56, 3000, 32768),
+    (60, 4000, 65536),
+    (66, 6000, 65536),
+    (74, 12000, 98304),
+    (80, 25000, 131072),
+    (88, 45000, 196608),
+    (94, 60000, 262144),
+)
+_MULTIPLIERS = (1, 3, 5, 7, 11, 13, 15, 17, 19, 21, 23, 29, 31, 33, 35, 37, 39, 41, 43)
+
+#   primes below this are not sieved, only divided out of candidates
+_SIEVE_MIN = 30
+#   primes below this are sieved one at a time with NumPy, the others all at once
+_SLICE_BOUND = 512
+#   size of the primes whose product makes a leading coefficient
+_TYPICAL_A_PRIME = 2000
+#   samples in a row giving no new leading coefficient before the families run out
+_FAMILY_ATTEMPTS = 100
+#   bits allowed beyond the large prime bound, for the unsieved small primes
+_SMALL_PRIME_FUDGE = 4
+#   relations beyond the size of the factor base before looking for dependencies
+_EXTRA_RELATIONS = 20
+
+_context: "_SieveContext | None" = None
+
+# ===========================================================
+
+
+def siqs_divisors(
+    number: int,
+    factor_base_size: int | None = None,
+    half_width: int | None = None,
+    large_prime_multiplier: int = 128,
+    processes: int = 1,
+    seed: int = 0,
+) -> Generator[int, None, None]:
+    """
+    Potential divisors of `number` from the self-initializing quadratic sieve, for
+    an odd composite that is not a perfect power: 1 for each polynomial sieved, then a
+    nontrivial divisor once the relations have a dependency that splits `number`, or
+    `number` itself if the relations keep giving only trivial divisors.
+
+    A Knuth-Schroeppel multiplier `k` is chosen, and the factor base is made of the
+    primes `p` for which `k * number` is a square modulo `p`. Each leading coefficient
+    `a` is a product of factor base primes near `sqrt(2 * k * number) / half_width`,
+    and the `2**(s - 1)` polynomials sharing it are switched by a Gray code, updating
+    the sieve roots by precomputed differences. Values that are smooth apart from one
+    prime below `large_prime_multiplier` times the largest prime of the factor base are
+    kept, and pairs of them sharing that prime are combined into relations. The
+    dependencies of the exponent vectors modulo 2 are found by Gaussian elimination on
+    integers used as bit sets.
+
+    + number: int --odd, composite and not a perfect power
+    + factor_base_size: int | None --defaults to a size depending on the number of digits
+    + half_width: int | None --defaults to a width depending on the number of digits
+    + large_prime_multiplier: int
+    + processes: int --1 sieves in this process
+    + seed: int --seed for the choice of leading coefficients
+    ~> Generator[int]
+    """
+
+    context = _build_context(number, factor_base_size, half_width, large_prime_multiplier)
+    if isinstance(context, int):
+        while True:
+            yield context
+
+    needed = len(context.primes) + 1 + _EXTRA_RELATIONS
+    relations: list[tuple[int, int, int]] = []
+    partials: dict[int, tuple[int, int, int]] = dict()
+    families = _families(context, random.Random(seed))
+
+    results = _map_families(context, families, processes)
+    try:
+        for fulls, halves in results:
+            relations.extend(fulls)
+            for large_prime, relation in halves:
+                other = partials.pop(large_prime, None)
+                if other is None:
+                    partials[large_prime] = relation
+                else:
+                    relations.append(_combine(relation, other, number))
+
+            if len(relations) >= needed:
+                for divisor in _divisors_from_relations(relations, number):
+                    if 1 < divisor < number:
+                        while True:
+                            yield divisor
+                if needed >= len(context.primes) + 1 + 4 * _EXTRA_RELATIONS:
+                    break
+                needed += _EXTRA_RELATIONS
+            yield 1
+    finally:
+        results.close()
+
+    while True:
+        yield number
+
+
+# =============================
+
+
+@dataclass
+class _SieveContext:
+    """
+    Data shared by every polynomial of the sieve.
+
+    + number: int
+    + scaled: int --`number` times the multiplier
+    + primes: list[int] --factor base
+    + roots: list[int] --square roots of `scaled` modulo each prime
+    + logs: list[int] --rounded base 2 logarithms of each prime
+    + half_width: int
+    + threshold: int --sieve value above which a candidate is trial divided
+    + large_bound: int --bound on the large prime of a partial relation
+    + sieved: list[int] --indices of the primes that are sieved
+    """
+
+    number: int
+    scaled: int
+    primes: list[int]
+    roots: list[int]
+    logs: list[int]
+    half_width: int
+    threshold: int
+    large_bound: int
+    sieved: list[int]
+
+
+# -----------------------------
+
+
+def _build_context(
+    number: int,
+    factor_base_size: int | None,
+    half_width: int | None,
+    large_prime_multiplier: int,
+) -> "_SieveContext | int":
+    """
+    Sieve context for `number`, or a divisor of `number` if one turns up in the factor
+    base.
+    """
+
+    digits = len(str(number))
+    size, width = next(
+        ((size, width) for bound, size, width in _PARAMETERS if digits <= bound),
+        _PARAMETERS[-1][1:],
+    )
+    size = factor_base_size or size
+    width = half_width or width
+
+    multiplier = _knuth_schroeppel(number)
+    scaled = multiplier * number
+    primes, roots = [2], [scaled % 2]
+    for prime in iter_primes_in_range(3):
+        if len(primes) >= size:
+            break
+        if number % prime == 0:
+            return prime
+        if scaled % prime == 0:
+            primes.append(prime)
+            roots.append(0)
+        elif jacobi(scaled, prime) == 1:
+            primes.append(prime)
+            roots.append(mod_sqrt(scaled % prime, prime)[0])
+
+    large_bound = min(large_prime_multiplier * primes[-1], primes[-1] ** 2)
+    threshold = round(
+        math.log2(width)
+        + math.log2(scaled) / 2
+        - 0.5
+        - math.log2(large_bound)
+        - _SMALL_PRIME_FUDGE
+    )
+    return _SieveContext(
+        number=number,
+        scaled=scaled,
+        primes=primes,
+        roots=roots,
+        logs=[round(math.log2(prime)) for prime in primes],
+        half_width=width,
+        threshold=threshold,
+        large_bound=large_bound,
+        sieved=[
+            index
+            for index, prime in enumerate(primes)
+            if prime >= _SIEVE_MIN and roots[index] != 0
+        ],
+    )
+
+
+# -----------------------------
+
+
+def _knuth_schroeppel(number: int) -> int:
+    """
+    Multiplier `k` for which `k * number` has the most small primes in its factor
+    base, weighed against the growth of `k * number`.
+    """
+
+    def score(multiplier: int) -> float:
+        scaled = multiplier * number
+        value = -0.5 * math.log(multiplier)
+        value += {1: 2, 5: 1}.get(scaled % 8, 0.5) * math.log(2)
+        for prime in (3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47):
+            if multiplier % prime == 0:
+                value += math.log(prime) / prime
+            elif jacobi(scaled, prime) == 1:
+                value += 2 * math.log(prime) / (prime - 1)
+        return value
+
+    return max(
+        (multiplier for multiplier in _MULTIPLIERS if gcd(multiplier, number) == 1),
+        key=score,
+    )
+
+
+# -----------------------------
+
+
+def _families(context: _SieveContext, rng: random.Random) -> Iterator[tuple[int, ...]]:
+    """
+    Iterator of distinct leading coefficients, as indices of factor base primes whose
+    product is close to `sqrt(2 * scaled) / half_width`, ending once `_FAMILY_ATTEMPTS`
+    samples in a row give none.
+    """
+
+    primes = context.primes
+    eligible = context.sieved
+    target = math.isqrt(2 * context.scaled) // context.half_width
+    typical = min(_TYPICAL_A_PRIME, primes[eligible[-1]] // 2) if eligible else 2
+    count = max(1, round(math.log(max(target, 2)) / math.log(typical)))
+    eligible_primes = [primes[index] for index in eligible]
+
+    if count == 1:
+        by_distance = sorted(eligible, key=lambda index: abs(primes[index] - target))
+        yield from ((index,) for index in by_distance)
+        return
+
+    low = bisect_left(eligible_primes, typical // 2)
+    high = bisect_left(eligible_primes, 2 * typical)
+    pool = eligible[low:high] if high - low >= 2 * count else eligible
+    used: set[tuple[int, ...]] = set()
+    attempts = 0
+    while len(used) < 100 * len(pool) and attempts < _FAMILY_ATTEMPTS:
+        attempts += 1
+        chosen = rng.sample(pool, count - 1)
+        remaining = target // math.prod(primes[index] for index in chosen)
+        position = min(bisect_left(eligible_primes, remaining), len(eligible) - 1)
+        if position > 0 and abs(eligible_primes[position - 1] - remaining) < abs(
+            eligible_primes[position] - remaining
+        ):
+            position -= 1
+        family = tuple(sorted({*chosen, eligible[position]}))
+        if len(family) == count and family not in used:
+            used.add(family)
+            attempts = 0
+            yield family
+
+
+# -----------------------------
+
+
+def _map_families(
+    context: _SieveContext,
+    families: Iterator[tuple[int, ...]],
+    processes: int,
+) -> Generator[tuple[list, list], None, None]:
+    """
+    Sieve the polynomials of each family, yielding the relations of one polynomial at a
+    time; with `processes > 1`, families are sieved across a process pool keeping at most
+    two families per process in flight.
+    """
+
+    if processes == 1:
+        for family in families:
+            yield from _sieve_family(family, context)
+        return
+
+    executor = ProcessPoolExecutor(
+        processes,
+        initializer=_set_context,
+        initargs=(context,),
+    )
+    try:
+        pending: deque[Future[list[tuple[list, list]]]] = deque(
+            executor.submit(_sieve_family_results, family)
+            for family in it.islice(families, 2 * processes)
+        )
+        while pending:
+            results = pending.popleft().result()
+            for family in it.islice(families, 1):
+                pending.append(executor.submit(_sieve_family_results, family))
+            yield from results
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+# -----------------------------
+
+
+def _set_context(context: _SieveContext) -> None:
+    """Initialize the sieve context of a worker process."""
+
+    global _context
+    _context = context
+
+
+# -----------------------------
+
+
+def _sieve_family_results(family: tuple[int, ...]) -> list[tuple[list, list]]:
+    """Relations of each polynomial of a family, in a worker process."""
+
+    assert _context is not None
+    return list(_sieve_family(family, _context))
+
+
+# -----------------------------
+
+
+def _sieve_family(
+    family: tuple[int, ...], context: _SieveContext
+) -> Iterator[tuple[list, list]]:
+    """
+    Relations found by sieving each polynomial `Q(x) == ((a*x + b)**2 - scaled) / a`
+    with leading coefficient `a` the product of the primes of `family`.
+
+    Each relation is `(a*x + b, (a*x + b)**2 - scaled, vector)`, where bit 0 of
+    `vector` is the sign and bit `i + 1` the parity of the exponent of the `i`th prime
+    of the factor base. Partial relations come with their large prime.
+
+    ~> Iterator[(relations, partial relations)]
+    """
+
+    primes, roots, scaled = context.primes, context.roots, context.scaled
+    width = context.half_width
+    a = math.prod(primes[index] for index in family)
+    gammas, terms = [], []
+    for index in family:
+        prime = primes[index]
+        cofactor = a // prime
+        gamma = roots[index] * pow(cofactor % prime, -1, prime) % prime
+        gammas.append(min(gamma, prime - gamma))
+        terms.append(cofactor * gammas[-1])
+    b = sum(terms)
+
+    members = set(family)
+    sieved = [index for index in context.sieved if index not in members]
+    divided = sorted(set(range(len(primes))) - set(sieved))
+    if np is not None:
+        sieve_primes, logs, first, second, deltas = _family_roots_numpy(
+            family, gammas, sieved, context
+        )
+    else:
+        sieve_primes, logs, first, second, deltas = _family_roots(
+            a, b, terms, sieved, context
+        )
+
+    for polynomial in range(1 << (len(family) - 1)):
+        if polynomial:
+            bit = (polynomial & -polynomial).bit_length() - 1
+            #   the sign of `terms[bit + 1]` in `b` flips, moving each root by its delta
+            if (polynomial ^ polynomial >> 1) >> bit & 1:
+                b -= 2 * terms[bit + 1]
+                step = deltas[bit + 1]
+            else:
+                b += 2 * terms[bit + 1]
+                if np is not None:
+                    step = sieve_primes - deltas[bit + 1]
+                else:
+                    step = [
+                        prime - delta
+                        for prime, delta in zip(sieve_primes, deltas[bit + 1])
+                    ]
+            if np is not None:
+                first = (first + step) % sieve_primes
+                second = (second + step) % sieve_primes
+            else:
+                first = [(r + s) % p for r, s, p in zip(first, step, sieve_primes)]
+                second = [(r + s) % p for r, s, p in zip(second, step, sieve_primes)]
+
+        if np is not None:
+            candidates = _sieve_numpy(first, second, sieve_primes, logs, context)
+        else:
+            candidates = _sieve_bytes(first, second, sieve_primes, logs, context)
+
+        fulls, halves = [], []
+        for position in candidates:
+            u = a * (position - width) + b
+            if np is not None:
+                offsets = position % sieve_primes
+                hits = np.flatnonzero((offsets == first) | (offsets == second)).tolist()
+            else:
+                hits = [
+                    index
+                    for index, (prime, r, s) in enumerate(
+                        zip(sieve_primes, first, second)
+                    )
+                    if position % prime in (r, s)
+                ]
+            relation = _trial_divide(
+                u * u - scaled, divided + [sieved[index] for index in hits], primes
+            )
+            if relation is None:
+                continue
+            remainder, vector = relation
+            if remainder == 1:
+                fulls.append((u, u * u - scaled, vector))
+            elif remainder < context.large_bound:
+                halves.append((remainder, (u, u * u - scaled, vector)))
+        yield fulls, halves
+
+
+# -----------------------------
+
+
+def _family_roots(
+    a: int, b: int, terms: list[int], sieved: list[int], context: _SieveContext
+) -> tuple[list[int], list[int], list[int], list[int], list[list[int]]]:
+    """
+    Primes to sieve with their logarithms, the positions of the two roots of the first
+    polynomial of a family modulo each, and the differences of the roots for each term.
+    """
+
+    width = context.half_width
+    primes = [context.primes[index] for index in sieved]
+    logs = [context.logs[index] for index in sieved]
+    inverses = [pow(a, -1, prime) for prime in primes]
+    first, second = [], []
+    for index, prime, inverse in zip(sieved, primes, inverses):
+        root = context.roots[index]
+        first.append((inverse * (root - b) + width) % prime)
+        second.append((inverse * (-root - b) + width) % prime)
+    deltas = [
+        [2 * term * inverse % prime for prime, inverse in zip(primes, inverses)]
+        for term in terms
+    ]
+    return primes, logs, first, second, deltas
+
+
+# -----------------------------
+
+
+def _family_roots_numpy(
+    family: tuple[int, ...], gammas: list[int], sieved: list[int], context: _SieveContext
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray", list["np.ndarray"]]:
+    """
+    Same as `_family_roots` with NumPy, working with `a` and the terms of `b` modulo
+    each prime from their factors, so that every product fits in 64 bits.
+    """
+
+    primes = np.array([context.primes[index] for index in sieved], dtype=np.int64)
+    roots = np.array([context.roots[index] for index in sieved], dtype=np.int64)
+    logs = np.array([context.logs[index] for index in sieved], dtype=np.int64)
+    residues = [context.primes[index] % primes for index in family]
+
+    a = np.ones_like(primes)
+    for residue in residues:
+        a = a * residue % primes
+    inverses = np.ones_like(primes)
+    exponent = primes - 2
+    while exponent.any():
+        inverses = np.where(exponent & 1 == 1, inverses * a % primes, inverses)
+        a = a * a % primes
+        exponent >>= 1
+
+    terms = []
+    for position, gamma in enumerate(gammas):
+        term = np.full_like(primes, gamma) % primes
+        for other, residue in enumerate(residues):
+            if other != position:
+                term = term * residue % primes
+        terms.append(term)
+    b = sum(terms) % primes
+
+    width = context.half_width
+    first = (inverses * ((roots - b) % primes) + width) % primes
+    second = (inverses * ((-roots - b) % primes) + width) % primes
+    deltas = [2 * term % primes * inverses % primes for term in terms]
+    return primes, logs, first, second, deltas
+
+
+# -----------------------------
+
+
+def _sieve_numpy(
+    first: "np.ndarray",
+    second: "np.ndarray",
+    primes: "np.ndarray",
+    logs: "np.ndarray",
+    context: _SieveContext,
+) -> list[int]:
+    """
+    Positions in the sieve array whose logarithms reach the threshold, with NumPy.
+
+    Primes below `_SLICE_BOUND` are sieved one at a time by strided slices; the hits of
+    the larger primes, a few each, are laid out in one array and counted at once.
+    """
+
+    size = 2 * context.half_width
+    split = int(np.searchsorted(primes, _SLICE_BOUND))
+    sieve = np.zeros(size, dtype=np.uint8)
+    for prime, log, start, other in zip(
+        primes[:split].tolist(),
+        logs[:split].tolist(),
+        first[:split].tolist(),
+        second[:split].tolist(),
+    ):
+        sieve[start::prime] += log
+        sieve[other::prime] += log
+
+    starts = np.concatenate((first[split:], second[split:]))
+    steps = np.concatenate((primes[split:], primes[split:]))
+    counts = np.maximum((size - 1 - starts) // steps + 1, 0)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(starts, counts) + np.repeat(steps, counts) * offsets
+    weights = np.repeat(np.concatenate((logs[split:], logs[split:])), counts)
+    values = np.bincount(positions, weights=weights, minlength=size)
+    values += sieve
+    return np.flatnonzero(values >= context.threshold).tolist()
+
+
+# -----------------------------
+
+
+def _sieve_bytes(
+    first: list[int],
+    second: list[int],
+    primes: list[int],
+    logs: list[int],
+    context: _SieveContext,
+) -> list[int]:
+    """Positions in the sieve array whose logarithms reach the threshold, without NumPy."""
+
+    size = 2 * context.half_width
+    sieve = bytearray(size)
+    for prime, log, start, other in zip(primes, logs, first, second):
+        for position in range(start, size, prime):
+            sieve[position] += log
+        for position in range(other, size, prime):
+            sieve[position] += log
+    threshold = context.threshold
+    return [position for position, value in enumerate(sieve) if value >= threshold]
+
+
+# -----------------------------
+
+
+def _trial_divide(
+    value: int, indices: list[int], primes: list[int]
+) -> tuple[int, int] | None:
+    """
+    Divide `value` by the factor base primes at `indices`, giving the remaining factor
+    and the vector of exponents modulo 2, or `None` if `value` is 0.
+    """
+
+    if value == 0:
+        return None
+    vector = 0
+    if value < 0:
+        value, vector = -value, 1
+    for index in indices:
+        prime = primes[index]
+        while value % prime == 0:
+            value //= prime
+            vector ^= 2 << index
+    return value, vector
+
+
+# -----------------------------
+
+
+def _combine(
+    relation: tuple[int, int, int], other: tuple[int, int, int], number: int
+) -> tuple[int, int, int]:
+    """Combine two partial relations with the same large prime into a relation."""
+
+    return (
+        relation[0] * other[0] % number,
+        relation[1] * other[1],
+        relation[2] ^ other[2],
+    )
+
+
+# -----------------------------
+
+
+def _divisors_from_relations(
+    relations: list[tuple[int, int, int]], number: int
+) -> Iterator[int]:
+    """
+    Potential divisors `gcd(x - y, number)` from the subsets of relations whose product
+    is a square, `x**2 == y**2` modulo `number`.
+    """
+
+    for dependency in _dependencies([vector for _, _, vector in relations]):
+        x, square = 1, 1
+        for index, (u, value, _) in enumerate(relations):
+            if dependency >> index & 1:
+                x = x * u % number
+                square *= value
+        yield gcd(x - math.isqrt(square), number)
+
+
+# -----------------------------
+
+
+def _dependencies(vectors: list[int]) -> Iterator[int]:
+    """
+    Subsets of `vectors` summing to 0 modulo 2, as bit sets of their indices, by
+    Gaussian elimination on the lowest set bit of each vector.
+    """
+
+    pivots: dict[int, tuple[int, int]] = dict()
+    for index, vector in enumerate(vectors):
+        history = 1 << index
+        while vector:
+            lowest = vector & -vector
+            if lowest not in pivots:
+                pivots[lowest] = vector, history
+                break
+            pivot, pivot_history = pivots[lowest]
+            vector ^= pivot
+            history ^= pivot_history
+        else:
+            yield history
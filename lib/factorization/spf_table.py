@@ -0,0 +1,202 @@
+#   lib/factorization/spf_table.py
+#   - module for a table of smallest prime factors for factoring every number up to a limit
+
+# ===========================================================
+from array import array
+from typing import TYPE_CHECKING, Any
+
+from ..basic import integer_sqrt, primes_up_to
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        np = None
+
+# ===========================================================
+__all__ = [
+    "SmallestPrimeFactorTable",
+]
+# ===========================================================
+#   the smallest prime factor of a composite number below `2**32` is below `2**16`,
+#   so it fits in two bytes, and primes are marked with 0
+_LIMIT = (1 << 32) - 1
+
+# ===========================================================
+
+
+class SmallestPrimeFactorTable:
+    """
+    Smallest prime factor of every number up to `limit`, two bytes per number, from
+    which any of those numbers is factored in O(log n) lookups.
+
+    Entry `n` is the smallest prime factor of `n` if `n` is composite and 0 otherwise,
+    which keeps every entry below `2**16` for limits below `2**32`.
+
+    example:
+        ```
+        table = SmallestPrimeFactorTable.build(100)
+        table.smallest_prime_factor(91), table.smallest_prime_factor(97)
+            ~> 7, 97
+        table.factor(72)
+            ~> {2: 3, 3: 2}
+        primes, exps, offsets = table.factor_range(10, 13)
+        list(primes), list(exps), list(offsets)
+            ~> [2, 5, 11, 2, 3], [1, 1, 1, 2, 1], [0, 2, 3, 5]
+        ```
+
+    + limit: int --largest number covered by the table
+    + data: numpy.ndarray | array --unsigned 16-bit entries
+    """
+
+    def __init__(self, limit: int, data: Any):
+        self.limit = limit
+        self._data = data
+
+    # ------------------------
+
+    @classmethod
+    def build(cls, limit: int) -> "SmallestPrimeFactorTable":
+        """
+        Build a table up to `limit` by marking the multiples of each prime up to the
+        square root of `limit`, from the largest prime down, so that the smallest prime
+        factor of each number is marked last.
+
+        + limit: int --less than `2**32`
+        ~> SmallestPrimeFactorTable
+        """
+
+        if not 0 <= limit <= _LIMIT:
+            raise ValueError(f"limit must be between 0 and {_LIMIT}")
+
+        primes = primes_up_to(integer_sqrt(limit))
+        if np is not None:
+            data = np.zeros(limit + 1, dtype=np.uint16)
+            for prime in reversed(primes):
+                data[prime * prime :: prime] = prime
+        else:
+            data = array("H", bytes(2 * (limit + 1)))
+            for prime in reversed(primes):
+                count = len(range(prime * prime, limit + 1, prime))
+                data[prime * prime :: prime] = array("H", [prime]) * count
+
+        return cls(limit, data)
+
+    # ========================
+
+    def __repr__(self) -> str:
+        return f"SmallestPrimeFactorTable(limit={self.limit})"
+
+    # ------------------------
+
+    def smallest_prime_factor(self, number: int) -> int:
+        """
+        Smallest prime factor of `number`, for `2 <= number <= self.limit`.
+
+        + number: int
+        ~> int
+        """
+
+        self._check(number, number)
+        return int(self._data[number]) or number
+
+    # ------------------------
+
+    def factor(self, number: int) -> dict[int, int]:
+        """
+        Prime factors of `number` with multiplicity, for `1 <= number <= self.limit`.
+
+        + number: int
+        ~> dict[int, int] --keys are primes, values are exponents
+        """
+
+        self._check(number, number)
+        data = self._data
+        factorization: dict[int, int] = dict()
+        while number > 1:
+            prime = int(data[number]) or number
+            exp = 0
+            while number % prime == 0:
+                number //= prime
+                exp += 1
+            factorization[prime] = exp
+        return factorization
+
+    # ------------------------
+
+    def factor_range(self, lower: int, upper: int) -> tuple[Any, Any, Any]:
+        """
+        Factor every number in `range(lower, upper)` at once, in compressed sparse row
+        form: the primes of `lower + i` with their exponents are
+        `primes[offsets[i] : offsets[i + 1]]` and `exps[offsets[i] : offsets[i + 1]]`,
+        in increasing order of the primes.
+
+        With NumPy, the numbers are factored together, one prime of each per pass, and
+        the `k`-th prime of each number found in the `k`-th pass is written straight to
+        its place.
+
+        + lower: int --at least 1
+        + upper: int --at most `self.limit + 1`
+        ~> (primes, exps, offsets): tuple --`numpy.ndarray`s of unsigned 32-bit primes,
+            unsigned 8-bit exponents and 64-bit offsets, `memoryview`s without NumPy
+        """
+
+        self._check(lower, upper - 1)
+        if isinstance(self._data, array):
+            return self._factor_range_python(lower, upper)
+
+        size = max(upper - lower, 0)
+        remaining = np.arange(lower, lower + size, dtype=np.uint32)
+        counts = np.zeros(size, dtype=np.int64)
+        indices = np.flatnonzero(remaining > 1)
+        passes = []
+        while indices.size:
+            values = remaining[indices]
+            prime = self._data[values].astype(np.uint32)
+            prime = np.where(prime == 0, values, prime)
+            values //= prime
+            exp = np.ones(indices.size, dtype=np.uint8)
+            divisible = np.flatnonzero(values % prime == 0)
+            while divisible.size:
+                values[divisible] //= prime[divisible]
+                exp[divisible] += 1
+                divisible = divisible[values[divisible] % prime[divisible] == 0]
+            passes.append((indices, prime, exp))
+            counts[indices] += 1
+            remaining[indices] = values
+            indices = indices[values > 1]
+
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        primes = np.zeros(offsets[-1], dtype=np.uint32)
+        exps = np.zeros(offsets[-1], dtype=np.uint8)
+        for index, (rows, prime, exp) in enumerate(passes):
+            positions = offsets[rows] + index
+            primes[positions] = prime
+            exps[positions] = exp
+        return primes, exps, offsets
+
+    # ========================
+
+    def _factor_range_python(self, lower: int, upper: int) -> tuple[Any, Any, Any]:
+        """Compressed sparse row factorizations of `range(lower, upper)` without NumPy."""
+
+        primes, exps, offsets = array("I"), array("B"), array("q", [0])
+        for number in range(lower, upper):
+            factorization = self.factor(number)
+            primes.extend(factorization.keys())
+            exps.extend(factorization.values())
+            offsets.append(len(primes))
+        return memoryview(primes), memoryview(exps), memoryview(offsets)
+
+    # ------------------------
+
+    def _check(self, lower: int, upper: int) -> None:
+        """Raise unless `range(lower, upper + 1)` is within the table and positive."""
+
+        if lower < 1:
+            raise ValueError(f"{lower} is not positive")
+        if upper > self.limit:
+            raise ValueError(f"{upper} is outside of the table")
@@ -0,0 +1,320 @@
+#   lib/factorization/trial_division.py
+#   - module for trial division by a prime base with gcds against primorial blocks
+
+# ===========================================================
+import math
+from typing import Iterable
+
+from ..basic import gcd, padic
+from ..config import default
+
+# ===========================================================
+__all__ = [
+    "TrialDivision",
+]
+# ===========================================================
+#   moduli below which a remainder tree is not worth building, and size in bits of
+#   the moduli above which reduction goes through a reciprocal
+_REMAINDER_TREE_MIN = 8
+_NEWTON_BITS = 1 << 15
+
+# ===========================================================
+
+
+class TrialDivision:
+    """
+    Trial division by a fixed base of primes, split into blocks whose products are
+    arranged in a binary tree.
+
+    Calling it on a number takes the gcd of the number with the product of the whole
+    base, then only descends into the halves whose gcd is greater than 1, each time
+    with the gcd found above instead of the number. The exponents are extracted with
+    `padic` only for the primes of the blocks that are hit, so a number with no prime
+    factor in the base costs a single gcd however large the base is.
+
+    example:
+        ```
+        trial_division = TrialDivision(primes_up_to(1000))
+        trial_division(1200)
+            ~> (1, {2: 4, 3: 1, 5: 2})
+        trial_division(1009 * 1013)
+            ~> (1022117, {})
+        ```
+
+    + primes: Iterable[int] --the primes of the base, in the order they are reported,
+        repeats ignored
+    + block_size: int | None --primes per block, defaults to `trial_division_block_size`
+        config
+    """
+
+    def __init__(self, primes: Iterable[int], block_size: int | None = None):
+        if block_size is None:
+            block_size = default("trial_division_block_size")
+        primes = list(dict.fromkeys(primes))
+        self.primes = primes
+        self.blocks = [
+            primes[start : start + block_size]
+            for start in range(0, len(primes), block_size)
+        ]
+
+        self.levels = _product_tree([_product(block) for block in self.blocks])
+
+    # ------------------------
+
+    def __repr__(self) -> str:
+        return f"TrialDivision(primes={len(self.primes)})"
+
+    # ------------------------
+
+    def __call__(self, number: int) -> tuple[int, dict[int, int]]:
+        """
+        Factor the primes of the base out of `number`.
+
+        + number: int --nonzero
+        ~> (remaining, factorization): tuple[int, dict[int, int]]
+        """
+
+        factorization: dict[int, int] = dict()
+        if not self.primes:
+            return number, factorization
+
+        top = len(self.levels) - 1
+        stack = [(top, 0, gcd(number, self.levels[top][0]))]
+        while stack:
+            depth, index, common = stack.pop()
+            if common == 1:
+                continue
+            if depth > 0:
+                level = self.levels[depth - 1]
+                for child in (2 * index + 1, 2 * index):
+                    if child < len(level):
+                        stack.append((depth - 1, child, gcd(common, level[child])))
+                continue
+            for prime in self.blocks[index]:
+                if common % prime == 0:
+                    exp, number = padic(number, prime)
+                    factorization[prime] = exp
+
+        return number, factorization
+
+    # ------------------------
+
+    def many(self, numbers: Iterable[int]) -> list[tuple[int, dict[int, int]]]:
+        """
+        Factor the primes of the base out of each of `numbers` at once, with the same
+        results as calling the trial division on each of them.
+
+        This is Bernstein's batch trial division: the product of the whole base is
+        reduced modulo every number at once with a remainder tree over the numbers,
+        leaving the gcd of each number with the base. Those gcds then descend the tree
+        of the base together, each node of the base reduced modulo all the gcds that
+        reach it with another remainder tree, so that no number is ever divided by a
+        product of the base directly. A base whose product is small enough to divide
+        cheaply is tried against each number in turn instead.
+
+        example: `TrialDivision(primes_up_to(1000)).many([1200, 1009 * 1013])
+            ~> [(1, {2: 4, 3: 1, 5: 2}), (1022117, {})]`
+
+        + numbers: Iterable[int] --nonzero
+        ~> list[tuple[int, dict[int, int]]] --`(remaining, factorization)` of each number
+        """
+
+        remaining = list(numbers)
+        if 0 in remaining:
+            raise ValueError("number must be nonzero")
+        factorizations: list[dict[int, int]] = [dict() for _ in remaining]
+        if not self.primes or not remaining:
+            return list(zip(remaining, factorizations))
+
+        top = len(self.levels) - 1
+        root = self.levels[top][0]
+        if root.bit_length() < _NEWTON_BITS:
+            return [self(number) for number in remaining]
+
+        moduli = [abs(number) for number in remaining]
+        residues = _remainders(root, _remainder_trees(moduli, root.bit_length()))
+        commons = list(map(math.gcd, moduli, residues))
+        stack = [(top, 0, list(range(len(remaining))), commons)]
+        while stack:
+            depth, index, members, commons = stack.pop()
+            hits = [
+                (member, common) for member, common in zip(members, commons) if common > 1
+            ]
+            if not hits:
+                continue
+            members = [member for member, _ in hits]
+            commons = [common for _, common in hits]
+            if depth > 0:
+                level = self.levels[depth - 1]
+                trees = _remainder_trees(commons, level[2 * index].bit_length())
+                for child in (2 * index + 1, 2 * index):
+                    if child < len(level):
+                        residues = _remainders(level[child], trees)
+                        stack.append(
+                            (
+                                depth - 1,
+                                child,
+                                members,
+                                list(map(math.gcd, commons, residues)),
+                            )
+                        )
+                continue
+            for prime in self.blocks[index]:
+                for member, common in hits:
+                    if common % prime == 0:
+                        exp, remaining[member] = padic(remaining[member], prime)
+                        factorizations[member][prime] = exp
+
+        return list(zip(remaining, factorizations))
+
+
+# =============================
+
+
+def _product_tree(numbers: list[int]) -> list[list[int]]:
+    """
+    Levels of the product tree of `numbers`, from `numbers` up to their product.
+
+    + numbers: list[int] --nonempty
+    ~> list[list[int]]
+    """
+
+    levels = [numbers]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        levels.append(
+            [_product(level[index : index + 2]) for index in range(0, len(level), 2)]
+        )
+    return levels
+
+
+# -----------------------------
+
+
+def _remainders(number: int, trees: list[list[list[int]]]) -> list[int]:
+    """
+    `number` modulo each of the moduli of `trees`, reducing it modulo the product at the
+    top of each tree, then modulo the product of each half of it, and so on down.
+
+    + number: int --nonnegative
+    + trees: list[list[list[int]]] --from `_remainder_trees`
+    ~> list[int]
+    """
+
+    remainders: list[int] = []
+    for levels in trees:
+        residues = [_mod(number, levels[-1][0])]
+        for level in reversed(levels[:-1]):
+            residues = [
+                _mod(residues[index // 2], modulus) for index, modulus in enumerate(level)
+            ]
+        remainders.extend(residues)
+    return remainders
+
+
+# -----------------------------
+
+
+def _remainder_trees(moduli: list[int], bits: int) -> list[list[list[int]]]:
+    """
+    Product trees of consecutive groups of `moduli`, for reducing numbers of `bits`
+    bits with `_remainders`.
+
+    Each group is about as large as the numbers, so that reducing a number modulo the
+    product of the group is cheap and the products never grow much beyond it. With at
+    most `_REMAINDER_TREE_MIN` moduli, each is a group of its own, so that numbers are
+    reduced modulo each of them directly.
+
+    + moduli: list[int] --positive
+    + bits: int
+    ~> list[list[list[int]]]
+    """
+
+    if len(moduli) <= _REMAINDER_TREE_MIN:
+        return [[[modulus]] for modulus in moduli]
+
+    trees = []
+    group_bits = max(bits, _NEWTON_BITS)
+    start = 0
+    while start < len(moduli):
+        stop, size = start, 0
+        while stop < len(moduli) and size < group_bits:
+            size += moduli[stop].bit_length()
+            stop += 1
+        trees.append(_product_tree(moduli[start:stop]))
+        start = stop
+    return trees
+
+
+# -----------------------------
+
+
+def _mod(number: int, modulus: int) -> int:
+    """
+    `number` modulo `modulus`, for a large `modulus` from the quotient by a reciprocal
+    computed with Newton's method, so that the cost is that of a few multiplications
+    rather than that of the long division of CPython, which is quadratic.
+
+    + number: int --nonnegative
+    + modulus: int --positive
+    ~> int
+    """
+
+    size = modulus.bit_length()
+    if size < _NEWTON_BITS or number.bit_length() < size + 64:
+        return number % modulus
+
+    precision = number.bit_length() - size + 1
+    quotient = (number * _reciprocal(modulus, precision)) >> (size + precision)
+    remainder = number - quotient * modulus
+    for _ in range(4):
+        if remainder < 0:
+            remainder += modulus
+        elif remainder >= modulus:
+            remainder -= modulus
+        else:
+            return remainder
+    return number % modulus
+
+
+# -----------------------------
+
+
+def _reciprocal(number: int, precision: int) -> int:
+    """
+    Approximation of `2**(number.bit_length() + precision) // number`, within a few
+    units, by Newton's method doubling the precision of a reciprocal of the leading bits
+    of `number`.
+
+    + number: int --positive
+    + precision: int --positive
+    ~> int
+    """
+
+    size = number.bit_length()
+    if size > precision + 64:
+        return _reciprocal((number >> (size - precision - 64)) + 1, precision)
+    if precision <= 2048:
+        return (1 << (size + precision)) // number
+
+    half = precision // 2 + 32
+    approximation = _reciprocal(number, half)
+    error = (1 << (size + half)) - number * approximation
+    return (approximation << (precision - half)) + (
+        (approximation * error) >> (size + 2 * half - precision)
+    )
+
+
+# -----------------------------
+
+
+def _product(numbers: list[int]) -> int:
+    """Product of a list of integers, multiplying halves so that the operands balance."""
+
+    if len(numbers) <= 8:
+        result = 1
+        for number in numbers:
+            result *= number
+        return result
+    middle = len(numbers) // 2
+    return _product(numbers[:middle]) * _product(numbers[middle:])
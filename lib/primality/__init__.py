@@ -3,6 +3,7 @@
 
 # ===========================================================
 from .algorithms import (  # noqa: 401
+    bpsw_test,
     is_prime,
     lucas_test,
     miller_rabin_test,
@@ -11,7 +12,14 @@ from .algorithms import (  # noqa: 401
     Observation,
     PrimalityWitness,
 )
+from .batch import is_prime_many
 from .goldbach import goldbach_partition
+from .prefilter import (  # noqa: 401
+    get_prefilter,
+    use_prefilter,
+    PrefilterStats,
+    TrialDivisionPrefilter,
+)
 from .prime_search import (  # noqa: 401
     is_prime,
     next_prime,
@@ -21,6 +29,15 @@ from .prime_search import (  # noqa: 401
     prev_primes,
     PrimeSearch,
 )
+from .prime_table import (  # noqa: 401
+    get_prime_table,
+    use_prime_table,
+    PrimeTable,
+)
+from .segmented_sieve import (  # noqa: 401
+    count_primes_in_range,
+    sieve_primes_in_range,
+)
 from .twin_prime_search import (  # noqa: 401
     next_twin_prime,
     prev_twin_prime,
@@ -29,13 +46,22 @@ from .twin_prime_search import (  # noqa: 401
 
 # ===========================================================
 __all__ = [
+    "count_primes_in_range",
+    "get_prefilter",
+    "get_prime_table",
     "goldbach_partition",
     "is_prime",
+    "is_prime_many",
     "next_prime",
     "next_primes",
     "primes_in_range",
     "prev_prime",
     "prev_primes",
+    "sieve_primes_in_range",
+    "use_prefilter",
+    "use_prime_table",
+    "PrimeTable",
+    "TrialDivisionPrefilter",
     "next_twin_prime",
     "prev_twin_prime",
 ]
@@ -4,15 +4,27 @@
 # ===========================================================
 import abc
 from dataclasses import dataclass
+from functools import reduce
 from random import randint
 from typing import Generator, Literal, Iterable, Type
 
-from ..basic import gcd, is_square, jacobi, padic
+from ..basic import (
+    gcd,
+    is_square,
+    jacobi,
+    padic,
+    primes_up_to,
+    reduction_context,
+    ModularContext,
+)
 from ..config import default
 from ..sequences import LucasSequence
+from .prefilter import get_prefilter
+from .prime_table import get_prime_table
 
 # ===========================================================
 __all__ = [
+    "bpsw_test",
     "is_prime",
     "lucas_test",
     "miller_rabin_test",
@@ -23,33 +35,54 @@ __all__ = [
 # ===========================================================
 
 
-def is_prime(number, miller_rabin_count=None, lucas_count=None):
+def is_prime(number, miller_rabin_count=None, lucas_count=None, mode=None):
     """
     Determine if `number` is prime.
     - a return value of `False` is always correct.
-    - if `number < 341_550_071_728_321`, only the pre-determined Miller-Rabin
-        witnesses are used and the result is deterministic.
-    - otherwise, the result is probabalistic with probability of incorrectness
-        less than
+    - if a prime table is in use (see `use_prime_table`) and covers `number`, the
+        result is looked up in the table.
+    - multiples of primes up to the `prefilter_bound` config are rejected and small
+        primes accepted by a single gcd, see `use_prefilter`.
+    - if `number < 2**32`, at most two hashed Miller-Rabin witnesses are used and the
+        result is deterministic.
+    - if `number < 3_317_044_064_679_887_385_961_981`, only the pre-determined
+        Miller-Rabin witnesses are used and the result is deterministic.
+    - otherwise, in `bpsw` mode, the Baillie-PSW test is used, which has no known
+        counterexample.
+    - otherwise, in `probabilistic` mode, the result is probabalistic with probability
+        of incorrectness less than
         `(1/4)**miller_rabin_count * (4/15)**lucas_count`.
 
     + number: int
-    + miller_rabin_count: int --number of Miller-Rabin witnesses
-    + lucas_count: int --number of Lucas witness pairs
+    + miller_rabin_count: int --number of Miller-Rabin witnesses in `probabilistic` mode
+    + lucas_count: int --number of Lucas witness pairs in `probabilistic` mode
+    + mode: "bpsw" | "probabilistic" | None --defaults to `primality_mode` config
     ~> bool
     """
     if number < 2:
         return False
 
-    if number == 2:
-        return True
+    table = get_prime_table()
+    if table is not None and number <= table.limit:
+        return number in table
 
-    if number % 2 == 0:
-        return False
+    prefilter = get_prefilter()
+    verdict = prefilter(number)
+    if verdict is not None:
+        return verdict
+
+    if number < MillerRabinWitness.HASH_CUTOFF:
+        screened = prefilter.bound >= max(MillerRabinWitness.HASH_PRIMES)
+        return _observe_hashed(number, screened).value == "prime"
 
     if number < MillerRabinWitness.MAX_CUTOFF:
         return miller_rabin_test(number, witness_count=1).value == "prime"
 
+    if mode is None:
+        mode = default("primality_mode")
+    if mode == "bpsw":
+        return bpsw_test(number).value != "composite"
+
     if miller_rabin_count is None:
         miller_rabin_count = default("miller_rabin_witness_count")
     if miller_rabin_test(number, witness_count=miller_rabin_count).value == "composite":
@@ -66,26 +99,75 @@ def is_prime(number, miller_rabin_count=None, lucas_count=None):
 # -----------------------------
 
 
-def miller_rabin_test(number: int, witness_count: int) -> "Observation":
+def bpsw_test(number: int) -> "Observation":
+    """
+    Baillie-PSW test for primality of `number`: a strong Miller-Rabin test to base 2
+    followed by a strong Lucas test with Selfridge's parameters.
+
+    If `number < 3_317_044_064_679_887_385_961_981`, the deterministic Miller-Rabin
+    test is used instead. Otherwise, the test returns an observation of `strong_probable_prime` or
+    `composite`. A `composite` observation is a true result, and no composite number
+    is known to be a `strong_probable_prime`.
+
+    example:
+        `bpsw_test(2**127 - 1) ~> Observation(value="strong_probable_prime")`
+        `bpsw_test(2**128 + 1) ~> Observation(value="composite")`
+
+    + number: int
+    ~> Observation
+    """
+
+    if number < MillerRabinWitness.MAX_CUTOFF:
+        return miller_rabin_test(number, witness_count=1)
+    if number % 2 == 0:
+        return Observation.composite()
+
+    if MillerRabinWitness(2).observe(number).value == "composite":
+        return Observation.composite()
+
+    witness = LucasWitness.selfridge(number)
+    if witness is None or witness.observe(number).value != "strong_probable_prime":
+        return Observation.composite()
+
+    return Observation.probable_prime(strong=True)
+
+
+# -----------------------------
+
+
+def miller_rabin_test(
+    number: int,
+    witness_count: int,
+    hashed: bool = False,
+) -> "Observation":
     """
     Miller-Rabin test for primality of `number` with `witness_count` witnesses.
 
-    If `number < 341_550_071_729_321`, the test is deterministic and returns an
+    If `number < 3_317_044_064_679_887_385_961_981`, the test is deterministic, using
+    at most 7 witnesses below `2**64` and at most 13 above, and returns an
     observation of `prime` or `composite`.  Otherwise, the test is probabilistic and
     returns an observation of `probable_prime` or `composite`. A `composite` observation
     is a true result while a `probable_prime` observation is a probabilistic result, where
     the probability of being incorrect is less than `(1/4)**witness_count`.
 
+    If `hashed` and `number < 2**32`, the test is deterministic with at most two
+    witnesses, see `MillerRabinWitness.hashed`. The hashed mode covers 32-bit inputs
+    only: `hashed` is ignored from `2**32` on, where 64-bit inputs keep the seven
+    deterministic witnesses of `MillerRabinWitness.U64_BASES`.
+
     example:
-        `miller_rabin(9958780815586951, witness_count=10)
+        `miller_rabin_test(2**89 - 1, witness_count=10)
             ~> Observation(value="probable_prime"`
         so is likely prime with probability > 0.99999904632568359375.
 
     + number: int
     + witness_count: int
+    + hashed: bool
     ~> Observation
     """
 
+    if hashed and 2 <= number < MillerRabinWitness.HASH_CUTOFF:
+        return _observe_hashed(number)
     return _observe(number, witness_count, MillerRabinWitness)
 
 
@@ -141,6 +223,33 @@ def _observe(number: int, count: int, cls: Type["PrimalityWitness"]) -> "Observa
     )
 
 
+# -----------------------------
+
+
+def _observe_hashed(number: int, screened: bool = False) -> "Observation":
+    """
+    Deterministic observation of whether `number < 2**32` is `prime` or `composite`,
+    from a gcd with the primes below 256 followed by the hashed Miller-Rabin witnesses.
+
+    The gcd is skipped if `screened`, when a prefilter has already rejected the
+    multiples of the primes below 256.
+
+    + number: int --at least 2 and less than `2**32`
+    + screened: bool --whether `number` is known to have no prime factor below 256
+    ~> Observation
+    """
+
+    if not screened and gcd(number, MillerRabinWitness.HASH_PRIMORIAL) > 1:
+        if number in MillerRabinWitness.HASH_PRIMES:
+            return Observation.prime()
+        return Observation.composite()
+    if number < 257**2:
+        return Observation.prime()
+    return Observation.compose(
+        witness.observe(number) for witness in MillerRabinWitness.hashed(number)
+    )
+
+
 # =============================
 
 
@@ -242,11 +351,15 @@ class MillerRabinWitness(PrimalityWitness):
     """
     Witness for the Miller-Rabin primality test.
 
+    Below `MAX_CUTOFF`, the witnesses are pre-determined: the prime witnesses in
+    `CUTOFFS` whose value is at most the number, or the seven witnesses in `U64_BASES`
+    if the number is less than `2**64` and that is fewer witnesses.
+
     + value: int --witness value
     + assured: bool --whether a positive result is `prime` or `probable_prime`
     """
 
-    MAX_CUTOFF = 341550071728321
+    MAX_CUTOFF = 3317044064679887385961981
     CUTOFFS = (
         (1, 2),
         (2047, 3),
@@ -255,7 +368,29 @@ class MillerRabinWitness(PrimalityWitness):
         (3215031751, 11),
         (2152302898747, 13),
         (3474749660383, 17),
+        (341550071728321, 19),
+        (341550071728321, 23),
+        (3825123056546413051, 29),
+        (3825123056546413051, 31),
+        (3825123056546413051, 37),
+        (318665857834031151167461, 41),
     )
+    U64_CUTOFF = 2**64
+    U64_BASES = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+    #   the base-2 strong pseudoprimes below 2**32 with no prime factor below 256
+    #   were enumerated through their smallest prime factor `p`, as they are
+    #   congruent to `p` modulo `p * ord_p(2)`; each hash bucket holds the smallest
+    #   base that none of the pseudoprimes in the bucket are strong pseudoprimes to;
+    #   there is no such table for 64-bit inputs, which would need every base-2 strong
+    #   pseudoprime below 2**64
+    HASH_CUTOFF = 2**32
+    HASH_PRIMES = frozenset(primes_up_to(256))
+    HASH_PRIMORIAL = reduce(lambda acc, prime: acc * prime, sorted(HASH_PRIMES))
+    HASH_BASES = (
+        34, 33, 17, 15, 13, 45, 59, 163, 15, 15, 7, 33, 21, 53, 7, 59,
+        65, 15, 11, 35, 15, 47, 15, 39, 110, 5, 38, 30, 30, 38, 7, 17,
+    )  # fmt: skip
 
     def __init__(self, value: int, assured: bool = False):
         self._value = value
@@ -268,7 +403,7 @@ class MillerRabinWitness(PrimalityWitness):
 
     # ------------------------
 
-    def observe(self, number: int) -> Observation:
+    def observe(self, number: int, context: ModularContext | None = None) -> Observation:
         """
         Observe the primality of a number, according to a Miller-Rabin witness.
 
@@ -278,11 +413,16 @@ class MillerRabinWitness(PrimalityWitness):
             - composite
 
         + number: int
+        + context: ModularContext | None --for modular arithmetic relative to `number`
         ~> Observation
         """
 
+        context = reduction_context(number, context)
         exp, rest = padic(number - 1, 2)
-        x = pow(self._value, rest, number)
+        if context is None:
+            x = pow(self._value, rest, number)
+        else:
+            x = context.powmod(self._value, rest)
 
         if x == 1 or x == number - 1:
             if self._assured:
@@ -290,7 +430,7 @@ class MillerRabinWitness(PrimalityWitness):
             return Observation.probable_prime()
 
         for _ in range(exp):
-            x = pow(x, 2, number)
+            x = x * x % number if context is None else context.sqrmod(x)
 
             if x == number - 1:
                 if self._assured:
@@ -304,6 +444,22 @@ class MillerRabinWitness(PrimalityWitness):
 
     # ------------------------
 
+    @classmethod
+    def hashed(cls, number: int) -> Generator["MillerRabinWitness", None, None]:
+        """
+        Generate the witness 2 and a witness selected by hashing `number`, which
+        together are deterministic for `number < 2**32` with no prime factor below 256.
+
+        + number: int --less than `2**32` with no prime factor below 256
+        ~> Generator[MillerRabinWitness]
+        """
+
+        yield MillerRabinWitness(2, assured=True)
+        index = (number * 0x9E3779B1 & 0xFFFFFFFF) >> 27
+        yield MillerRabinWitness(MillerRabinWitness.HASH_BASES[index], assured=True)
+
+    # ------------------------
+
     @classmethod
     def generate(
         cls,
@@ -318,22 +474,28 @@ class MillerRabinWitness(PrimalityWitness):
         ~> Generator[MillerRabinWitness]
         """
 
-        if number > MillerRabinWitness.MAX_CUTOFF:
+        if number >= MillerRabinWitness.MAX_CUTOFF:
             if count > number:
                 for value in range(2, number - 1):
                     yield MillerRabinWitness(value, assured=True)
             else:
-                values: set[int] = set()
-                while len(values) < count:
+                seen: set[int] = set()
+                while len(seen) < count:
                     value = randint(2, number - 1)
-                    if value not in values:
-                        values.add(value)
+                    if value not in seen:
+                        seen.add(value)
                         yield MillerRabinWitness(value)
 
         else:
-            for value, prime in MillerRabinWitness.CUTOFFS:
-                if number >= value:
-                    yield MillerRabinWitness(prime, assured=True)
+            values = [
+                prime for value, prime in MillerRabinWitness.CUTOFFS if number >= value
+            ]
+            if number < MillerRabinWitness.U64_CUTOFF and len(values) > len(
+                MillerRabinWitness.U64_BASES
+            ):
+                values = list(MillerRabinWitness.U64_BASES)
+            for value in values:
+                yield MillerRabinWitness(value, assured=True)
 
 
 # =============================
@@ -351,7 +513,6 @@ class LucasWitness(PrimalityWitness):
         self._p = p
         self._q = q
         self._disc = p**2 - 4 * q
-        self._strong = False
 
     # ------------------------
 
@@ -379,28 +540,25 @@ class LucasWitness(PrimalityWitness):
 
         delta = number - jacobi(self._disc, number)
         upper, index = padic(delta, 2)
-        seq = LucasSequence.at_index(index, p=self._p, q=self._q, modulus=number)
-        q = seq.value.q
-
-        if seq.value.u == 0:
-            self._strong = True
+        value = LucasSequence.at_index(index, p=self._p, q=self._q, modulus=number).value
+        u, v, q = value.u, value.v, value.q
+        strong = u == 0 or v == 0
 
         for _ in range(upper - 1):
-            seq.double_index()
-            q = seq.value.q
-            if seq.value.v == 0:
-                self._strong = True
+            u, v, q = u * v % number, (v * v - 2 * q) % number, q * q % number
+            if v == 0:
+                strong = True
 
-        seq.double_index()
-        if seq.value.u == 0:
+        u, v = u * v % number, (v * v - 2 * q) % number
+        if u == 0:
             if delta == number + 1:
-                if seq.value.v != 2 * self._q % number:
+                if v != 2 * self._q % number:
                     return Observation.composite()
                 if q != self._q * jacobi(self._q, number) % number:
                     return Observation.composite()
             elif q != jacobi(self._q, number) % number:
                 return Observation.composite()
-            return Observation.probable_prime(strong=self._strong)
+            return Observation.probable_prime(strong=strong)
 
         return Observation.composite()
 
@@ -438,6 +596,32 @@ class LucasWitness(PrimalityWitness):
                 result_count += 1
                 yield LucasWitness(p, q)
 
+    # ------------------------
+
+    @classmethod
+    def selfridge(cls, number: int) -> "LucasWitness | None":
+        """
+        Lucas witness with Selfridge's parameters, namely `p = 1` and
+        `q = (1 - d) // 4` for the first `d` in `5, -7, 9, -11, ...` such that
+        `jacobi(d, number) == -1`.
+
+        + number: int --odd
+        ~> LucasWitness | None --`None` if `number` is a square or a `d` sharing a
+            factor with `number` is found first, in which case `number` is composite
+        """
+
+        if is_square(number):
+            return None
+
+        d = 5
+        while True:
+            symbol = jacobi(d, number)
+            if symbol == -1:
+                return LucasWitness(1, (1 - d) // 4)
+            if symbol == 0 and abs(d) != number:
+                return None
+            d = -d - 2 if d > 0 else 2 - d
+
     # ========================
 
     def _first_observation(self, number: int) -> Observation | None:
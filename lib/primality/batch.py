@@ -0,0 +1,241 @@
+#   lib/primality/batch.py
+#   - module for testing arrays of 64-bit integers for primality at once
+
+# ===========================================================
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from ..basic import primes_up_to
+from ..config import default
+from .algorithms import is_prime, MillerRabinWitness
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        np = None
+
+# ===========================================================
+__all__ = [
+    "is_prime_many",
+]
+# ===========================================================
+#   odd primes removed by trial division before the Miller-Rabin witnesses, which
+#   also settles every number below the square of the next prime
+_TRIAL_PRIMES = tuple(primes_up_to(100)[1:])
+_TRIAL_LIMIT = 101**2
+_LOW = 0xFFFFFFFF
+
+# ===========================================================
+
+
+def is_prime_many(
+    values: Any,
+    processes: int | None = None,
+    chunk_size: int | None = None,
+) -> Any:
+    """
+    Determine which of `values` are prime, for a NumPy array or buffer of integers
+    that fit in 64 bits.
+
+    The numbers are tested at once with the deterministic 64-bit Miller-Rabin witnesses,
+    using Montgomery multiplication on 32-bit limbs so that no product overflows.
+    Batches longer than `chunk_size` are split across a process pool.
+
+    Without NumPy, each value is tested with `is_prime`.
+
+    example: `is_prime_many(np.array([1, 2, 9, 2**61 - 1], dtype=np.uint64))
+        ~> array([False, True, False, True])`
+
+    + values: numpy.ndarray | buffer --integers
+    + processes: int | None --defaults to the number of cpus; 1 tests in this process
+    + chunk_size: int | None --defaults to `batch_chunk_size` config
+    ~> numpy.ndarray | memoryview --booleans, a `memoryview` of bytes without NumPy
+    """
+
+    if np is None:
+        return memoryview(array("B", (is_prime(value) for value in memoryview(values))))
+
+    values = np.asarray(values)
+    if values.dtype.kind not in "iu":
+        raise TypeError(f"expected an array of integers, not {values.dtype}")
+
+    shape = values.shape
+    values = values.ravel()
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = default("batch_chunk_size")
+
+    if processes == 1 or values.size <= chunk_size:
+        return _is_prime_chunk(values).reshape(shape)
+
+    chunks = [
+        values[start : start + chunk_size] for start in range(0, values.size, chunk_size)
+    ]
+    with ProcessPoolExecutor(processes) as executor:
+        results = list(executor.map(_is_prime_chunk, chunks))
+    return np.concatenate(results).reshape(shape)
+
+
+# =============================
+
+
+def _is_prime_chunk(values: "np.ndarray") -> "np.ndarray":
+    """
+    Primality of each of a one-dimensional array of integers.
+
+    + values: numpy.ndarray
+    ~> numpy.ndarray --booleans
+    """
+
+    result = np.zeros(values.size, dtype=bool)
+    numbers = values.astype(np.uint64)
+    candidates = numbers >= 2
+    if values.dtype.kind == "i":
+        candidates &= values >= 0
+
+    result[candidates & (numbers == 2)] = True
+    candidates &= numbers & 1 == 1
+    for prime in _TRIAL_PRIMES:
+        divisible = candidates & (numbers % np.uint64(prime) == 0)
+        result[divisible & (numbers == prime)] = True
+        candidates &= ~divisible
+
+    small = candidates & (numbers < _TRIAL_LIMIT)
+    result[small] = True
+    candidates &= ~small
+
+    indices = np.flatnonzero(candidates)
+    for base in MillerRabinWitness.U64_BASES:
+        if indices.size == 0:
+            break
+        indices = indices[_strong_probable_prime(numbers[indices], base)]
+    result[indices] = True
+    return result
+
+
+# -----------------------------
+
+
+def _strong_probable_prime(numbers: "np.ndarray", base: int) -> "np.ndarray":
+    """
+    Strong probable prime test of each of an array of odd unsigned 64-bit `numbers`
+    to `base`, where a base divisible by the number counts as a pass.
+
+    + numbers: numpy.ndarray --odd, `uint64`
+    + base: int
+    ~> numpy.ndarray --booleans
+    """
+
+    inverse = _negative_inverse(numbers)
+    one = (~numbers + 1) % numbers
+    minus_one = numbers - one
+    residue = np.uint64(base) % numbers
+    power = _mont_mul(residue, _mont_square_of_radix(numbers, one), numbers, inverse)
+
+    exponent = numbers - 1
+    lowest_bit = exponent & (~exponent + 1)
+    valuation = np.log2(lowest_bit.astype(np.float64)).astype(np.uint64)
+    exponent >>= valuation
+
+    value = one.copy()
+    for bit in range(int(exponent.max()).bit_length() - 1, -1, -1):
+        value = _mont_mul(value, value, numbers, inverse)
+        selected = (exponent >> np.uint64(bit)) & 1 == 1
+        value = np.where(selected, _mont_mul(value, power, numbers, inverse), value)
+
+    passed = (residue == 0) | (value == one) | (value == minus_one)
+    for index in range(1, int(valuation.max())):
+        value = _mont_mul(value, value, numbers, inverse)
+        passed |= (value == minus_one) & (valuation > index)
+    return passed
+
+
+# -----------------------------
+
+
+def _negative_inverse(numbers: "np.ndarray") -> "np.ndarray":
+    """
+    Negative of the inverse of each of an array of odd `numbers` modulo `2**64`, by
+    Newton iteration doubling the number of correct bits from 3.
+    """
+
+    inverse = numbers.copy()
+    for _ in range(5):
+        inverse *= 2 - numbers * inverse
+    return ~inverse + 1
+
+
+# -----------------------------
+
+
+def _mont_square_of_radix(numbers: "np.ndarray", radix: "np.ndarray") -> "np.ndarray":
+    """
+    `2**128` modulo each of `numbers`, by doubling `radix = 2**64 % numbers` 64 times.
+    """
+
+    value = radix.copy()
+    for _ in range(64):
+        doubled = value << np.uint64(1)
+        value = np.where(
+            (value >> np.uint64(63) == 1) | (doubled >= numbers),
+            doubled - numbers,
+            doubled,
+        )
+    return value
+
+
+# -----------------------------
+
+
+def _mont_mul(
+    left: "np.ndarray",
+    right: "np.ndarray",
+    numbers: "np.ndarray",
+    inverse: "np.ndarray",
+) -> "np.ndarray":
+    """
+    Montgomery product `left * right / 2**64` modulo each of `numbers`, for `left` and
+    `right` reduced modulo `numbers` and `inverse` from `_negative_inverse`.
+    """
+
+    high, low = _mul_wide(left, right)
+    multiple_high, _ = _mul_wide(low * inverse, numbers)
+    carry = (low != 0).astype(np.uint64)
+    total = high + multiple_high
+    overflow = total < high
+    total += carry
+    overflow |= total < carry
+    return np.where(overflow | (total >= numbers), total - numbers, total)
+
+
+# -----------------------------
+
+
+def _mul_wide(
+    left: "np.ndarray", right: "np.ndarray"
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    High and low 64-bit words of the products of unsigned 64-bit `left` and `right`,
+    from the products of their 32-bit halves.
+    """
+
+    shift = np.uint64(32)
+    left_low, left_high = left & _LOW, left >> shift
+    right_low, right_high = right & _LOW, right >> shift
+    low_low = left_low * right_low
+    low_high = left_low * right_high
+    high_low = left_high * right_low
+    middle = (low_low >> shift) + (low_high & _LOW) + (high_low & _LOW)
+    high = (
+        left_high * right_high
+        + (low_high >> shift)
+        + (high_low >> shift)
+        + (middle >> shift)
+    )
+    return high, left * right
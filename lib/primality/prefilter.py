@@ -0,0 +1,155 @@
+#   lib/primality/prefilter.py
+#   - module for rejecting multiples of small primes before primality testing
+
+# ===========================================================
+from dataclasses import dataclass
+from functools import reduce
+
+from ..basic import gcd, primes_up_to
+from ..config import default
+
+# ===========================================================
+__all__ = [
+    "get_prefilter",
+    "use_prefilter",
+    "PrefilterStats",
+    "TrialDivisionPrefilter",
+]
+# ===========================================================
+_prefilter: "TrialDivisionPrefilter | None" = None
+
+# ===========================================================
+
+
+def use_prefilter(
+    prefilter: "TrialDivisionPrefilter | int | None",
+) -> "TrialDivisionPrefilter | None":
+    """
+    Set the prefilter consulted by `is_prime`, building it if given a bound.
+
+    + prefilter: TrialDivisionPrefilter | int | None
+        --`None` restores a prefilter with the `prefilter_bound` config
+    ~> TrialDivisionPrefilter | None
+    """
+
+    global _prefilter
+    if prefilter is None or isinstance(prefilter, TrialDivisionPrefilter):
+        _prefilter = prefilter
+    else:
+        _prefilter = TrialDivisionPrefilter(prefilter)
+    return _prefilter
+
+
+# -----------------------------
+
+
+def get_prefilter() -> "TrialDivisionPrefilter":
+    """
+    Get the prefilter in use, building one with the `prefilter_bound` config if none
+    has been set.
+    """
+
+    global _prefilter
+    if _prefilter is None:
+        _prefilter = TrialDivisionPrefilter(default("prefilter_bound"))
+    return _prefilter
+
+
+# =============================
+
+
+@dataclass
+class PrefilterStats:
+    """
+    Counts of the outcomes of a prefilter, for tuning its bound.
+
+    + calls: int --numbers seen by the prefilter
+    + primes: int --numbers found to be prime
+    + composites: int --numbers found to be composite
+    + passed: int --numbers left undecided
+    """
+
+    calls: int = 0
+    primes: int = 0
+    composites: int = 0
+    passed: int = 0
+
+    # ------------------------
+
+    @property
+    def rejection_rate(self) -> float:
+        """Proportion of numbers found to be composite."""
+
+        return self.composites / self.calls if self.calls else 0.0
+
+
+# =============================
+
+
+class TrialDivisionPrefilter:
+    """
+    Trial division by every prime up to `bound` with a single gcd against their product.
+
+    Calling the prefilter on an integer `number >= 2` returns
+    - `False` if `number` has a prime factor up to `bound` other than itself,
+    - `True` if `number` is a prime up to `bound` or has no prime factor up to `bound`
+        and is less than `(bound + 1)**2`,
+    - `None` otherwise, when `number` has to be tested further.
+
+    example:
+        ```
+        prefilter = TrialDivisionPrefilter(100)
+        prefilter(97), prefilter(91), prefilter(10403)
+            ~> True, False, None
+        prefilter.stats
+            ~> PrefilterStats(calls=3, primes=1, composites=1, passed=1)
+        ```
+
+    + bound: int
+    """
+
+    def __init__(self, bound: int):
+        if bound < 2:
+            raise ValueError("bound must be at least 2")
+        self.bound = bound
+        self.primes = frozenset(primes_up_to(bound))
+        self.primorial = reduce(lambda acc, prime: acc * prime, sorted(self.primes))
+        self.stats = PrefilterStats()
+
+    # ------------------------
+
+    def __repr__(self) -> str:
+        return f"TrialDivisionPrefilter(bound={self.bound})"
+
+    # ------------------------
+
+    def __call__(self, number: int) -> bool | None:
+        stats = self.stats
+        stats.calls += 1
+        if number <= self.bound:
+            if number in self.primes:
+                stats.primes += 1
+                return True
+            stats.composites += 1
+            return False
+
+        if gcd(number, self.primorial) > 1:
+            stats.composites += 1
+            return False
+        if number <= self.bound * (self.bound + 2):
+            stats.primes += 1
+            return True
+        stats.passed += 1
+        return None
+
+    # ------------------------
+
+    def reset_stats(self) -> PrefilterStats:
+        """
+        Reset the statistics, returning those gathered so far.
+
+        ~> PrefilterStats
+        """
+
+        stats, self.stats = self.stats, PrefilterStats()
+        return stats
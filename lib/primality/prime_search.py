@@ -4,9 +4,10 @@
 # ===========================================================
 from functools import reduce
 
-from ..basic import prime_to
+from ..basic import integer_sqrt, iter_primes_in_range, prime_to
 from ..config import default
 from .algorithms import is_prime
+from .prime_table import get_prime_table
 
 # ===========================================================
 __all__ = [
@@ -88,11 +89,23 @@ def primes_in_range(lower: int, upper: int) -> list[int]:
     """
     Get list of primes in `range(lower, upper)`.
 
+    If a prime table is in use and covers the range, the primes are read from it.
+    Otherwise, ranges at least as wide as the square root of `upper` are sieved, while
+    narrower ranges are searched with `PrimeSearch`. For very wide ranges, see
+    `sieve_primes_in_range`, which sieves across a process pool.
+
     + lower: int
     + upper: int
     ~> list[int]
     """
 
+    table = get_prime_table()
+    if table is not None and upper <= table.limit + 1:
+        return list(table.iter_primes_in_range(lower, upper))
+
+    if upper - lower >= integer_sqrt(max(upper, 0)):
+        return list(iter_primes_in_range(lower, upper))
+
     prime_search = PrimeSearch(lower - 1)
     primes = []
     while prime_search.next().value < upper:
@@ -124,6 +137,9 @@ class PrimeSearch:
             ~> 47
         ```
 
+    Candidates are tested with `is_prime`, so they are looked up in the prime table
+    when one is in use.
+
     + number: int
     + sieve_primes: list[int] | None --reduces the number of potential primes in a window
     """
@@ -0,0 +1,204 @@
+#   lib/primality/prime_table.py
+#   - module for a persistent, memory-mapped table of primes
+
+# ===========================================================
+import mmap
+import os
+import struct
+from typing import Iterator
+
+from ..basic import integer_sqrt, primes_up_to
+from ..basic.primality import _sieve_segment
+from ..config import default
+
+# ===========================================================
+__all__ = [
+    "get_prime_table",
+    "use_prime_table",
+    "PrimeTable",
+]
+# ===========================================================
+#   each byte of a table covers 30 consecutive integers, one bit for each residue
+#   modulo 30 that is relatively prime to 30
+_RESIDUES = (1, 7, 11, 13, 17, 19, 23, 29)
+_BITS = {residue: bit for bit, residue in enumerate(_RESIDUES)}
+_BYTE_RESIDUES = tuple(
+    tuple(residue for bit, residue in enumerate(_RESIDUES) if byte >> bit & 1)
+    for byte in range(256)
+)
+_HEADER = struct.Struct("<8sQ")
+_MAGIC = b"EBEPRIME"
+
+_prime_table: "PrimeTable | None" = None
+
+# ===========================================================
+
+
+def use_prime_table(
+    table: "PrimeTable | str | os.PathLike | None",
+) -> "PrimeTable | None":
+    """
+    Set the prime table consulted by `is_prime`, `primes_in_range`, `PrimeSearch` and
+    `Factorization`, loading it from a file if given a path.
+
+    Each process using a table has to call this; for a process pool, pass it as the
+    pool initializer with the path, so that every worker maps the same file.
+
+    + table: PrimeTable | str | os.PathLike | None --`None` disables the table
+    ~> PrimeTable | None
+    """
+
+    global _prime_table
+    if table is None or isinstance(table, PrimeTable):
+        _prime_table = table
+    else:
+        _prime_table = PrimeTable.load(table)
+    return _prime_table
+
+
+# -----------------------------
+
+
+def get_prime_table() -> "PrimeTable | None":
+    """Get the prime table in use, if any."""
+
+    return _prime_table
+
+
+# =============================
+
+
+class PrimeTable:
+    """
+    Bitmap of the primes up to `limit` over a 2*3*5 wheel, so that one byte covers
+    30 consecutive integers.
+
+    A table is built once, saved to a file and memory-mapped by `PrimeTable.load`, so
+    that lookups are O(1) and iteration reads the mapped pages without copying them.
+
+    example:
+        ```
+        table = PrimeTable.build(100)
+        97 in table
+            ~> True
+        list(table.iter_primes_in_range(80, 100))
+            ~> [83, 89, 97]
+        ```
+
+    + limit: int --largest number covered by the table
+    + data: bytes | memoryview
+    """
+
+    def __init__(self, limit: int, data: bytes | memoryview):
+        self.limit = limit
+        self._data = data
+
+    # ------------------------
+
+    @classmethod
+    def build(cls, limit: int, segment_size: int | None = None) -> "PrimeTable":
+        """
+        Build a table of primes up to `limit` with a segmented sieve.
+
+        + limit: int
+        + segment_size: int | None --number of bytes sieved at a time
+        ~> PrimeTable
+        """
+
+        if limit < 0:
+            raise ValueError("limit must be nonnegative")
+        if segment_size is None:
+            segment_size = default("sieve_segment_size") // 15
+
+        size = limit // 30 + 1
+        base_primes = [
+            prime for prime in primes_up_to(integer_sqrt(30 * size)) if prime > 7
+        ]
+        data = bytearray()
+        for start in range(0, size, segment_size):
+            count = min(segment_size, size - start)
+            flags = _sieve_segment(30 * start + 1, 30 * (start + count) + 1, base_primes)
+            packed = 0
+            for bit, residue in enumerate(_RESIDUES):
+                packed |= int.from_bytes(flags[(residue - 1) // 2 :: 15], "little") << bit
+            data += packed.to_bytes(count, "little")
+
+        return cls(limit, bytes(data))
+
+    # ------------------------
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "PrimeTable":
+        """
+        Memory-map a table saved with `PrimeTable.save`.
+
+        + path: str | os.PathLike
+        ~> PrimeTable
+        """
+
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, limit = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a prime table")
+        return cls(limit, memoryview(buffer)[_HEADER.size :])
+
+    # ------------------------
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Save the table to a file.
+
+        + path: str | os.PathLike
+        """
+
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, self.limit))
+            file.write(self._data)
+
+    # ========================
+
+    def __repr__(self) -> str:
+        return f"PrimeTable(limit={self.limit})"
+
+    # ------------------------
+
+    def __contains__(self, number: int) -> bool:
+        """Determine whether `number` is prime, for `0 <= number <= self.limit`."""
+
+        if not 0 <= number <= self.limit:
+            raise ValueError(f"{number} is outside of the table")
+
+        bit = _BITS.get(number % 30)
+        if bit is None:
+            return number in (2, 3, 5)
+        return bool(self._data[number // 30] >> bit & 1)
+
+    # ------------------------
+
+    def iter_primes_in_range(self, lower: int, upper: int | None = None) -> Iterator[int]:
+        """
+        Iterator of primes in `range(lower, upper)`, up to the limit of the table.
+
+        + lower: int
+        + upper: int | None --defaults to just past the limit of the table
+        ~> Iterator[int]
+        """
+
+        if upper is None:
+            upper = self.limit + 1
+        if upper > self.limit + 1:
+            raise ValueError(f"{upper - 1} is outside of the table")
+
+        for prime in (2, 3, 5):
+            if lower <= prime < upper:
+                yield prime
+
+        start = max(lower, 0) // 30
+        stop = (upper + 29) // 30
+        for index, byte in enumerate(self._data[start:stop], start):
+            for residue in _BYTE_RESIDUES[byte]:
+                number = 30 * index + residue
+                if lower <= number < upper:
+                    yield number
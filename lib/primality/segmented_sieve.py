@@ -0,0 +1,198 @@
+#   lib/primality/segmented_sieve.py
+#   - module for sieving wide intervals for primes across processes
+
+# ===========================================================
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterator, TypeVar
+
+from ..basic import integer_sqrt, primes_up_to
+from ..basic.primality import _segment_primes, _sieve_segment
+from ..config import default
+
+# ===========================================================
+__all__ = [
+    "count_primes_in_range",
+    "sieve_primes_in_range",
+]
+# ===========================================================
+T = TypeVar("T")
+
+_base_primes: list[int] = []
+
+# ===========================================================
+
+
+def sieve_primes_in_range(
+    lower: int,
+    upper: int,
+    processes: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[int]:
+    """
+    Iterator of primes in `range(lower, upper)`, in order, using a segmented sieve whose
+    chunks are sieved across a process pool.
+
+    Only a bounded number of chunks are in flight at a time, so the primes of the whole
+    interval are never held in memory.
+
+    example: `list(sieve_primes_in_range(10**12, 10**12 + 100))
+        ~> [1000000000039, 1000000000061, 1000000000063, 1000000000091]`
+
+    + lower: int
+    + upper: int
+    + processes: int | None --defaults to the number of cpus; 1 sieves in this process
+    + chunk_size: int | None --width of the interval sieved by each task
+    ~> Iterator[int]
+    """
+
+    for primes in _map_chunks(_sieve_chunk, lower, upper, processes, chunk_size):
+        yield from primes
+
+
+# -----------------------------
+
+
+def count_primes_in_range(
+    lower: int,
+    upper: int,
+    processes: int | None = None,
+    chunk_size: int | None = None,
+) -> int:
+    """
+    Count the primes in `range(lower, upper)` using a segmented sieve whose chunks are
+    sieved across a process pool.
+
+    example: `count_primes_in_range(10**12, 10**12 + 10**6) ~> 36249`
+
+    + lower: int
+    + upper: int
+    + processes: int | None --defaults to the number of cpus; 1 sieves in this process
+    + chunk_size: int | None --width of the interval sieved by each task
+    ~> int
+    """
+
+    return sum(_map_chunks(_count_chunk, lower, upper, processes, chunk_size))
+
+
+# =============================
+
+
+def _map_chunks(
+    func: Callable[[tuple[int, int], list[int] | None], T],
+    lower: int,
+    upper: int,
+    processes: int | None,
+    chunk_size: int | None,
+) -> Iterator[T]:
+    """
+    Apply `func` to consecutive chunks of `range(lower, upper)`, yielding the results in
+    order while keeping at most two chunks per process in flight.
+
+    + func: Callable[[tuple[int, int], list[int] | None], T]
+        --picklable, takes chunk bounds and base primes
+    + lower: int
+    + upper: int
+    + processes: int | None
+    + chunk_size: int | None
+    ~> Iterator[T]
+    """
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = default("sieve_chunk_size")
+
+    chunks = (
+        (low, min(low + chunk_size, upper)) for low in range(lower, upper, chunk_size)
+    )
+    base_primes = _get_base_primes(upper)
+
+    if processes == 1 or upper - lower <= chunk_size:
+        yield from (func(bounds, base_primes) for bounds in chunks)
+        return
+
+    executor = ProcessPoolExecutor(
+        processes,
+        initializer=_set_base_primes,
+        initargs=(base_primes,),
+    )
+    try:
+        pending: deque[Future[T]] = deque(
+            executor.submit(func, bounds, None)
+            for _, bounds in zip(range(2 * processes), chunks)
+        )
+        while pending:
+            result = pending.popleft().result()
+            for bounds in chunks:
+                pending.append(executor.submit(func, bounds, None))
+                break
+            yield result
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+# -----------------------------
+
+
+def _get_base_primes(upper: int) -> list[int]:
+    """Primes greater than 7 needed to sieve up to `upper`."""
+
+    return [prime for prime in primes_up_to(integer_sqrt(max(upper - 1, 0))) if prime > 7]
+
+
+# -----------------------------
+
+
+def _set_base_primes(base_primes: list[int]) -> None:
+    """Initialize the base primes of a worker process."""
+
+    global _base_primes
+    _base_primes = base_primes
+
+
+# -----------------------------
+
+
+def _sieve_chunk(
+    bounds: tuple[int, int], base_primes: list[int] | None = None
+) -> list[int]:
+    """
+    Primes in a chunk.
+
+    + bounds: tuple[int, int] --`(lower, upper)`
+    + base_primes: list[int] | None --defaults to those of the worker process
+    ~> list[int]
+    """
+
+    lower, upper = bounds
+    if base_primes is None:
+        base_primes = _base_primes
+    primes = [2] if lower <= 2 < upper else []
+    low = max(lower, 3) | 1
+    if low < upper:
+        primes.extend(_segment_primes(low, _sieve_segment(low, upper, base_primes)))
+    return primes
+
+
+# -----------------------------
+
+
+def _count_chunk(bounds: tuple[int, int], base_primes: list[int] | None = None) -> int:
+    """
+    Number of primes in a chunk.
+
+    + bounds: tuple[int, int] --`(lower, upper)`
+    + base_primes: list[int] | None --defaults to those of the worker process
+    ~> int
+    """
+
+    lower, upper = bounds
+    if base_primes is None:
+        base_primes = _base_primes
+    count = 1 if lower <= 2 < upper else 0
+    low = max(lower, 3) | 1
+    if low < upper:
+        count += _sieve_segment(low, upper, base_primes).count(1)
+    return count
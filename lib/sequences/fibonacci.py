@@ -2,7 +2,7 @@
 #   - module for fibonacci sequences w/ optional modulus
 
 # ===========================================================
-from .lucas import LucasSequence
+from typing import Sequence
 
 # ===========================================================
 __all__ = [
@@ -58,18 +58,62 @@ class FibonacciSequence:
         example:
             `FibonacciSequence.at_index(10).value ~> 55`
 
-        + index: int
+        + index: int --nonnegative
         + modulus: int | None
         ~> FibonacciSequence --at given index
         """
 
-        lucas_seq = LucasSequence.at_index(index, p=1, q=-1, modulus=modulus)
+        if index < 0:
+            raise ValueError("index must be nonnegative")
+        value, next_value = _fast_doubling(index, modulus)
         seq = cls(modulus=modulus)
         seq._idx = index
-        seq._prev = lucas_seq._prev.u
-        seq._value = lucas_seq._value.u
+        seq._prev = seq._reduce(next_value - value)
+        seq._value = value
         return seq
 
+    # ------------------------
+
+    @classmethod
+    def at_indices(cls, indices: Sequence[int], modulus: int | None = None) -> list[int]:
+        """
+        Values of the Fibonacci sequence at each of a batch of indices.
+
+        The indices are visited in sorted order, so that the doubling steps along the
+        common leading bits of consecutive indices are shared.
+
+        example:
+            `FibonacciSequence.at_indices([10, 3, 11], modulus=7) ~> [6, 2, 5]`
+
+        + indices: Sequence[int] --nonnegative
+        + modulus: int | None
+        ~> list[int] --values in the order of `indices`
+        """
+
+        values = [0] * len(indices)
+        #   ladder[depth] holds `(F[k], F[k+1])` for the leading `depth` bits `k` of the
+        #   previous index
+        ladder = [(0, 1)]
+        previous = 0
+        for position in sorted(range(len(indices)), key=indices.__getitem__):
+            index = indices[position]
+            if index < 0:
+                raise ValueError("indices must be nonnegative")
+
+            depth = 0
+            if index.bit_length() == previous.bit_length():
+                depth = index.bit_length() - (index ^ previous).bit_length()
+            del ladder[depth + 1 :]
+
+            value, next_value = ladder[depth]
+            for bit in bin(index)[2 + depth :]:
+                value, next_value = _double(value, next_value, bit, modulus)
+                ladder.append((value, next_value))
+            values[position] = value
+            previous = index
+
+        return values
+
     # ========================
 
     def __repr__(self) -> str:
@@ -115,3 +159,42 @@ class FibonacciSequence:
         if self._modulus is not None:
             return value % self._modulus
         return value
+
+
+# =============================
+
+
+def _fast_doubling(index: int, modulus: int | None) -> tuple[int, int]:
+    """
+    Fibonacci numbers `F[index]` and `F[index+1]` by fast doubling on the bits of
+    `index` from left to right.
+
+    + index: int
+    + modulus: int | None
+    ~> tuple[int, int]
+    """
+
+    value, next_value = 0, 1
+    for bit in bin(index)[2:]:
+        value, next_value = _double(value, next_value, bit, modulus)
+    return value, next_value
+
+
+# -----------------------------
+
+
+def _double(
+    value: int, next_value: int, bit: str, modulus: int | None
+) -> tuple[int, int]:
+    """
+    From `F[k]` and `F[k+1]`, compute `F[2k+bit]` and `F[2k+bit+1]` with the
+    identities `F[2k] = F[k] * (2*F[k+1] - F[k])` and `F[2k+1] = F[k]**2 + F[k+1]**2`.
+    """
+
+    even = value * (2 * next_value - value)
+    odd = value * value + next_value * next_value
+    if bit == "1":
+        even, odd = odd, even + odd
+    if modulus is not None:
+        return even % modulus, odd % modulus
+    return even, odd
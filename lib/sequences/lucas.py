@@ -104,19 +104,50 @@ class LucasSequence:
             `LucasSequence.at_index(10, p=1, q=-1).value
                 ~> LucasValue(index=10, u=55, v=123, q=1)`
 
-        + index: int
+        + index: int --nonnegative
         + p: int
         + q: int
         + modulus: int | None
         ~> LucasSequence --at given index
         """
 
+        if index < 0:
+            raise ValueError("index must be nonnegative")
         seq = cls(p=p, q=q, modulus=modulus)
         if index == 0:
             return seq
-        if index % 2 == 1:
-            return next(cls.at_index(index - 1, p=p, q=q, modulus=modulus))
-        return cls.at_index(index // 2, p=p, q=q, modulus=modulus).double_index()
+
+        #   left-to-right binary ladder on the values at stages `k` and `k - 1`
+        u, v, q_k = 1, seq._reduce(p), seq._reduce(q)
+        prev_u, prev_v, prev_q_k = 0, 2, 1
+        for bit in bin(index)[3:]:
+            prev_u, prev_v, prev_q_k = (
+                u * prev_v - prev_q_k,
+                v * prev_v - p * prev_q_k,
+                q * prev_q_k**2,
+            )
+            u, v, q_k = u * v, v**2 - 2 * q_k, q_k**2
+            if bit == "1":
+                prev_u, prev_v, prev_q_k, u, v, q_k = (
+                    u,
+                    v,
+                    q_k,
+                    p * u - q * prev_u,
+                    p * v - q * prev_v,
+                    q * q_k,
+                )
+            if modulus is not None:
+                u, v, q_k = u % modulus, v % modulus, q_k % modulus
+                prev_u, prev_v, prev_q_k = (
+                    prev_u % modulus,
+                    prev_v % modulus,
+                    prev_q_k % modulus,
+                )
+
+        seq._value = LucasValue(index=index, u=u, v=v, q=q_k)
+        if index > 1:
+            seq._prev = LucasValue(index=index - 1, u=prev_u, v=prev_v, q=prev_q_k)
+        return seq
 
     # ========================
 
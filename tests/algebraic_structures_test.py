@@ -3,7 +3,7 @@
 import env  # noqa
 from hypothesis import given, strategies as st
 
-from lib.basic import gcd, jacobi, mod_power
+from lib.basic import gcd, jacobi, mod_power, ModularContext
 from lib.primality import is_prime
 from lib.algebraic_structures import ModularRing
 
@@ -97,3 +97,27 @@ def test_modular_ring(modulus, a, b, c):
                 for y in Zm.sqrt_of(x):
                     assert Zm.power_of(y, 2) == x
                     assert Zm.log_of(x) == (Zm.log_of(y) * 2) % (Zm.euler())
+
+
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=2, max_value=10**3),
+    st.integers(),
+    st.integers(),
+    st.integers(min_value=0, max_value=10**3),
+)
+def test_modular_ring_with_context(modulus, a, b, exponent):
+    Zm = ModularRing(modulus, context=ModularContext(modulus, method="barrett"))
+    assert Zm.mult(a, b) == a * b % modulus
+    assert Zm.power_of(a, exponent) == mod_power(a, exponent, modulus)
+
+
+# -----------------------------
+
+
+def test_modular_ring_of_one():
+    Z1 = ModularRing(1)
+    assert Z1.context is None
+    assert Z1.mult(3, 5) == 0
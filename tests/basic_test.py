@@ -1,9 +1,13 @@
 #   tests/basic_test.py
 # ===========================================================
+import itertools as it
+
+import pytest
 from hypothesis import assume, given, strategies as st
 from random import sample
 
 import env  # noqa
+from lib.config import DEFAULTS
 from lib.factorization import Factorization
 from lib.basic import (
     bezout,
@@ -16,7 +20,11 @@ from lib.basic import (
     mod_inverse,
     mod_power,
     prime_to,
+    reduction_context,
+    ModularContext,
+    iter_primes_in_range,
     iter_primes_up_to,
+    prime_gen,
     primes_up_to,
     shape_number_by_index,
     which_shape_number,
@@ -25,6 +33,7 @@ from lib.basic import (
 )
 from lib.basic.division import div_with_small_remainder
 from lib.basic.modular import euler_criterion
+from lib.basic import primality
 from lib.basic.primality import is_prime__naive
 
 # ===========================================================
@@ -179,6 +188,47 @@ def test_prime_to(number):
         assert gcd(x, number) == 1
 
 
+# -----------------------------
+
+
+@pytest.mark.parametrize("method", ["native", "barrett"])
+@given(
+    modulus=st.integers(min_value=2),
+    left=st.integers(),
+    right=st.integers(),
+    exponent=st.integers(min_value=0, max_value=10**4),
+)
+def test_modular_context(method, modulus, left, right, exponent):
+    context = ModularContext(modulus, method=method)
+    assert context.reduce(left) == left % modulus
+    assert context.mulmod(left % modulus, right % modulus) == left * right % modulus
+    assert context.sqrmod(left % modulus) == left**2 % modulus
+    assert context.powmod(left, exponent) == pow(left, exponent, modulus)
+
+
+# -----------------------------
+
+
+def test_modular_context_errors():
+    with pytest.raises(ValueError):
+        ModularContext(1)
+    with pytest.raises(ValueError):
+        ModularContext(13, method="montgomery")
+    assert ModularContext(13, method="barrett").powmod(7, -5) == 6
+
+
+# -----------------------------
+
+
+def test_reduction_context(monkeypatch):
+    barrett = ModularContext(13, method="barrett")
+    assert reduction_context(13) is None
+    assert reduction_context(13, ModularContext(13, method="native")) is None
+    assert reduction_context(13, barrett) is barrett
+    monkeypatch.setitem(DEFAULTS, "modular_reduction", "barrett")
+    assert reduction_context(13).method == "barrett"
+
+
 # ===========================================================
 #   primality
 # ===========================================================
@@ -189,8 +239,48 @@ def test_primes_up_to():
     prime_counts = [0, 4, 25, 168, 1229, 9592]
     for i, prime_list in enumerate(prime_lists):
         assert len(prime_list) == prime_counts[i]
-        if i < 5:
-            assert prime_list == list(iter_primes_up_to(10**i))
+        assert prime_list == list(iter_primes_up_to(10**i))
+
+
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=-10, max_value=10**4),
+    st.integers(min_value=0, max_value=10**3),
+    st.integers(min_value=1, max_value=100),
+)
+def test_iter_primes_in_range(lower, difference, segment_size):
+    upper = lower + difference
+    primes = list(iter_primes_in_range(lower, upper, segment_size))
+    assert primes == [p for p in range(lower, upper) if is_prime__naive(p)]
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize("max_value", [0, 2, 3, 1000, 10**6 + 3])
+def test_primes_up_to_as_array(max_value, monkeypatch):
+    primes = primes_up_to(max_value)
+    if primality.np is not None:
+        array = primes_up_to(max_value, as_array=True)
+        assert array.dtype == primality.np.uint32
+        assert array.tolist() == primes
+
+    monkeypatch.setattr(primality, "np", None)
+    view = primes_up_to(max_value, as_array=True)
+    assert isinstance(view, memoryview)
+    assert view.tolist() == primes
+    assert list(iter_primes_up_to(max_value)) == primes
+
+
+# -----------------------------
+
+
+def test_prime_gen():
+    primes = primes_up_to(10**5)
+    assert list(it.islice(prime_gen(), len(primes))) == primes
+    assert list(it.islice(iter_primes_in_range(0, None, 10), len(primes))) == primes
 
 
 # -----------------------------
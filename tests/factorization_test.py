@@ -1,23 +1,41 @@
 #   tests/factorization_test.py
 # ===========================================================
+import pickle
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from collections import Counter
 from functools import reduce
 
 import pytest
-from hypothesis import given, strategies as st
+from hypothesis import assume, given, strategies as st
 
 import env  # noqa
-from lib.basic import gcd, is_square, padic
+from lib.basic import gcd, is_square, padic, primes_up_to, ModularContext
+from lib.config import DEFAULTS
 from lib.primality import is_prime, next_prime
 from lib.types import GaussianInteger, QuaternionInteger
 from lib.utils import combine_counters
 from lib.factorization import (
+    quadratic_sieve,
     Algorithm,
     DivisorSearch,
     Factorization,
     find_divisors,
     get_gaussian_divisor,
     get_quaternion_divisor,
+    multiplicative_functions_in_range,
+    multiplicative_functions_up_to,
+    SmallestPrimeFactorTable,
+    TrialDivision,
+)
+from lib.factorization.divisor_search import _default_algorithms
+from lib.factorization.factorization import _trial_division
+from lib.factorization import multiplicative_sieve, spf_table as spf_table_module
+from lib.factorization import trial_division as trial_division_module
+from lib.factorization.factor_store import (
+    get_factor_store,
+    use_factor_store,
+    FactorStore,
 )
 
 # ===========================================================
@@ -53,6 +71,31 @@ def test_pollard_rho(number):
 # -----------------------------
 
 
+@given(
+    st.integers(min_value=2, max_value=10**12), st.integers(min_value=1, max_value=200)
+)
+def test_pollard_rho_brent(number, batch_size):
+    strategy = Algorithm.build("rho-brent", seed=2, batch_size=batch_size)
+    if not is_prime(number):
+        divisor = strategy.find_divisor(number)
+        assert divisor > 1 and number % divisor == 0
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize("algorithm", ["rho", "rho-brent", "p-1"])
+@given(st.integers(min_value=2, max_value=10**12))
+def test_find_divisor_with_context(algorithm, number):
+    strategy = Algorithm.build(algorithm)
+    if not is_prime(number):
+        context = ModularContext(number, method="barrett")
+        assert strategy.find_divisor(number, context) == strategy.find_divisor(number)
+
+
+# -----------------------------
+
+
 @given(st.integers(min_value=2, max_value=10**10))
 def test_pollard_p_minus_one(number):
     strategy = Algorithm.build("p-1", seed=2)
@@ -64,14 +107,257 @@ def test_pollard_p_minus_one(number):
 # -----------------------------
 
 
-@given(st.integers(min_value=2, max_value=10**8))
+@pytest.mark.parametrize(
+    "prime, stage",
+    [
+        #   prime - 1 == 2 * 3**5 * 5**4 * 7 * 11 * 13 * 97 * 1009
+        (29758652673751, 1),
+        #   prime - 1 == 2 * 3 * 5 * 7 * 11 * 13 * 17 * 19 * 23 * 20029
+        (4468327093231, 2),
+    ],
+)
+def test_pollard_p_minus_one_stages(prime, stage):
+    number = prime * next_prime(10**22)
+    strategy = Algorithm.build("p-1", b1=10**4, b2=10**5, batch_size=7)
+    assert strategy.find_divisor(number) == prime
+    assert strategy.stage == stage
+
+    strategy = Algorithm.build("p-1", b1=10**4, b2=2 * 10**4)
+    assert strategy.find_divisor(number) == (number if stage == 2 else prime)
+
+
+# -----------------------------
+
+
+def test_pollard_p_minus_one_retraces_batch():
+    #   both prime factors are found by the first batch of stage 1
+    number = 29758652673751 * 1201201
+    strategy = Algorithm.build("p-1", b1=10**4, b2=10**5, batch_size=2000)
+    assert strategy.find_divisor(number) == 1201201
+    assert strategy.stage == 1
+
+
+# -----------------------------
+
+
+@given(st.integers(min_value=2, max_value=10**10))
 def test_williams_p_plus_one(number):
+    strategy = Algorithm.build("p+1", seeds=[3, 4, 6])
+    if not is_prime(number):
+        divisor = strategy.find_divisor(number)
+        assert divisor > 1 and number % divisor == 0
+
+
+# -----------------------------
+
+
+@given(st.integers(min_value=2, max_value=10**8))
+def test_williams_p_plus_one_gaussian_seed(number):
     strategy = Algorithm.build("p+1", seed=GaussianInteger(1, 2))
     if not is_prime(number):
         divisor = strategy.find_divisor(number)
         assert divisor > 1 and number % divisor == 0
 
 
+# -----------------------------
+
+
+def test_williams_p_plus_one_seeds():
+    assert Algorithm.build("p+1", seed=GaussianInteger(1, 2)).find_divisor(221) == 17
+    assert Algorithm.build("p+1", seed=3).find_divisor(143) == 11
+    with pytest.raises(ValueError):
+        Algorithm.build("p+1", seed=3, seeds=[4])
+
+    strategy = Algorithm.build("p+1", seeds=[3], delay=5)
+    generator = strategy.generator(143)
+    assert [next(generator) for _ in range(5)] == [1] * 5
+    assert strategy.find_divisor(143) == 11
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize(
+    "prime, stage",
+    [
+        #   prime + 1 == 2 * 3**3 * 7**3 * 11 * 13 * 97 * 1009, while prime - 1 is not smooth
+        (259230929957, 1),
+        #   prime + 1 == 2 * 3 * 5 * 7 * 11 * 13 * 17 * 19 * 23 * 20023
+        (4466988536009, 2),
+    ],
+)
+def test_williams_p_plus_one_stages(prime, stage):
+    number = prime * next_prime(10**22)
+    strategy = Algorithm.build("p+1", b1=10**4, b2=10**5, batch_size=7)
+    assert strategy.find_divisor(number) == prime
+    assert strategy.stage == stage
+
+    strategy = Algorithm.build("p-1", b1=10**4, b2=10**5)
+    assert strategy.find_divisor(number) == number
+
+
+# -----------------------------
+
+
+@given(composite(2, 10**3, 10**6))
+def test_elliptic_curve_method(number):
+    #   a multiple of a point vanishing modulo `p` has a z coordinate divisible by
+    #   `p**2`, so squares of primes are left to the divisor search
+    assume(not is_square(number))
+    strategy = Algorithm.build("ecm", b1=200, curves=50)
+    divisor = strategy.find_divisor(number)
+    assert 1 < divisor < number and number % divisor == 0
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize(
+    "prime, stage",
+    [
+        (100000015859, 1),
+        (100000000003, 2),
+    ],
+)
+def test_elliptic_curve_method_stages(prime, stage):
+    number = prime * next_prime(10**22)
+    strategy = Algorithm.build("ecm", b1=1000, b2=10**5, curves=3)
+    assert strategy.find_divisor(number) == prime
+    assert strategy.stage == stage
+
+    strategy = Algorithm.build("ecm", b1=1000, b2=10**5, curves=1, seed=7)
+    assert strategy.find_divisor(number) == number
+    assert strategy.stage is None
+
+
+# -----------------------------
+
+
+def test_elliptic_curve_method_in_process_pool():
+    number = 2**67 - 1
+    inline = Algorithm.build("ecm", b1=2000, curves=20, batch_size=100)
+    pooled = Algorithm.build("ecm", b1=2000, curves=20, processes=2)
+    assert pooled.find_divisor(number) == inline.find_divisor(number) == 193707721
+    assert pooled.stage == inline.stage
+
+
+# -----------------------------
+
+
+def test_elliptic_curve_method_delay():
+    generator = Algorithm.build("ecm", b1=200, curves=5, delay=3).generator(91)
+    assert [next(generator) for _ in range(3)] == [1, 1, 1]
+    assert 91 % next(divisor for divisor in generator if divisor > 1) == 0
+
+
+# -----------------------------
+
+
+@given(composite(2, 10**3, 2**31))
+def test_shanks_square_forms(number):
+    divisor = Algorithm.build("squfof").find_divisor(number)
+    assert 1 < divisor < number and number % divisor == 0
+
+
+# -----------------------------
+
+
+@given(composite(2, 10**3, 2**16))
+def test_hart_one_line(number):
+    #   Hart's method is heuristic, and a few factorizations need more than the default
+    #   cube root of `number` steps
+    divisor = Algorithm.build("hart", bound=1 << 16).find_divisor(number)
+    assert 1 < divisor < number and number % divisor == 0
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize(
+    "algorithm, kwargs",
+    [
+        ("squfof", dict(multipliers=[1, 3], batch_size=10)),
+        ("hart", dict(bound=100, batch_size=10)),
+    ],
+)
+def test_small_composite_algorithms_give_up(algorithm, kwargs):
+    number = next_prime(2**61)
+    assert Algorithm.build(algorithm, **kwargs).find_divisor(number) == number
+
+
+# -----------------------------
+
+
+def test_factor_when_algorithms_give_up():
+    number = 1000003 * 1000033
+    algorithms = [Algorithm.build("hart", bound=1)]
+    with pytest.raises(ValueError):
+        Factorization(number, algorithms=algorithms).factorization
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize(
+    "factors",
+    [
+        (next_prime(10**9), next_prime(3 * 10**10)),
+        (next_prime(10**14), next_prime(10**15)),
+        (next_prime(10**6), next_prime(10**8), next_prime(10**12)),
+    ],
+)
+def test_quadratic_sieve(factors):
+    number = reduce(lambda x, y: x * y, factors)
+    divisor = Algorithm.build("siqs").find_divisor(number)
+    assert 1 < divisor < number and number % divisor == 0
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize(
+    "number",
+    [
+        2 * next_prime(10**20),
+        next_prime(10**10) ** 2,
+        next_prime(10**5) * next_prime(10**6),
+    ],
+)
+def test_quadratic_sieve_leaves_numbers(number):
+    assert Algorithm.build("siqs").find_divisor(number) == number
+
+
+# -----------------------------
+
+
+def test_quadratic_sieve_without_numpy(monkeypatch):
+    monkeypatch.setattr(quadratic_sieve, "np", None)
+    number = next_prime(10**10) * next_prime(10**11)
+    assert Algorithm.build("siqs").find_divisor(number) in (
+        next_prime(10**10),
+        next_prime(10**11),
+    )
+
+
+# -----------------------------
+
+
+def test_quadratic_sieve_in_process_pool():
+    number = next_prime(10**12) * next_prime(10**13)
+    divisor = Algorithm.build("siqs", processes=2).find_divisor(number)
+    assert divisor in (next_prime(10**12), next_prime(10**13))
+
+
+# -----------------------------
+
+
+def test_quadratic_sieve_runs_out_of_families():
+    factors = next_prime(10**14), next_prime(3 * 10**15)
+    number = factors[0] * factors[1]
+    divisor = Algorithm.build("siqs", factor_base_size=20).find_divisor(number)
+    assert divisor in (*factors, number)
+
+
 # ===========================================================
 #   divisor_search
 # ===========================================================
@@ -100,6 +386,8 @@ def test_divisor_search(number):
         Algorithm.build("p-1", seed=3),
         Algorithm.build("p+1", seed=GaussianInteger(1, 2)),
         Algorithm.build("p+1", seed=GaussianInteger(1, 3)),
+        Algorithm.build("p+1", seeds=[4, 6]),
+        Algorithm.build("ecm", b1=100, curves=10),
     ]
     divisor_search = DivisorSearch(number, algorithms).search()
     for divisor in divisor_search.divisors:
@@ -109,6 +397,69 @@ def test_divisor_search(number):
     assert any(1 < divisor < number for divisor in divisor_search.divisors)
 
 
+# -----------------------------
+
+
+def test_divisor_search_gives_up():
+    algorithms = [Algorithm.build("hart", bound=10), Algorithm.build("p-1", b1=10, b2=10)]
+    divisor_search = DivisorSearch(101, algorithms).search()
+    assert divisor_search.divisors == [101, 101]
+    assert find_divisors(101, algorithms) == set()
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize(
+    "number",
+    [next_prime(10**5) * next_prime(10**7), next_prime(10**8) * next_prime(10**9)],
+)
+def test_divisor_search_in_processes(number):
+    divisor_search = DivisorSearch(number, _default_algorithms(), processes=2).search()
+    for divisor in divisor_search.divisors:
+        assert 1 <= divisor <= number
+        assert number % divisor == 0
+    assert any(1 < divisor < number for divisor in divisor_search.divisors)
+
+    #   the first algorithm to finish may find the cofactor of a divisor found serially
+    divisors = find_divisors(number, processes=2)
+    serial = find_divisors(number, processes=1)
+    assert divisors
+    assert {divisor for d in divisors for divisor in (d, number // d)} == {
+        divisor for d in serial for divisor in (d, number // d)
+    }
+
+
+# -----------------------------
+
+
+def test_divisor_search_in_processes_with_pooled_algorithms():
+    number = 2**67 - 1
+    algorithms = [
+        Algorithm.build("ecm", b1=2000, curves=20, processes=2),
+        Algorithm.build("siqs", processes=2),
+    ]
+    divisors = find_divisors(number, algorithms, processes=2)
+    assert divisors and divisors <= {193707721, 761838257287}
+
+
+# -----------------------------
+
+
+def test_divisor_search_in_processes_gives_up():
+    algorithms = [Algorithm.build("hart", bound=10), Algorithm.build("p-1", b1=10, b2=10)]
+    divisor_search = DivisorSearch(101, algorithms, processes=2).search()
+    assert divisor_search.divisors == [101, 101]
+
+
+# -----------------------------
+
+
+def test_default_algorithms_are_picklable():
+    algorithms = pickle.loads(pickle.dumps(_default_algorithms()))
+    assert algorithms[0].find_divisor(8051) == 97
+
+
 # ===========================================================
 #   factorization
 # ===========================================================
@@ -138,6 +489,121 @@ def test_factor_no_prime_base(number):
 # -----------------------------
 
 
+@pytest.mark.parametrize("block_size", [1, 5, 32])
+@given(
+    st.integers(min_value=1, max_value=10**30),
+    st.lists(st.integers(min_value=2, max_value=2000), max_size=50),
+)
+def test_trial_division(block_size, number, numbers):
+    prime_base = sorted({next_prime(value) for value in numbers})
+    remaining, factorization = TrialDivision(prime_base, block_size)(number)
+    expected = dict()
+    for prime in prime_base:
+        exp, number = padic(number, prime)
+        if exp > 0:
+            expected[prime] = exp
+    assert remaining == number
+    assert factorization == expected
+    assert list(factorization) == list(expected)
+
+
+# -----------------------------
+
+trial_division = TrialDivision(primes_up_to(10**5))
+
+
+@given(
+    st.lists(st.integers(min_value=-(10**30), max_value=10**30).filter(bool), max_size=30)
+)
+def test_trial_division_many(numbers):
+    assert trial_division.many(numbers) == list(map(trial_division, numbers))
+
+
+# -----------------------------
+
+
+def test_trial_division_many_small_base():
+    numbers = [1200, 1009 * 1013, -(2**10) * 3**5 * 997, 1]
+    trial_division = TrialDivision(primes_up_to(1000))
+    assert trial_division.many(numbers) == list(map(trial_division, numbers))
+    with pytest.raises(ValueError):
+        trial_division.many([1, 0])
+
+
+# -----------------------------
+
+
+def test_trial_division_repeated_prime_base():
+    trial_division = TrialDivision([2, 2, 3, 5, 3])
+    assert trial_division.primes == [2, 3, 5]
+    assert trial_division(1200) == (1, {2: 4, 3: 1, 5: 2})
+    assert trial_division.many([1200, 7 * 2**3]) == [(1, {2: 4, 3: 1, 5: 2}), (7, {2: 3})]
+    assert Factorization(1200, prime_base=[2, 2, 3]).factorization == {2: 4, 3: 1, 5: 2}
+
+
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=1, max_value=1 << 64),
+    st.integers(min_value=0),
+    st.integers(min_value=0),
+    st.integers(min_value=0, max_value=1 << 16),
+)
+def test_trial_division_mod(high, low, quotient, shift):
+    modulus = (high << (1 << 15)) + low
+    for number in [quotient * modulus + low, (quotient << shift) * modulus - 1]:
+        number = max(number, 0)
+        assert trial_division_module._mod(number, modulus) == number % modulus
+
+
+# -----------------------------
+
+
+@given(st.lists(st.integers(min_value=1, max_value=10**15), max_size=20))
+def test_factor_many(numbers):
+    factorizations = Factorization.factor_many(numbers)
+    assert [factorization.number for factorization in factorizations] == numbers
+    for factorization in factorizations:
+        assert (
+            factorization.factorization
+            == Factorization(factorization.number).factorization
+        )
+
+
+# -----------------------------
+
+
+def test_factor_with_prime_base_max(monkeypatch):
+    monkeypatch.setitem(DEFAULTS, "prime_base_max", 10**5)
+    number = next_prime(10**4) ** 2 * next_prime(9 * 10**4) * next_prime(10**6)
+    assert Factorization(number).factorization == {
+        next_prime(10**4): 2,
+        next_prime(9 * 10**4): 1,
+        next_prime(10**6): 1,
+    }
+    monkeypatch.setitem(DEFAULTS, "prime_base_max", 10)
+    assert Factorization(2**5 * 3 * 7).factorization == {2: 5, 3: 1, 7: 1}
+
+
+# -----------------------------
+
+
+def test_factor_many_with_block_size(monkeypatch):
+    prime_base = (2, 3, 5, 7, 11, 13, 17)
+    numbers = [2**3 * 13 * 101, 3 * 5 * 17**2, 7 * 11 * 103]
+    monkeypatch.setitem(DEFAULTS, "trial_division_block_size", 1)
+    Factorization.factor_many(numbers, prime_base=prime_base)
+    assert _trial_division(prime_base, 1).blocks == [[prime] for prime in prime_base]
+    monkeypatch.setitem(DEFAULTS, "trial_division_block_size", 4)
+    factorizations = Factorization.factor_many(numbers, prime_base=prime_base)
+    assert [f.number for f in factorizations] == numbers
+    assert _trial_division(prime_base, 4).blocks == [[2, 3, 5, 7], [11, 13, 17]]
+
+
+# -----------------------------
+
+
 @given(st.integers(min_value=2, max_value=10**15))
 def test_factor(number):
     factorization = Factorization(number)
@@ -149,6 +615,25 @@ def test_factor(number):
 # -----------------------------
 
 
+def test_factor_hard_cofactor():
+    factors = {2: 3, 3: 1, next_prime(10**14): 1, next_prime(10**15): 1}
+    number = Factorization.from_dict(factors).number
+    assert Factorization(number).factorization == factors
+
+
+# -----------------------------
+
+
+@given(composite(2, 2**20, 2**31))
+def test_factor_small_composite(number):
+    factorization = Factorization(number)
+    assert all(is_prime(prime) for prime, _ in factorization)
+    assert Factorization.from_dict(dict(factorization)).number == number
+
+
+# -----------------------------
+
+
 @given(st.integers(min_value=2, max_value=10**12))
 def test_square_and_square_free(number):
     factorization = Factorization(number)
@@ -176,6 +661,50 @@ def test_divisors(number):
 # -----------------------------
 
 
+@given(st.integers(min_value=1, max_value=10**12))
+def test_iter_divisors(number):
+    factorization = Factorization(number)
+    assert list(factorization.iter_divisors()) == factorization.divisors
+    assert factorization.divisor_count == len(factorization.divisors)
+    assert factorization.divisor_sum == sum(factorization.divisors)
+
+
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=1, max_value=10**12),
+    st.integers(min_value=-10, max_value=10**12),
+    st.integers(min_value=0, max_value=10**12),
+)
+def test_divisors_in_range(number, lower, difference):
+    factorization = Factorization(number)
+    upper = lower + difference
+    assert factorization.divisors_in_range(lower, upper) == [
+        divisor for divisor in factorization.divisors if lower <= divisor < upper
+    ]
+
+
+# -----------------------------
+
+
+def test_divisors_of_highly_composite_number():
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67]
+    factorization = Factorization.from_dict(
+        {prime: 6 if prime < 7 else 3 if prime < 17 else 1 for prime in primes}
+    )
+    assert factorization.divisor_count == 7**3 * 4**3 * 2**13
+    divisors = factorization.iter_divisors()
+    assert [next(divisors) for _ in range(10)] == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    window = factorization.divisors_in_range(10**18, 10**18 + 10**14)
+    assert window == sorted(window) and len(window) > 0
+    assert all(factorization.number % divisor == 0 for divisor in window)
+    assert all(10**18 <= divisor < 10**18 + 10**14 for divisor in window)
+
+
+# -----------------------------
+
+
 @given(st.integers(min_value=2, max_value=10**12))
 def test_factors(number):
     factorization = Factorization(number)
@@ -330,3 +859,230 @@ def test_carmichael_lambda(number):
     for divisor in Factorization(carmichael_lambda).divisors:
         if divisor < carmichael_lambda:
             assert not _carmichael_property(divisor)
+
+
+# -----------------------------
+
+
+@given(st.integers(min_value=1, max_value=10**4))
+def test_from_spf_table(number):
+    factorization = Factorization.from_spf_table(number, spf_table)
+    assert factorization.factorization == Factorization(number).factorization
+    assert factorization.number == number
+
+
+# ===========================================================
+#   spf_table
+# ===========================================================
+spf_table = SmallestPrimeFactorTable.build(10**4)
+
+
+def test_spf_table():
+    for number in range(2, 10**4 + 1):
+        prime = spf_table.smallest_prime_factor(number)
+        assert is_prime(prime) and number % prime == 0
+        assert all(number % divisor for divisor in range(2, min(prime, 100)))
+    with pytest.raises(ValueError):
+        spf_table.smallest_prime_factor(10**4 + 1)
+
+
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=1, max_value=10**4),
+    st.integers(min_value=0, max_value=300),
+)
+def test_spf_table_factor_range(lower, difference):
+    upper = min(lower + difference, 10**4 + 1)
+    primes, exps, offsets = spf_table.factor_range(lower, upper)
+    assert len(offsets) == upper - lower + 1
+    for index, number in enumerate(range(lower, upper)):
+        start, stop = offsets[index], offsets[index + 1]
+        factorization = dict(zip(primes[start:stop], exps[start:stop]))
+        assert factorization == Factorization(number).factorization
+        assert list(primes[start:stop]) == sorted(factorization)
+
+
+# -----------------------------
+
+
+def test_spf_table_without_numpy(monkeypatch):
+    expected = spf_table.factor_range(1, 10**4 + 1)
+    monkeypatch.setattr(spf_table_module, "np", None)
+    table = SmallestPrimeFactorTable.build(10**4)
+    assert list(table._data) == spf_table._data.tolist()
+    primes, exps, offsets = table.factor_range(1, 10**4 + 1)
+    assert list(primes) == expected[0].tolist()
+    assert list(exps) == expected[1].tolist()
+    assert list(offsets) == expected[2].tolist()
+
+
+# ===========================================================
+#   multiplicative_sieve
+# ===========================================================
+
+
+def _multiplicative_functions(number):
+    factorization = Factorization(number).factorization
+    exps = factorization.values()
+    return {
+        "phi": Factorization(number).euler_phi,
+        "lambda": Factorization(number).carmichael_lambda if number > 1 else 1,
+        "mu": 0 if any(exp > 1 for exp in exps) else (-1) ** len(exps),
+        "sigma_0": reduce(lambda acc, exp: acc * (exp + 1), exps, 1),
+        "sigma_1": sum(Factorization(number).divisors),
+        "sigma_2": sum(divisor**2 for divisor in Factorization(number).divisors),
+        "omega": len(exps),
+        "big_omega": sum(exps),
+    }
+
+
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=1, max_value=10**9),
+    st.integers(min_value=0, max_value=50),
+    st.integers(min_value=8, max_value=50),
+)
+def test_multiplicative_functions_in_range(lower, difference, segment_size):
+    functions = ["phi", "lambda", "mu", "sigma_0", "sigma_1", "omega", "big_omega"]
+    if lower < 10**6:
+        functions.append("sigma_2")
+    results = multiplicative_functions_in_range(
+        lower, lower + difference, functions, segment_size
+    )
+    for name in functions:
+        assert len(results[name]) == difference
+    for index, number in enumerate(range(lower, lower + difference)):
+        expected = _multiplicative_functions(number)
+        for name in functions:
+            assert results[name][index] == expected[name]
+
+
+# -----------------------------
+
+
+def test_multiplicative_functions_up_to_without_numpy(monkeypatch):
+    expected = multiplicative_functions_up_to(
+        2000, ["phi", "lambda", "mu", "sigma_0", "sigma_3", "omega", "big_omega"]
+    )
+    monkeypatch.setattr(multiplicative_sieve, "np", None)
+    results = multiplicative_functions_up_to(2000, list(expected))
+    for name, values in results.items():
+        assert list(values) == expected[name].tolist()
+
+
+# -----------------------------
+
+
+def test_multiplicative_functions_beyond_64_bits():
+    results = multiplicative_functions_in_range(10**12, 10**12 + 3, ["sigma_2"])
+    assert list(results["sigma_2"]) == [
+        _multiplicative_functions(number)["sigma_2"]
+        for number in range(10**12, 10**12 + 3)
+    ]
+    with pytest.raises(ValueError):
+        multiplicative_functions_up_to(10, ["tau"])
+
+
+# ===========================================================
+#   factor_store
+# ===========================================================
+
+
+def test_factor_store(tmp_path):
+    store = FactorStore(tmp_path / "factors.sqlite", cache_size=2)
+    assert store.get(1001) is None
+    store.put(1001, {7: 1, 11: 1, 13: 1})
+    store.put(10**40 + 1, {73: 1, 137: 1}, (10**40 + 1) // 10001)
+    assert store.get(1001) == ({7: 1, 11: 1, 13: 1}, 1)
+    assert store.get(10**40 + 1) == ({73: 1, 137: 1}, (10**40 + 1) // 10001)
+    assert len(store) == 2
+
+    reopened = FactorStore(tmp_path / "factors.sqlite")
+    assert reopened.get(1001) == ({7: 1, 11: 1, 13: 1}, 1)
+    assert reopened.get(1002) is None
+
+    stats = store.reset_stats()
+    assert (stats.hits, stats.partial_hits, stats.misses) == (1, 1, 1)
+    assert stats.memory_hits == 2
+    assert stats.hit_rate == 1 / 3
+    assert reopened.stats.memory_hits == 0
+
+
+# -----------------------------
+
+
+def test_factor_store_eviction(tmp_path):
+    store = FactorStore(tmp_path / "factors.sqlite", cache_size=0, max_entries=16)
+    for number in range(2, 18):
+        store.put(number, Factorization(number).factorization)
+    store.get(2)
+    store.put(18, {2: 1, 3: 2})
+    assert len(store) == 16
+    assert store.get(2) == ({2: 1}, 1)
+    assert store.get(3) is None
+    assert store.stats.evictions == 1
+
+
+# -----------------------------
+
+
+def test_factor_store_get_does_not_write(tmp_path):
+    path = tmp_path / "factors.sqlite"
+    store = FactorStore(path, cache_size=0, max_entries=16)
+    store.put(6, {2: 1, 3: 1})
+    store.put(10, {2: 1, 5: 1})
+    last_used = "SELECT last_used FROM factors ORDER BY number"
+    with sqlite3.connect(path) as connection:
+        before = connection.execute(last_used).fetchall()
+    assert store.get(6) == ({2: 1, 3: 1}, 1)
+    with sqlite3.connect(path) as connection:
+        assert connection.execute(last_used).fetchall() == before
+    store.close()
+    with sqlite3.connect(path) as connection:
+        assert connection.execute(last_used).fetchall() > before
+
+
+# -----------------------------
+
+
+def test_factor_store_in_process_pool(tmp_path):
+    store = FactorStore(tmp_path / "factors.sqlite")
+    store.put(1001, {7: 1, 11: 1, 13: 1})
+    unpickled = pickle.loads(pickle.dumps(store))
+    assert unpickled.stats == store.stats
+    with ProcessPoolExecutor(1) as executor:
+        assert executor.submit(unpickled.get, 1001).result() == (
+            {7: 1, 11: 1, 13: 1},
+            1,
+        )
+        executor.submit(unpickled.put, 1002, {2: 1, 3: 1, 167: 1}).result()
+    assert store.get(1002) == ({2: 1, 3: 1, 167: 1}, 1)
+
+
+# -----------------------------
+
+
+def test_use_factor_store(tmp_path):
+    factors = {2: 3, 3: 1, next_prime(10**14): 1, next_prime(10**15): 1}
+    number = Factorization.from_dict(factors).number
+    try:
+        store = use_factor_store(tmp_path / "factors.sqlite")
+        assert store is get_factor_store()
+        assert Factorization(number).factorization == factors
+        assert store.get(number) == (factors, 1)
+        assert Factorization(number).factorization == factors
+        assert store.stats.hits == 2
+
+        cofactor = next_prime(10**14) * next_prime(10**15)
+        store.put(number, {2: 3, 3: 1}, cofactor)
+        store.reset_stats()
+        assert Factorization(number).factorization == factors
+        assert (store.stats.partial_hits, store.stats.hits) == (1, 0)
+        assert store.get(number) == (factors, 1)
+    finally:
+        use_factor_store(None)
+    assert get_factor_store() is None
@@ -1,11 +1,15 @@
 #   tests/primality_test.py
 # ===========================================================
+from array import array
+
 import pytest
 from hypothesis import given, strategies as st
 
 import env  # noqa
+from lib.basic import gcd, ModularContext
 from lib.basic.primality import is_prime__naive, primes_up_to
 from lib.primality.algorithms import (
+    bpsw_test,
     is_prime,
     lucas_test,
     miller_rabin_test,
@@ -13,6 +17,8 @@ from lib.primality.algorithms import (
     MillerRabinWitness,
     Observation,
 )
+from lib.primality import batch
+from lib.primality.batch import is_prime_many
 from lib.primality.goldbach import goldbach_partition
 from lib.primality.prime_search import (
     next_prime,
@@ -23,6 +29,21 @@ from lib.primality.prime_search import (
     PrimeSearch,
     Window,
 )
+from lib.primality.prefilter import (
+    get_prefilter,
+    use_prefilter,
+    PrefilterStats,
+    TrialDivisionPrefilter,
+)
+from lib.primality.prime_table import (
+    get_prime_table,
+    use_prime_table,
+    PrimeTable,
+)
+from lib.primality.segmented_sieve import (
+    count_primes_in_range,
+    sieve_primes_in_range,
+)
 from lib.primality.twin_prime_search import (
     next_twin_prime,
     prev_twin_prime,
@@ -49,6 +70,49 @@ def test_is_prime(number):
     assert is_prime(number) == is_prime__naive(number)
 
 
+# -----------------------------
+
+
+@given(st.integers(min_value=MillerRabinWitness.MAX_CUTOFF, max_value=2**200))
+def test_is_prime_modes(number):
+    assert is_prime(number, mode="bpsw") == is_prime(number, mode="probabilistic")
+
+
+# ============================
+# bpsw
+# ============================
+
+
+@pytest.mark.parametrize(
+    "number, expected",
+    [
+        (2**61 - 1, "prime"),
+        (2**89 - 1, "strong_probable_prime"),
+        (2**127 - 1, "strong_probable_prime"),
+        (2**64 + 1, "composite"),
+        (2**128 + 1, "composite"),
+        (2**256 + 1, "composite"),
+        ((2**61 - 1) ** 2, "composite"),
+        ((2**31 - 1) * (2**61 - 1), "composite"),
+    ],
+)
+def test_bpsw_test(number, expected):
+    assert bpsw_test(number).value == expected
+
+
+# -----------------------------
+
+
+def test_bpsw_test_on_sieve():
+    upper = 10**4
+    primes = set(primes_up_to(upper))
+    for number in range(2, upper):
+        if number in primes:
+            assert bpsw_test(number).value == "prime"
+        else:
+            assert bpsw_test(number).value == "composite"
+
+
 # ============================
 # observation
 # ============================
@@ -139,6 +203,20 @@ def test_generate_lucas_witnesses(number, witness_count):
 # -----------------------------
 
 
+def test_selfridge_lucas_witness_on_sieve():
+    for prime in primes_up_to(10**4)[3:]:
+        witness = LucasWitness.selfridge(prime)
+        assert witness.observe(prime).value == "strong_probable_prime"
+
+    for number in range(9, 10**3, 2):
+        if not is_prime__naive(number):
+            witness = LucasWitness.selfridge(number)
+            assert witness is None or witness.observe(number).value == "composite"
+
+
+# -----------------------------
+
+
 def test_lucas_on_sieve():
     upper = 10**4
     primes = set(primes_up_to(upper))
@@ -179,14 +257,15 @@ def test_generate_miller_rabin_witnesses(number, witness_count):
     for w in witnesses:
         assert 2 <= w._value < number
 
-    if number > MillerRabinWitness.MAX_CUTOFF and witness_count > number:
+    if number >= MillerRabinWitness.MAX_CUTOFF and witness_count > number:
         assert len(witnesses) == number - 3
         assert all(witness._assured for witness in witnesses)
 
-    elif number <= MillerRabinWitness.MAX_CUTOFF:
-        assert [witness._value for witness in witnesses] == [
-            p for (val, p) in MillerRabinWitness.CUTOFFS if val < number
-        ]
+    elif number < MillerRabinWitness.MAX_CUTOFF:
+        values = [p for (val, p) in MillerRabinWitness.CUTOFFS if val <= number]
+        if number < 2**64 and len(values) > 7:
+            values = list(MillerRabinWitness.U64_BASES)
+        assert [witness._value for witness in witnesses] == values
         assert all(witness._assured for witness in witnesses)
 
     else:
@@ -196,6 +275,78 @@ def test_generate_miller_rabin_witnesses(number, witness_count):
 # -----------------------------
 
 
+@pytest.mark.parametrize(
+    "number, expected",
+    [
+        (341550071728321, "composite"),
+        (3825123056546413051, "composite"),
+        (318665857834031151167461, "composite"),
+        (2**64 + 1, "composite"),
+        (2**61 - 1, "prime"),
+        (2**64 - 59, "prime"),
+        (2**67 - 1, "composite"),
+        (2**79 - 67, "prime"),
+    ],
+)
+def test_miller_rabin_test_deterministic(number, expected):
+    assert miller_rabin_test(number, witness_count=1).value == expected
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize(
+    "number",
+    [2047, 1373653, 25326001, 3215031751, 4294967291, 4294967295, 65521, 66049],
+)
+def test_miller_rabin_test_hashed(number):
+    expected = miller_rabin_test(number, witness_count=1).value
+    assert miller_rabin_test(number, witness_count=1, hashed=True).value == expected
+
+
+# -----------------------------
+
+
+@given(st.integers(min_value=2, max_value=2**32 - 1))
+def test_miller_rabin_test_hashed_agrees(number):
+    expected = miller_rabin_test(number, witness_count=1).value
+    assert miller_rabin_test(number, witness_count=1, hashed=True).value == expected
+
+
+# -----------------------------
+
+
+@given(st.integers(min_value=2**32, max_value=2**64 - 1))
+def test_miller_rabin_test_hashed_above_32_bits(number):
+    expected = miller_rabin_test(number, witness_count=1).value
+    assert miller_rabin_test(number, witness_count=1, hashed=True).value == expected
+
+
+# -----------------------------
+
+
+def test_miller_rabin_test_hashed_on_sieve():
+    upper = 10**5
+    primes = set(primes_up_to(upper))
+    for number in range(2, upper):
+        observation = miller_rabin_test(number, witness_count=1, hashed=True)
+        assert observation.value == ("prime" if number in primes else "composite")
+
+
+# -----------------------------
+
+
+@given(st.integers(min_value=3, max_value=10**30), st.integers(min_value=2))
+def test_miller_rabin_witness_with_context(number, value):
+    number |= 1
+    witness = MillerRabinWitness(value)
+    context = ModularContext(number, method="barrett")
+    assert witness.observe(number, context) == witness.observe(number)
+
+
+# -----------------------------
+
+
 def test_miller_rabin_on_sieve():
     upper = 10**4
     primes = set(primes_up_to(upper))
@@ -517,6 +668,183 @@ def test_window_prev_and_next_values():
     assert window.next().value == 5
 
 
+# ==========================================================
+# batch
+# ==========================================================
+
+
+@given(st.lists(st.integers(min_value=0, max_value=2**64 - 1), max_size=50))
+def test_is_prime_many(values):
+    np = pytest.importorskip("numpy")
+    values += [2**64 - 59, 3215031751, 3825123056546413051, 2**61 - 1]
+    result = is_prime_many(np.array(values, dtype=np.uint64), processes=1)
+    assert result.tolist() == [is_prime(value) for value in values]
+
+
+# -----------------------------
+
+
+def test_is_prime_many_on_sieve():
+    np = pytest.importorskip("numpy")
+    values = np.arange(-10, 10**5).reshape(10, -1)
+    result = is_prime_many(values, processes=2, chunk_size=4321)
+    assert result.shape == values.shape
+    assert np.flatnonzero(result).tolist() == [p + 10 for p in primes_up_to(10**5)]
+
+
+# -----------------------------
+
+
+def test_is_prime_many_without_numpy(monkeypatch):
+    monkeypatch.setattr(batch, "np", None)
+    values = array("Q", range(1000))
+    assert list(is_prime_many(values)) == [is_prime(value) for value in values]
+
+
+# ==========================================================
+# prefilter
+# ==========================================================
+
+
+@pytest.mark.parametrize("bound", [2, 3, 30, 256, 1000])
+def test_trial_division_prefilter(bound):
+    prefilter = TrialDivisionPrefilter(bound)
+    upper = 2 * (bound + 1) ** 2
+    primes = set(primes_up_to(upper))
+    for number in range(2, upper):
+        verdict = prefilter(number)
+        if verdict is None:
+            assert number > bound**2
+            assert all(number % prime for prime in prefilter.primes)
+        else:
+            assert verdict == (number in primes)
+    stats = prefilter.reset_stats()
+    assert stats.calls == upper - 2
+    assert stats.primes + stats.composites + stats.passed == stats.calls
+    assert prefilter.stats == PrefilterStats()
+
+
+# -----------------------------
+
+
+def test_use_prefilter():
+    default_prefilter = get_prefilter()
+    try:
+        prefilter = use_prefilter(10)
+        assert get_prefilter() is prefilter
+        assert [number for number in range(1000) if is_prime(number)] == primes_up_to(
+            1000
+        )
+        assert prefilter.stats.calls == 998
+        passed = [number for number in range(121, 1000) if gcd(number, 210) == 1]
+        assert prefilter.stats.passed == len(passed)
+    finally:
+        use_prefilter(default_prefilter)
+
+
+# -----------------------------
+
+
+@pytest.mark.parametrize("bound", [10, 251, 1000])
+def test_is_prime_with_prefilter_bound(bound):
+    default_prefilter = get_prefilter()
+    try:
+        use_prefilter(bound)
+        lower = 65000
+        primes = primes_up_to(70000)
+        assert [n for n in range(lower, 70000) if is_prime(n)] == [
+            prime for prime in primes if prime >= lower
+        ]
+        assert not any(map(is_prime, [25326001, 3215031751, 257 * 65537]))
+    finally:
+        use_prefilter(default_prefilter)
+
+
+# ==========================================================
+# prime table
+# ==========================================================
+
+
+@pytest.mark.parametrize("limit", [0, 1, 2, 29, 30, 31, 1000, 10**5 + 7])
+def test_prime_table(limit):
+    table = PrimeTable.build(limit, segment_size=7)
+    primes = primes_up_to(limit)
+    assert list(table.iter_primes_in_range(0)) == primes
+    assert [number for number in range(limit + 1) if number in table] == primes
+    with pytest.raises(ValueError):
+        (limit + 1) in table
+
+
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=-10, max_value=10**4),
+    st.integers(min_value=0, max_value=10**3),
+)
+def test_prime_table_iter_primes_in_range(lower, difference):
+    table = PrimeTable.build(2 * 10**4)
+    upper = lower + difference
+    primes = list(table.iter_primes_in_range(lower, upper))
+    assert primes == [p for p in primes_up_to(upper - 1) if p >= lower]
+
+
+# -----------------------------
+
+
+def test_prime_table_save_and_load(tmp_path):
+    path = tmp_path / "primes.bin"
+    PrimeTable.build(10**4).save(path)
+    table = PrimeTable.load(path)
+    assert table.limit == 10**4
+    assert list(table.iter_primes_in_range(0)) == primes_up_to(10**4)
+
+
+# -----------------------------
+
+
+def test_use_prime_table(tmp_path):
+    path = tmp_path / "primes.bin"
+    PrimeTable.build(10**4).save(path)
+    try:
+        assert use_prime_table(path) is get_prime_table()
+        assert primes_in_range(100, 200) == primes_up_to(199)[25:]
+        assert [number for number in range(10**4) if is_prime(number)] == primes_up_to(
+            10**4
+        )
+        assert next_prime(10**4 - 10) == 10007
+    finally:
+        use_prime_table(None)
+    assert get_prime_table() is None
+
+
+# ==========================================================
+# segmented sieve
+# ==========================================================
+
+
+@given(
+    st.integers(min_value=-10, max_value=10**7),
+    st.integers(min_value=0, max_value=10**3),
+    st.integers(min_value=1, max_value=300),
+)
+def test_sieve_primes_in_range(lower, difference, chunk_size):
+    upper = lower + difference
+    primes = list(sieve_primes_in_range(lower, upper, processes=1, chunk_size=chunk_size))
+    assert primes == [p for p in range(lower, upper) if is_prime(p)]
+    assert count_primes_in_range(lower, upper, 1, chunk_size) == len(primes)
+
+
+# -----------------------------
+
+
+def test_sieve_primes_in_range_across_processes():
+    lower, upper = 10**9, 10**9 + 10**5
+    primes = list(sieve_primes_in_range(lower, upper, processes=2, chunk_size=4321))
+    assert primes == primes_in_range(lower, upper)
+    assert count_primes_in_range(lower, upper, processes=2, chunk_size=4321) == 4832
+
+
 # ==========================================================
 # twin prime search
 # ==========================================================
@@ -1,6 +1,7 @@
 #   tests/sequences_lucas_test.py
 # ===========================================================
 import env  # noqa
+import pytest
 from hypothesis import given, strategies as st
 
 from lib.types import QuadraticInteger, Quadratic, frac
@@ -88,6 +89,39 @@ def test_lucas_sequence_mod(p, q, mod):
         next(seq)
 
 
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=0, max_value=200),
+    st.integers(min_value=1),
+    st.integers().filter(lambda x: x != 0),
+    st.integers(min_value=2),
+)
+def test_lucas_by_index_continues(k, p, q, mod):
+    seq = next(LucasSequence.at_index(k, p=p, q=q, modulus=mod))
+    assert seq.value == LucasSequence.at_index(k + 1, p=p, q=q, modulus=mod).value
+
+
+# -----------------------------
+
+
+def test_lucas_by_large_index():
+    mod = 2**521 - 1
+    seq = LucasSequence.at_index(mod - 1, p=1, q=-1, modulus=mod)
+    assert seq.value.u == 0
+    assert seq.value.v == 2
+    assert seq.value.q == 1
+
+
+# -----------------------------
+
+
+def test_lucas_by_negative_index():
+    with pytest.raises(ValueError):
+        LucasSequence.at_index(-4, p=1, q=-1)
+
+
 # ===========================================================
 #   fibonacci sequence
 # ===========================================================
@@ -148,3 +182,47 @@ def test_fibonacci_sequence_mod(k, mod):
         value = FibonacciSequence.at_index(k, modulus=mod).value
         assert seq.value == value
         next(seq)
+
+
+# -----------------------------
+
+
+@given(
+    st.integers(min_value=0, max_value=200),
+    st.integers(min_value=1),
+)
+def test_fibonacci_by_index_continues(k, mod):
+    seq = next(FibonacciSequence.at_index(k, modulus=mod))
+    assert seq.value == FibonacciSequence.at_index(k + 1, modulus=mod).value
+
+
+# -----------------------------
+
+
+@given(
+    st.lists(st.integers(min_value=0, max_value=2**70)),
+    st.integers(min_value=1, max_value=2**64),
+)
+def test_fibonacci_at_indices(indices, mod):
+    indices += [index + 1 for index in indices]
+    values = FibonacciSequence.at_indices(indices, modulus=mod)
+    assert values == [FibonacciSequence.at_index(k, modulus=mod).value for k in indices]
+
+
+# -----------------------------
+
+
+@given(st.lists(st.integers(min_value=0, max_value=300)))
+def test_fibonacci_at_indices_without_modulus(indices):
+    values = FibonacciSequence.at_indices(indices)
+    assert values == [FibonacciSequence.at_index(k).value for k in indices]
+
+
+# -----------------------------
+
+
+def test_fibonacci_by_negative_index():
+    with pytest.raises(ValueError):
+        FibonacciSequence.at_index(-4)
+    with pytest.raises(ValueError):
+        FibonacciSequence.at_indices([3, -4], modulus=7)